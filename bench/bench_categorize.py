@@ -0,0 +1,57 @@
+# bench/bench_categorize.py
+# Compare the iterrows process_section path with the columnar categorize_frame path.
+#
+#   python -m bench.bench_categorize --rows 1000000
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from bench.synth import write_transactions_csv
+from budget_parse import categorize_frame, process_section, read_budget_csv
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark budget categorization paths")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the columnar engine")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spending.csv")
+        write_transactions_csv(path, args.rows, seed=args.seed)
+        load_s, df = timed(read_budget_csv, path, "spending")
+
+        results = {"rows": args.rows, "load_s": round(load_s, 3)}
+
+        fast_map, legacy_map = {"spending": {}}, {"spending": {}}
+        fast_s, (out, fast_summary) = timed(categorize_frame, "spending", df, fast_map)
+        results["columnar_s"] = round(fast_s, 3)
+
+        if not args.skip_legacy:
+            legacy_s, (rows, legacy_summary) = timed(process_section, "spending", df, legacy_map)
+            results["iterrows_s"] = round(legacy_s, 3)
+            results["speedup"] = round(legacy_s / fast_s, 1) if fast_s else None
+            assert out.to_dict("records") == rows, "row mismatch between engines"
+            assert fast_map == legacy_map, "vendor map mismatch between engines"
+            assert fast_summary.keys() == legacy_summary.keys()
+            assert all(abs(fast_summary[k] - legacy_summary[k]) < 1e-6 * max(1, abs(legacy_summary[k]))
+                       for k in legacy_summary)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# bench/bench_service.py
+# Warm coin service vs a process per query. Starts coin_service.py in a sandbox
+# (spot from the local GoldAPI stub), then times:
+#   - `coin_valuation.py --coin` launched per query (the Makefile path)
+#   - `coin_client.py value` launched per query (thin client, warm server)
+#   - valuations over one persistent ServiceClient connection
+# and checks that an edit to premium_profiles.json shows up on the next query.
+#
+#   python -m bench.bench_service --requests 20000
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.stub_goldapi import StubGoldAPI
+from bench.suite import REPO, Sandbox
+from coin_client import ServiceClient
+
+CONNECT_WAIT = 15
+
+
+def launch_ms(argv, sandbox, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=sandbox.path, env=sandbox.env, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def connect(socket_path, process):
+    deadline = time.monotonic() + CONNECT_WAIT
+    while True:
+        try:
+            return ServiceClient(socket_path)
+        except ConnectionError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time warm-service valuations against a process per query")
+    parser.add_argument("--requests", type=int, default=20000, help="Valuations over one connection")
+    parser.add_argument("--launches", type=int, default=10, help="Process launches timed per CLI")
+    args = parser.parse_args()
+
+    stub = StubGoldAPI().start()
+    sandbox = Sandbox(stub.url)
+    socket_path = sandbox.file(".cache", "coin_service.sock")
+    with open(os.path.join(sandbox.path, "coin_spec.json")) as f:
+        coin_keys = list(json.load(f))
+    server = subprocess.Popen([sys.executable, os.path.join(REPO, "coin_service.py"), "--socket", socket_path,
+                               "--warm"], cwd=sandbox.path, env=sandbox.env, stdout=subprocess.DEVNULL)
+    try:
+        client = connect(socket_path, server)
+        cli = launch_ms([sys.executable, os.path.join(REPO, "coin_valuation.py"), "--coin", coin_keys[0],
+                         "--price", "30"], sandbox, args.launches)
+        thin = launch_ms([sys.executable, os.path.join(REPO, "coin_client.py"), "--socket", socket_path, "value",
+                          "--coin", coin_keys[0], "--price", "30"], sandbox, args.launches)
+
+        samples = []
+        start = time.perf_counter()
+        for i in range(args.requests):
+            began = time.perf_counter()
+            client.request("value", coin=coin_keys[i % len(coin_keys)], price=30.0 + i % 50)
+            samples.append((time.perf_counter() - began) * 1e6)
+        elapsed = time.perf_counter() - start
+
+        # Edit the profiles on disk; the very next query must see it
+        profiles_path = os.path.join(sandbox.path, "premium_profiles.json")
+        with open(profiles_path) as f:
+            profiles = json.load(f)
+        profile = next(iter(profiles["profiles"]))
+        category = client.request("value", coin=coin_keys[0])["category"]
+        profiles["profiles"][profile][category] = 0.4242
+        with open(profiles_path, "w") as f:
+            json.dump(profiles, f)
+        reloaded = client.request("value", coin=coin_keys[0], profile=profile)["allowed_premium_pct"] == 0.4242
+        stats = client.request("stats")
+        client.request("shutdown")
+        client.close()
+        server.wait(timeout=CONNECT_WAIT)
+    finally:
+        if server.poll() is None:
+            server.terminate()
+        sandbox.cleanup()
+        stub.stop()
+
+    print(json.dumps({
+        "requests": args.requests,
+        "process_per_query_ms": {"coin_valuation": cli, "coin_client": thin},
+        "warm_connection": {
+            "per_request_us": round(elapsed / args.requests * 1e6, 1),
+            "p50_us": round(percentile(samples, 50), 1),
+            "p99_us": round(percentile(samples, 99), 1),
+            "requests_per_s": round(args.requests / elapsed),
+        },
+        "speedup_vs_cli": round(cli * 1000 / (elapsed / args.requests * 1e6)),
+        "reload_on_edit": reloaded,
+        "stub_requests": stub.stats()["requests"],
+        "file_reloads": {path: info["reloads"] for path, info in stats["files"].items()},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bench/bench_sheets_upload.py
+# Multi-tab upload through a cached SheetsSession: sequential vs a bounded
+# thread pool, against a fake gspread backend with simulated round-trip latency.
+#
+#   python -m bench.bench_sheets_upload --tabs 12 --latency 0.05
+
+import argparse
+import json
+import time
+
+from bench.bench_sheets_writer import make_rows
+from bench.fake_gspread import FakeClient
+from sheets_client import SheetsSession, upload_concurrently
+from sheets_writer import SheetWriter, TokenBucket
+
+
+def run(tabs, rows, latency, workers):
+    client = FakeClient(latency=latency)
+    session = SheetsSession("fake.json", "Budget_Dynamic", token_cache="/dev/null", client_factory=lambda _: client)
+    writer = SheetWriter(limiter=TokenBucket(rate=1000, capacity=1000))
+
+    def upload(title, data):
+        worksheet = session.add_worksheet(title, rows=len(data), cols=5)
+        writer.write(worksheet, data)
+
+    jobs = [(f"Month-{i:02d}", make_rows(rows, seed=i)) for i in range(tabs)]
+    start = time.perf_counter()
+    upload_concurrently(upload, jobs, max_workers=workers)
+    return {"seconds": round(time.perf_counter() - start, 3), **client.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent multi-tab uploads")
+    parser.add_argument("--tabs", type=int, default=12)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per API call")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "tabs": args.tabs,
+        "latency_s": args.latency,
+        "sequential": run(args.tabs, args.rows, args.latency, 1),
+        f"pool_{args.workers}": run(args.tabs, args.rows, args.latency, args.workers),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# bench/bench_sheets_writer.py
+# Compare clear + append_rows against the diff-based SheetWriter on a fake
+# gspread backend: API calls, bytes sent and correctness of the final tab.
+#
+#   python -m bench.bench_sheets_writer --rows 5000 --changed 0.02
+
+import argparse
+import json
+import random
+import time
+
+from bench.fake_gspread import FakeClient
+from sheets_writer import SheetWriter, TokenBucket
+
+WIDTH = 5
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    header = ["Timestamp", "Vendor", "Amount", "Type", "Category"]
+    return [header] + [
+        [f"2025-03-{rng.randint(1, 28):02d}", f"Vendor {rng.randint(1, 500)}", f"{rng.uniform(1, 500):.2f}",
+         rng.choice(["recurring", "spending"]), rng.choice(["Groceries", "Shopping", "Dining & Drinks"])]
+        for _ in range(count)
+    ]
+
+
+def mutate(rows, fraction, seed):
+    rng = random.Random(seed)
+    updated = [list(r) for r in rows]
+    for i in rng.sample(range(1, len(rows)), int((len(rows) - 1) * fraction)):
+        updated[i][2] = f"{float(updated[i][2]) + 1:.2f}"
+    return updated
+
+
+def seeded_tab(rows):
+    client = FakeClient()
+    worksheet = client.open("Budget_Dynamic").add_worksheet("March-Budget-2025", rows=len(rows), cols=WIDTH)
+    worksheet.append_rows(rows)
+    client.calls.clear()
+    client.bytes_sent = 0
+    return client, worksheet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Google Sheets writers offline")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--changed", type=float, default=0.02, help="Fraction of rows changed between runs")
+    parser.add_argument("--inject-429", type=int, default=2, help="Rate-limit errors injected into the diff run")
+    args = parser.parse_args()
+
+    before = make_rows(args.rows, seed=1)
+    after = mutate(before, args.changed, seed=2)
+    results = {"rows": args.rows, "changed_fraction": args.changed}
+
+    client, worksheet = seeded_tab(before)
+    start = time.perf_counter()
+    worksheet.clear()
+    worksheet.append_rows(after)
+    results["clear_append"] = {**client.stats(), "seconds": round(time.perf_counter() - start, 4)}
+    assert worksheet.get_all_values() == after
+
+    client, worksheet = seeded_tab(before)
+    client.fail_next(429, args.inject_429)
+    writer = SheetWriter(limiter=TokenBucket(rate=1000, capacity=1000), base_delay=0.001)
+    start = time.perf_counter()
+    writer.write(worksheet, after)
+    results["diff_writer"] = {**client.stats(), "seconds": round(time.perf_counter() - start, 4)}
+    assert worksheet.get_all_values() == after
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
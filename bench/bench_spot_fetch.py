@@ -0,0 +1,79 @@
+# bench/bench_spot_fetch.py
+# Spot price fetching against the local GoldAPI stub: one requests.get per
+# metal in sequence (the old get_spot_prices) vs SpotFetcher's pooled
+# keep-alive session with concurrent requests.
+#
+#   python -m bench.bench_spot_fetch --latency 0.15 --rounds 5
+
+import argparse
+import json
+import time
+
+import requests
+
+from bench.stub_goldapi import StubGoldAPI
+from spot_fetcher import SpotFetcher
+
+METALS = ["XAU", "XAG", "XPT", "XPD"]
+
+
+def sequential(url, metals, currencies, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for metal in metals:
+            for currency in currencies:
+                requests.get(f"{url}/{metal}/{currency}", headers={"x-access-token": "stub"}).json()
+    return (time.perf_counter() - start) / rounds
+
+
+def pooled(url, metals, currencies, rounds):
+    fetcher = SpotFetcher(url, {"x-access-token": "stub"})
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fetcher.fetch(metals, currencies)
+    elapsed = (time.perf_counter() - start) / rounds
+    fetcher.close()
+    return elapsed
+
+
+def retried(url, stub):
+    """One fetch where the first two responses are 503s; retries should hide them."""
+    fetcher = SpotFetcher(url, {"x-access-token": "stub"}, backoff=0.05)
+    stub.fail_next(503, times=2)
+    start = time.perf_counter()
+    prices = fetcher.fetch(["XAU", "XAG"])
+    fetcher.close()
+    return {"seconds": round(time.perf_counter() - start, 3), "prices": len(prices)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs pooled spot fetches")
+    parser.add_argument("--latency", type=float, default=0.15, help="Stub response latency in seconds")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--currencies", default="USD", help="Comma-separated, e.g. USD,EUR")
+    args = parser.parse_args()
+    currencies = args.currencies.split(",")
+
+    results = {"latency_s": args.latency, "pairs": len(METALS) * len(currencies)}
+    for metals in (METALS[:2], METALS):
+        with StubGoldAPI(latency=args.latency) as stub:
+            seq = sequential(stub.url, metals, currencies, args.rounds)
+            seq_connections = stub.stats()["connections"]
+        with StubGoldAPI(latency=args.latency) as stub:
+            pool = pooled(stub.url, metals, currencies, args.rounds)
+            pool_connections = stub.stats()["connections"]
+        results[f"{len(metals)}_metals"] = {
+            "sequential_s": round(seq, 3),
+            "sequential_connections": seq_connections,
+            "pooled_s": round(pool, 3),
+            "pooled_connections": pool_connections,
+            "speedup": round(seq / pool, 2),
+        }
+    with StubGoldAPI(latency=args.latency) as stub:
+        results["retry_after_two_503s"] = retried(stub.url, stub)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
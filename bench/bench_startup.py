@@ -0,0 +1,117 @@
+# bench/bench_startup.py
+# Startup-time budget for toolkit.py. Each command runs as a fresh subprocess in
+# a sandbox with a seeded spot history and a small inventory; the median wall
+# time minus bare `python -c pass` is checked against STARTUP_BUDGETS_MS. Also
+# checks that importing every module in an empty directory prints nothing and
+# creates no files. Exits 1 when a budget or the import check fails.
+#
+#   python -m bench.bench_startup --runs 15
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench import synth
+from bench.suite import REPO, Sandbox
+from spot_history import SpotHistory
+from toolkit import COMMANDS
+
+# Median milliseconds over bare interpreter startup
+STARTUP_BUDGETS_MS = {
+    "help": 25,
+    "spot_from_cache": 60,
+    "spot_history": 60,
+    "inventory_list": 150,  # ~50 of it is importing tabulate
+    "value_help": 60,
+}
+COMMAND_ARGS = {
+    "help": ["--help"],
+    "spot_from_cache": ["spot", "--from-cache", "--json"],
+    "spot_history": ["spot", "--history", "--limit", "5", "--json"],
+    "inventory_list": ["inventory", "list"],
+    "value_help": ["value", "--help"],
+}
+INVENTORY_ENTRIES = 25
+LIBRARY_MODULES = ["toolkit", "gsr_stats", "spot_history", "spot_watch", "spot_fetcher", "sheets_client",
+                   "sheets_writer", "config", "metrics"]
+
+
+def median_ms(argv, cwd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        samples.append((time.perf_counter() - start) * 1000)
+        if completed.returncode != 0:
+            raise RuntimeError(f"❌ {' '.join(argv[1:])} failed: {completed.stderr.strip()[-300:]}")
+    return statistics.median(samples)
+
+
+def seed(sandbox):
+    with open(os.path.join(sandbox.path, "coin_spec.json")) as f:
+        coin_spec = json.load(f)
+    with open(sandbox.file("coin_inventory.json"), "w") as f:
+        json.dump(synth.inventory_entries(INVENTORY_ENTRIES, coin_spec), f, indent=2)
+    history = SpotHistory(sandbox.file(".cache", "spot_history.db"), auto_migrate=False)
+    for ts, gold, silver in zip(*(column.tolist() for column in synth.spot_ticks(500))):
+        history.append({"gold": gold, "silver": silver}, timestamp=ts)
+    history.close()
+
+
+def import_check():
+    """Import every CLI module plus the library modules in an empty dir; report output and created files."""
+    modules = sorted({module for module, _ in COMMANDS.values()} | set(LIBRARY_MODULES))
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as workdir:
+        env = {**os.environ, "HOME": workdir, "PYTHONPATH": REPO, "GOLDAPI_KEY": ""}
+        completed = subprocess.run([sys.executable, "-c", f"import {', '.join(modules)}"], cwd=workdir, env=env,
+                                   capture_output=True, text=True)
+        created = sorted(os.listdir(workdir))
+    return {
+        "modules": len(modules),
+        "ok": completed.returncode == 0 and not completed.stdout and not created,
+        "stdout": completed.stdout[:200],
+        "error": completed.stderr.strip().splitlines()[-1] if completed.returncode else None,
+        "created_files": created,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check toolkit.py startup times against the budget")
+    parser.add_argument("--runs", type=int, default=15, help="Runs per command (the median is reported)")
+    args = parser.parse_args()
+
+    # Nothing here should reach GoldAPI: the URL points at a closed port
+    sandbox = Sandbox("http://127.0.0.1:9")
+    try:
+        seed(sandbox)
+        env = sandbox.env
+        baseline = median_ms([sys.executable, "-c", "pass"], sandbox.path, env, args.runs)
+        toolkit = os.path.join(REPO, "toolkit.py")
+        commands = {}
+        for name, argv in COMMAND_ARGS.items():
+            total = median_ms([sys.executable, toolkit, *argv], sandbox.path, env, args.runs)
+            overhead = total - baseline
+            commands[name] = {
+                "argv": " ".join(argv),
+                "median_ms": round(total, 1),
+                "overhead_ms": round(overhead, 1),
+                "budget_ms": STARTUP_BUDGETS_MS[name],
+                "within_budget": overhead <= STARTUP_BUDGETS_MS[name],
+            }
+    finally:
+        sandbox.cleanup()
+
+    imports = import_check()
+    report = {"runs": args.runs, "python_ms": round(baseline, 1), "commands": commands, "import_check": imports}
+    print(json.dumps(report, indent=2))
+    if not imports["ok"] or not all(command["within_budget"] for command in commands.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
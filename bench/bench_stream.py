@@ -0,0 +1,61 @@
+# bench/bench_stream.py
+# Peak traced memory of whole-file load_csv vs chunked stream_section.
+#
+#   python -m bench.bench_stream --rows 1000000 --chunksize 100000
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench.synth import write_transactions_csv
+from budget_parse import categorize_frame, read_budget_csv, stream_section
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(elapsed, 3), round(peak / 2**20, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming CSV ingestion")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spending.csv")
+        write_transactions_csv(path, args.rows)
+
+        def whole():
+            df = read_budget_csv(path, "spending")
+            categorize_frame("spending", df, {"spending": {}})
+
+        def streamed():
+            stream_section("spending", path, {"spending": {}}, lambda out: None, args.chunksize)
+
+        whole_s, whole_mb = measure(whole)
+        stream_s, stream_mb = measure(streamed)
+
+    print(json.dumps({
+        "rows": args.rows,
+        "chunksize": args.chunksize,
+        "whole_s": whole_s,
+        "whole_peak_mb": whole_mb,
+        "stream_s": stream_s,
+        "stream_peak_mb": stream_mb,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench/bench_vendor_match.py
+# Build time, cache load time and lookup latency of the vendor matching index,
+# plus how many bank-style variants resolve back to their vendor.
+#
+#   python -m bench.bench_vendor_match --vendors 20000
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bench.synth import vendor_names, vendor_variants
+from vendor_match import VendorMatcher, load_matcher
+
+
+def per_lookup_us(matcher, names, section="spending"):
+    start = time.perf_counter()
+    results = [matcher.resolve(name, section) for name in names]
+    return round((time.perf_counter() - start) / len(names) * 1e6, 2), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy vendor matching")
+    parser.add_argument("--vendors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    names = vendor_names(args.vendors, seed=1)
+    vendor_map = {"recurring": {}, "spending": {name: {"Category": "Misc"} for name in names}}
+
+    start = time.perf_counter()
+    matcher = VendorMatcher.build(vendor_map)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "vendor_index.pkl")
+        load_matcher(vendor_map, path=cache)
+        start = time.perf_counter()
+        load_matcher(vendor_map, path=cache)
+        cache_load_s = time.perf_counter() - start
+
+    sample = names[:args.queries]
+    variants = vendor_variants(sample, seed=2)
+    unknown = [f"Zz{name}qx Depot" for name in vendor_names(args.queries, seed=99)]
+
+    exact_us, _ = per_lookup_us(matcher, sample)
+    variant_us, resolved = per_lookup_us(matcher, variants)
+    miss_us, false_hits = per_lookup_us(matcher, unknown)
+
+    print(json.dumps({
+        "vendors": args.vendors,
+        "build_s": round(build_s, 3),
+        "cache_load_s": round(cache_load_s, 3),
+        "exact_lookup_us": exact_us,
+        "variant_lookup_us": variant_us,
+        "miss_lookup_us": miss_us,
+        "variants_resolved_correctly": round(sum(r == n for r, n in zip(resolved, sample)) / len(sample), 3),
+        "unknown_false_matches": sum(r is not None for r in false_hits),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
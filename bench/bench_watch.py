@@ -0,0 +1,107 @@
+# bench/bench_watch.py
+# Soak test for the spot watch loop: many ticks on a simulated clock (15 minutes
+# apart by default), reporting traced Python memory at each quarter of the run.
+# The GSR window evicts after gsr_window_days, so memory should level off
+# instead of growing with the tick count. With --stub, prices come over HTTP from the local
+# GoldAPI stub; otherwise from an in-process random walk.
+#
+#   python -m bench.bench_watch --ticks 20000
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import spot_watch
+from bench.stub_goldapi import StubGoldAPI
+from spot_fetcher import SpotFetcher
+from spot_history import SpotHistory
+
+
+class SimulatedClock:
+    """Advances step seconds per read and samples traced memory every sample_every reads."""
+
+    def __init__(self, start, step, sample_every):
+        self.now = start
+        self.step = step
+        self.reads = 0
+        self.sample_every = sample_every
+        self.samples = []
+
+    def __call__(self):
+        self.now += self.step
+        self.reads += 1
+        if self.reads % self.sample_every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            self.samples.append({"clock_reads": self.reads, "traced_kib": round(current / 1024),
+                                 "peak_kib": round(peak / 1024)})
+        return self.now
+
+
+def random_walk(seed=7):
+    rng = random.Random(seed)
+    prices = {"gold": 2350.0, "silver": 29.85}
+
+    def fetch():
+        for metal in prices:
+            prices[metal] *= 1 + rng.gauss(0, 0.002)
+        return dict(prices)
+    return fetch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test the spot watch loop for memory growth")
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--step", type=float, default=900, help="Simulated seconds between ticks")
+    parser.add_argument("--threshold", type=float, default=0.01)
+    parser.add_argument("--stub", action="store_true", help="Fetch over HTTP from the local GoldAPI stub")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_watch_")
+    settings = spot_watch.watch_settings({}, min_interval_seconds=0, monthly_quota=0, notify=["file"],
+                                         alert_file=os.path.join(workdir, "alerts.jsonl"),
+                                         notify_threshold_pct=args.threshold)
+    history = SpotHistory(os.path.join(workdir, "history.db"), auto_migrate=False)
+    state_path = os.path.join(workdir, "state.json")
+    # Each tick reads the clock twice (schedule check + tick time), so step/2 per read
+    clock = SimulatedClock(time.time() - args.ticks * args.step, args.step / 2, sample_every=max(2, args.ticks // 2))
+
+    stub = fetcher = None
+    if args.stub:
+        stub = StubGoldAPI(drift=0.004).start()
+        fetcher = SpotFetcher(stub.url, {"x-access-token": "stub"})
+        fetch = lambda: fetcher.fetch_named(("XAU", "XAG"))
+    else:
+        fetch = random_walk()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    done = spot_watch.watch(fetch, settings, history=history, state_path=state_path,
+                            max_ticks=args.ticks, clock=clock)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    if stub:
+        fetcher.close()
+        stub.stop()
+    alerts = 0
+    if os.path.exists(settings["alert_file"]):
+        with open(settings["alert_file"]) as f:
+            alerts = sum(1 for _ in f)
+
+    print(json.dumps({
+        "ticks": done,
+        "simulated_days": round(done * args.step / 86400, 1),
+        "source": "stub" if args.stub else "random_walk",
+        "ticks_per_s": round(done / elapsed, 1),
+        "alerts": alerts,
+        "history_rows": history.count(),
+        "memory": [{"ticks": sample.pop("clock_reads") // 2, **sample} for sample in clock.samples],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# bench/fake_gspread.py
+# In-memory stand-in for the parts of gspread the budget tools use.
+# Counts API calls and request bytes so writers can be compared offline.
+
+import json
+import threading
+import time
+from collections import Counter
+
+import gspread
+from gspread.utils import a1_to_rowcol
+
+
+class FakeResponse:
+    def __init__(self, status_code, message):
+        self.status_code = status_code
+        self.text = message
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": self.text, "status": "FAKE"}}
+
+
+class FakeClient:
+    def __init__(self, latency=0.0):
+        self.spreadsheets = {}
+        self.calls = Counter()
+        self.bytes_sent = 0
+        self.failures = []
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def fail_next(self, status_code=429, times=1):
+        """Make the next `times` API calls raise APIError with status_code."""
+        self.failures.extend([status_code] * times)
+
+    def record(self, method, payload=None):
+        """Account for one API call; sleeps `latency` seconds to mimic a round-trip."""
+        with self.lock:
+            if self.failures:
+                status = self.failures.pop(0)
+                raise gspread.exceptions.APIError(FakeResponse(status, f"fake {status} on {method}"))
+            self.calls[method] += 1
+            if payload is not None:
+                self.bytes_sent += len(json.dumps(payload, default=str))
+        if self.latency:
+            time.sleep(self.latency)
+
+    def open(self, name):
+        self.record("open")
+        return self.spreadsheets.setdefault(name, FakeSpreadsheet(self, name))
+
+    def stats(self):
+        return {"calls": sum(self.calls.values()), "by_method": dict(self.calls), "bytes_sent": self.bytes_sent}
+
+    def dump_state(self):
+        """Every tab's size and cells as JSON-ready data, so a later process can reopen them."""
+        return {
+            name: {title: {"rows": tab.row_count, "cols": tab.col_count, "cells": tab.cells}
+                   for title, tab in spreadsheet.tabs.items()}
+            for name, spreadsheet in self.spreadsheets.items()
+        }
+
+    def load_state(self, state):
+        for name, tabs in state.items():
+            spreadsheet = self.spreadsheets.setdefault(name, FakeSpreadsheet(self, name))
+            for title, tab in tabs.items():
+                worksheet = FakeWorksheet(self, title, tab["rows"], tab["cols"])
+                worksheet.cells = tab["cells"]
+                spreadsheet.tabs[title] = worksheet
+
+
+class FakeSpreadsheet:
+    def __init__(self, client, title):
+        self.client = client
+        self.title = title
+        self.tabs = {}
+
+    def worksheet(self, title):
+        self.client.record("worksheet")
+        if title not in self.tabs:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.tabs[title]
+
+    def worksheets(self):
+        self.client.record("worksheets")
+        return list(self.tabs.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self.client.record("add_worksheet", {"title": title, "rows": rows, "cols": cols})
+        self.tabs[title] = FakeWorksheet(self.client, title, int(rows), int(cols))
+        return self.tabs[title]
+
+
+class FakeWorksheet:
+    def __init__(self, client, title, rows, cols):
+        self.client = client
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = []
+
+    def _ensure(self, row_index):
+        while len(self.cells) <= row_index:
+            self.cells.append([])
+
+    def _set(self, row, col, value):
+        if row > self.row_count or col > self.col_count:
+            raise gspread.exceptions.APIError(FakeResponse(400, f"Range exceeds grid limits: R{row}C{col}"))
+        self._ensure(row - 1)
+        cells = self.cells[row - 1]
+        cells.extend([""] * (col - len(cells)))
+        cells[col - 1] = "" if value is None else str(value)
+
+    def _trimmed(self):
+        rows = [list(r) for r in self.cells]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+    def get_all_values(self):
+        self.client.record("get_all_values")
+        rows = self._trimmed()
+        width = max((len(r) for r in rows), default=0)
+        return [r + [""] * (width - len(r)) for r in rows]
+
+    def batch_update(self, data, **kwargs):
+        self.client.record("batch_update", data)
+        for item in data:
+            start = item["range"].split(":")[0]
+            row, col = a1_to_rowcol(start)
+            for r, values in enumerate(item["values"]):
+                for c, value in enumerate(values):
+                    self._set(row + r, col + c, value)
+
+    def append_rows(self, values, **kwargs):
+        self.client.record("append_rows", values)
+        last = len(self._trimmed())
+        self.row_count = max(self.row_count, last + len(values))
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                self._set(last + r + 1, c + 1, value)
+
+    def clear(self):
+        self.client.record("clear")
+        self.cells = []
+
+    def resize(self, rows=None, cols=None):
+        self.client.record("resize", {"rows": rows, "cols": cols})
+        if rows is not None:
+            self.row_count = int(rows)
+            del self.cells[self.row_count:]
+        if cols is not None:
+            self.col_count = int(cols)
+            self.cells = [r[:self.col_count] for r in self.cells]
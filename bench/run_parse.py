@@ -0,0 +1,44 @@
+# bench/run_parse.py
+# Run budget_parse.py's CLI against the in-memory fake gspread backend, so the
+# full ingest + upload path can be timed without Google credentials. Takes the
+# same arguments as budget_parse.py. Set BENCH_SHEETS_STATS=path to write the
+# fake backend's call/byte counts as JSON when the run ends, and
+# BENCH_SHEETS_STATE=path to load the fake spreadsheet's tabs from that file
+# (when it exists) and save them back, so a later run sees the same Sheet.
+#
+#   python -m bench.run_parse may 2025 --replace --profile
+
+import json
+import os
+
+import budget_parse
+from bench.fake_gspread import FakeClient
+from sheets_client import SheetsSession
+
+CLIENT = FakeClient()
+
+
+def fake_session(credentials_file, sheet_name):
+    return SheetsSession(credentials_file, sheet_name, token_cache="/dev/null", client_factory=lambda _: CLIENT)
+
+
+def main():
+    budget_parse.get_session = fake_session
+    state_path = os.getenv("BENCH_SHEETS_STATE")
+    if state_path and os.path.exists(state_path):
+        with open(state_path) as f:
+            CLIENT.load_state(json.load(f))
+    try:
+        budget_parse.main()
+    finally:
+        stats_path = os.getenv("BENCH_SHEETS_STATS")
+        if stats_path:
+            with open(stats_path, "w") as f:
+                json.dump(CLIENT.stats(), f)
+        if state_path:
+            with open(state_path, "w") as f:
+                json.dump(CLIENT.dump_state(), f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# bench/stub_goldapi.py
+# Local stand-in for the GoldAPI HTTP endpoints (/api/<METAL>/<CURRENCY>).
+# Adds configurable latency and injectable failures, and counts requests and
+# connections so keep-alive reuse and retries can be checked offline.
+#
+#   python -m bench.stub_goldapi --port 8765 --latency 0.2
+#   GOLDAPI_URL=http://127.0.0.1:8765/api GOLDAPI_KEY=stub python gold_api.py --dry-run
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_PRICES = {"XAU": 2350.40, "XAG": 29.85, "XPT": 985.10, "XPD": 1010.75}
+FX = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "CAD": 1.37, "AUD": 1.51}
+
+
+class StubGoldAPI:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, prices=None, drift=0.0):
+        self.latency = latency
+        self.prices = dict(prices or BASE_PRICES)
+        self.drift = drift
+        self.requests = Counter()
+        self.connections = 0
+        self.failures = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def fail_next(self, status_code=503, times=1):
+        """Answer the next `times` requests with status_code."""
+        with self.lock:
+            self.failures.extend([status_code] * times)
+
+    def set_price(self, metal, price):
+        with self.lock:
+            self.prices[metal] = price
+
+    def quote(self, metal, currency):
+        with self.lock:
+            price = self.prices[metal]
+            if self.drift:
+                # Deterministic random walk so repeated polls see movement
+                self.prices[metal] = price * (1 + self.drift * ((self.requests[metal] % 7) - 3) / 3)
+        return round(price * FX[currency], 2)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub.lock:
+                    failure = stub.failures.pop(0) if stub.failures else None
+                if failure:
+                    return self.reply(failure, {"error": f"stub failure {failure}"})
+                if len(parts) != 3 or parts[0] != "api" or parts[1] not in stub.prices or parts[2] not in FX:
+                    return self.reply(404, {"error": f"unknown endpoint {self.path}"})
+                metal, currency = parts[1], parts[2]
+                with stub.lock:
+                    stub.requests[metal] += 1
+                self.reply(200, {
+                    "timestamp": int(time.time()),
+                    "metal": metal,
+                    "currency": currency,
+                    "price": stub.quote(metal, currency),
+                })
+
+            def reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        with self.lock:
+            return {"requests": sum(self.requests.values()), "by_metal": dict(self.requests),
+                    "connections": self.connections}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the GoldAPI endpoints")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--drift", type=float, default=0.0, help="Fractional price movement per request")
+    args = parser.parse_args()
+
+    stub = StubGoldAPI(port=args.port, latency=args.latency, drift=args.drift)
+    print(f"🧪 Stub GoldAPI listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# bench/suite.py
+# Offline benchmark suite over the toolkit's hot paths at 1k / 100k / 1M scale.
+#
+# Every CLI runs as a subprocess inside a throwaway sandbox directory (its own
+# HOME, configs and .cache), with GOLDAPI_URL pointed at the local GoldAPI stub
+# and budget uploads going to the fake gspread backend (bench/run_parse.py). Each
+# tool's own --metrics-json export supplies per-stage timings next to the wall
+# time. Results are one JSON document tagged with the git commit. Pass --compare
+# to diff against an earlier run and flag regressions.
+#
+#   python -m bench.suite --scales 1k,100k --out bench_results.json
+#   python -m bench.suite --scales 1k --compare bench_results.json --fail-on-regression
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from bench import synth
+from bench.stub_goldapi import StubGoldAPI
+from gsr_stats import RollingGSR, backfill
+from spot_history import SpotHistory
+from vendor_store import VendorStore
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SCENARIOS = ["ingest", "upload", "vendor_map", "valuation", "inventory", "history"]
+CONFIG_FILES = ["coin_spec.json", "premium_profiles.json", "user_config.json"]
+MONTH, YEAR = "may", 2025
+TOOL_TIMEOUT = 1800
+SINGLE_APPENDS = 2000  # appends timed one commit at a time; the rest are bulk-loaded
+REGRESSION_RATIO = 1.25
+NOISE_FLOOR_S = 0.02
+
+
+class Sandbox:
+    """Temporary working directory with copies of the config files and an env for the CLIs."""
+
+    def __init__(self, stub_url, keep=False):
+        self.path = tempfile.mkdtemp(prefix="bench_suite_")
+        self.keep = keep
+        for name in CONFIG_FILES:
+            shutil.copy(os.path.join(REPO, name), self.path)
+        self.env = {
+            **os.environ,
+            "HOME": self.path,
+            "PYTHONPATH": REPO + os.pathsep + os.environ.get("PYTHONPATH", ""),
+            "GOLDAPI_KEY": "stub",
+            "GOLDAPI_URL": stub_url,
+            "GOOGLE_CREDS_PATH": os.path.join(self.path, "credentials.json"),
+        }
+
+    def file(self, *parts):
+        path = os.path.join(self.path, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def run(self, *command, extra_env=None, timeout=TOOL_TIMEOUT):
+        """Run a CLI (script path or -m module) and return wall time plus its exported stage timings."""
+        metrics_path = self.file(".bench", f"metrics_{time.monotonic_ns()}.json")
+        if command[0].endswith(".py"):
+            command = (os.path.join(REPO, command[0]), *command[1:])
+        argv = [sys.executable, *command, "--metrics-json", metrics_path]
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(argv, cwd=self.path, env={**self.env, **(extra_env or {})},
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                       timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {"timeout": True, "wall_s": round(time.perf_counter() - start, 3)}
+        result = {"wall_s": round(time.perf_counter() - start, 3)}
+        if completed.returncode != 0:
+            result["error"] = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit {completed.returncode}"
+        result.update(read_metrics(metrics_path))
+        return result
+
+    def cleanup(self):
+        if not self.keep:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+
+def read_metrics(path):
+    """Stage seconds and counter totals from a --metrics-json export."""
+    try:
+        with open(path) as f:
+            exported = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    stages = {
+        f"{hist['labels']['stage']}_s": round(hist["sum"], 4)
+        for hist in exported["histograms"]
+        if hist["name"] == "stage_seconds"
+    }
+    counters = {}
+    for counter in exported["counters"]:
+        counters[counter["name"]] = counters.get(counter["name"], 0) + counter["value"]
+    return {"stages": stages, "counters": counters}
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return round(time.perf_counter() - start, 4), result
+
+
+def write_month_csvs(sandbox, rows, seed=0):
+    recurring = max(1, rows // 5)
+    for section, count in (("recurring", recurring), ("spending", rows - recurring)):
+        path = sandbox.file("Documents", "budget", section, str(YEAR), f"{MONTH}.csv")
+        synth.month_transactions(count, YEAR, 5, seed=seed + len(section)).to_csv(path, index=False)
+
+
+def bench_ingest(sandbox, rows):
+    """CSV load + categorization + vendor map merge, cold and again from the month cache."""
+    write_month_csvs(sandbox, rows)
+    cold = sandbox.run("budget_parse.py", MONTH, str(YEAR), "--dry-run")
+    warm = sandbox.run("budget_parse.py", MONTH, str(YEAR), "--dry-run")
+    return {"rows": rows, "cold": cold, "warm_cache": warm}
+
+
+def bench_upload(sandbox, rows):
+    """
+    Full parse + Sheets upload against the fake gspread backend: a fresh tab,
+    then the same rows again into the now-existing tab, where the diff writer
+    should send next to nothing.
+    """
+    write_month_csvs(sandbox, rows, seed=1)
+    stats_path = sandbox.file(".bench", "sheets_stats.json")
+    env = {"BENCH_SHEETS_STATS": stats_path, "BENCH_SHEETS_STATE": sandbox.file(".bench", "sheets_state.json")}
+    result = {"rows": rows}
+    # --replace on both runs: without it budget_parse.py leaves an existing tab alone
+    for name in ("new_tab", "reupload"):
+        run = sandbox.run("-m", "bench.run_parse", MONTH, str(YEAR), "--replace", "--no-cache", extra_env=env)
+        with open(stats_path) as f:
+            run["sheets"] = json.load(f)
+        result[name] = run
+    return result
+
+
+def bench_vendor_map(sandbox, vendors):
+    store = VendorStore(sandbox.file("vendor_map.json"), auto_migrate=False)
+    vendor_map = synth.vendor_map(vendors)
+    save_s, _ = timed(store.save, vendor_map)
+    store.close()
+    load_s, loaded = timed(store.load)
+    # Touch 1% of vendors: the save should only rewrite those rows
+    for name in list(loaded["spending"])[: max(1, vendors // 100)]:
+        loaded["spending"][name] = {"Category": "Shopping", "Type": "spending"}
+    resave_s, written = timed(store.save, loaded)
+    store.close()
+    return {"vendors": vendors, "initial_save_s": save_s, "load_s": load_s,
+            "resave_1pct_s": resave_s, "resave_rows_written": written}
+
+
+def bench_valuation(sandbox, rows):
+    with open(os.path.join(sandbox.path, "coin_spec.json")) as f:
+        coin_keys = list(json.load(f))
+    with open(os.path.join(sandbox.path, "premium_profiles.json")) as f:
+        profiles = list(json.load(f)["profiles"])
+    path = sandbox.file("coin_batch.csv")
+    synth.coin_batch_frame(rows, coin_keys, profiles).to_csv(path, index=False)
+    return {"rows": rows, "batch": sandbox.run("coin_valuation.py", "--batch", path)}
+
+
+def bench_inventory(sandbox, entries):
+    with open(os.path.join(sandbox.path, "coin_spec.json")) as f:
+        coin_spec = json.load(f)
+    with open(sandbox.file("coin_inventory.json"), "w") as f:
+        json.dump(synth.inventory_entries(entries, coin_spec), f, indent=2)
+    coin = sorted(coin_spec)[0]
+    return {
+        "entries": entries,
+        "add": sandbox.run("coin_inventory.py", "add", "--coin", coin, "--price", "2400",
+                           "--date", "2025-05-06", "--source", "bench"),
+        "list": sandbox.run("coin_inventory.py", "list"),
+        "export_csv": sandbox.run("coin_inventory.py", "export", "--format", "csv"),
+        "export_json": sandbox.run("coin_inventory.py", "export", "--format", "json"),
+    }
+
+
+def bench_history(sandbox, ticks):
+    """Spot history appends and queries plus GSR engine push/backfill over `ticks` ticks."""
+    history = SpotHistory(sandbox.file(".cache", "spot_history.db"), auto_migrate=False)
+    timestamps, gold, silver = synth.spot_ticks(ticks)
+    single = min(ticks, SINGLE_APPENDS)
+    bulk = ticks - single
+
+    with history.conn:
+        bulk_s, _ = timed(history.conn.executemany, "INSERT INTO ticks (ts, gold, silver) VALUES (?, ?, ?)",
+                          zip(timestamps[:bulk].tolist(), gold[:bulk].tolist(), silver[:bulk].tolist()))
+    start = time.perf_counter()
+    for ts, g, s in zip(timestamps[bulk:].tolist(), gold[bulk:].tolist(), silver[bulk:].tolist()):
+        history.append({"gold": g, "silver": s}, timestamp=ts)
+    append_us = (time.perf_counter() - start) / single * 1e6
+
+    latest_s, _ = timed(history.latest)
+    day_s, day = timed(history.range, start=timestamps[-1] - 86400)
+    bars_s, bars = timed(history.bars, "day")
+
+    engine = RollingGSR()
+    start = time.perf_counter()
+    for ts, ratio in zip(timestamps.tolist(), (gold / silver).tolist()):
+        engine.push(ts, ratio)
+    push_us = (time.perf_counter() - start) / ticks * 1e6
+    window_s, _ = timed(RollingGSR.from_history, history)
+    backfill_s, _ = timed(backfill, history, legacy_path=None, output=None)
+    history.close()
+    return {
+        "ticks": ticks,
+        "bulk_insert_s": bulk_s,
+        "append_us": round(append_us, 1),
+        "latest_s": latest_s,
+        "range_last_day_s": day_s,
+        "range_last_day_rows": len(day),
+        "bars_day_s": bars_s,
+        "bars_day": len(bars),
+        "gsr_push_us": round(push_us, 2),
+        "gsr_window_load_s": window_s,
+        "gsr_backfill_s": backfill_s,
+    }
+
+
+BENCHES = {
+    "ingest": bench_ingest,
+    "upload": bench_upload,
+    "vendor_map": bench_vendor_map,
+    "valuation": bench_valuation,
+    "inventory": bench_inventory,
+    "history": bench_history,
+}
+
+
+def git_info():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=REPO, capture_output=True, text=True, timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def flatten(tree, prefix=""):
+    """{"1k.ingest.cold.wall_s": 0.41, ...} for every timing leaf (keys ending in _s or _us)."""
+    leaves = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            leaves.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and key.endswith(("_s", "_us")):
+            leaves[path] = value
+    return leaves
+
+
+def compare(results, baseline, ratio=REGRESSION_RATIO):
+    """Timing ratios against a baseline run; changes smaller than the noise floor in absolute terms are ignored."""
+    current, previous = flatten(results["results"]), flatten(baseline["results"])
+    changes = {}
+    for path in sorted(set(current) & set(previous)):
+        old, new = previous[path], current[path]
+        floor = NOISE_FLOOR_S * 1e6 if path.endswith("_us") else NOISE_FLOOR_S
+        if abs(new - old) < floor:
+            continue
+        changes[path] = {"baseline": old, "current": new, "ratio": round(new / old, 2) if old else None}
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "regressions": {path: c for path, c in changes.items() if c["ratio"] is None or c["ratio"] > ratio},
+        "improvements": {path: c for path, c in changes.items() if c["ratio"] is not None and c["ratio"] < 1 / ratio},
+        "compared": len(changes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the budget and coin tools")
+    parser.add_argument("--scales", default="1k", help=f"Comma-separated: {', '.join(SCALES)}")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--out", help="Write results JSON here as well as printing it")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO, help="Slowdown ratio counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if --compare finds regressions")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds added to each stub GoldAPI response")
+    parser.add_argument("--keep", action="store_true", help="Keep sandbox directories for inspection")
+    args = parser.parse_args()
+
+    scales = args.scales.split(",")
+    scenarios = args.scenarios.split(",")
+    for scale in scales:
+        if scale not in SCALES:
+            parser.error(f"unknown scale '{scale}'")
+    for scenario in scenarios:
+        if scenario not in BENCHES:
+            parser.error(f"unknown scenario '{scenario}'")
+
+    results = {
+        "suite": "budget-coin-toolkit",
+        **git_info(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    with StubGoldAPI(latency=args.stub_latency) as stub:
+        for scale in scales:
+            results["results"][scale] = {}
+            for scenario in scenarios:
+                sandbox = Sandbox(stub.url, keep=args.keep)
+                print(f"⏱️  {scenario} @ {scale}...", file=sys.stderr, flush=True)
+                try:
+                    results["results"][scale][scenario] = BENCHES[scenario](sandbox, SCALES[scale])
+                finally:
+                    sandbox.cleanup()
+        results["goldapi_stub"] = stub.stats()
+
+    if args.compare:
+        with open(args.compare) as f:
+            results["comparison"] = compare(results, json.load(f), args.ratio)
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    if args.fail_on_regression and results.get("comparison", {}).get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
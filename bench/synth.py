@@ -0,0 +1,157 @@
+# bench/synth.py
+# Synthetic data generators for offline benchmarks.
+
+import numpy as np
+import pandas as pd
+
+VENDORS = [
+    "Spotify", "Netflix", "VERIZON", "Patreon* Membership", "Trader Joe's",
+    "AMZN Mktp US", "Amazon.com", "Whole Foods", "Shell Oil 5743", "Uber Trip",
+    "Starbucks Store 1123", "Target T-2231", "Costco Whse #0482", "Adobe Creative",
+    "GitHub Inc", "Home Depot 6620", "CVS/Pharmacy #0871", "Delta Air Lines",
+    "Chipotle 2291", "Lyft Ride",
+]
+CATEGORIES = [
+    "Bills & Utilities", "Groceries", "Dining & Drinks", "Shopping",
+    "Auto & Transport", "Software & Tech", "Health & Wellness", "Travel & Vacation",
+    "Home & Garden", "",
+]
+SYLLABLES = ["ka", "lo", "mi", "ra", "ven", "tor", "zen", "bri", "quo", "lux", "pel", "dra", "sun", "mar", "fin"]
+SUFFIXES = ["Market", "Coffee", "Pharmacy", "Outfitters", "Grill", "Hardware", "Books", "Fitness", "Cleaners", ""]
+STATES = ["WA", "TX", "CA", "NY", "FL", "IL"]
+CITIES = ["SEATTLE", "AUSTIN", "OAKLAND", "BROOKLYN", "MIAMI", "CHICAGO"]
+ACCOUNTS = [
+    ("Credit Card", "CREDIT CARD", 5453, "Chase"),
+    ("Credit Card", "CREDIT CARD", 3139, "Chase"),
+    ("Cash", "SoFi Checking", 9538, "SoFi"),
+]
+
+
+def transactions_frame(rows, seed=0, vendor_count=None, start="2020-01-01", days=1825):
+    """Rocket Money style export with the columns load_csv expects."""
+    rng = np.random.default_rng(seed)
+    vendors = np.array(VENDORS, dtype=object)
+    if vendor_count and vendor_count > len(VENDORS):
+        extra = np.array([f"Vendor {i:06d}" for i in range(vendor_count - len(VENDORS))], dtype=object)
+        vendors = np.concatenate([vendors, extra])
+
+    name_idx = rng.integers(0, len(vendors), rows)
+    account_idx = rng.integers(0, len(ACCOUNTS), rows)
+    accounts = np.array(ACCOUNTS, dtype=object)[account_idx]
+    dates = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+    amounts = np.round(rng.gamma(2.0, 40.0, rows), 2)
+
+    return pd.DataFrame({
+        "Original Date": dates.strftime("%Y-%m-%d"),
+        "Account Type": accounts[:, 0],
+        "Account Name": accounts[:, 1],
+        "Account Number": accounts[:, 2].astype(int),
+        "Institution Name": accounts[:, 3],
+        "Name": vendors[name_idx],
+        "Amount": [f"${a:,.2f}" for a in amounts],
+        "Description": vendors[name_idx],
+        "Category": np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), rows)],
+    })
+
+
+def write_transactions_csv(path, rows, seed=0, **kwargs):
+    transactions_frame(rows, seed=seed, **kwargs).to_csv(path, index=False)
+    return path
+
+
+def vendor_names(count, seed=0):
+    """Distinct made-up merchant names like "Ravenlo Coffee"."""
+    rng = np.random.default_rng(seed)
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(SYLLABLES, rng.integers(2, 4))).capitalize()
+        suffix = rng.choice(SUFFIXES)
+        names.add(f"{word} {suffix}".strip())
+    return sorted(names)
+
+
+def vendor_variants(names, seed=0):
+    """Bank-statement style variants: store numbers, city/state suffixes, processor prefixes."""
+    rng = np.random.default_rng(seed)
+    variants = []
+    for name in names:
+        style = rng.integers(0, 4)
+        if style == 0:
+            variants.append(f"{name.upper()} #{rng.integers(100, 9999):04d}")
+        elif style == 1:
+            variants.append(f"{name} {rng.integers(1000, 99999)} {rng.choice(CITIES)} {rng.choice(STATES)}")
+        elif style == 2:
+            variants.append(f"SQ *{name.upper()}")
+        else:
+            variants.append(f"{name}.com")
+    return variants
+
+
+def month_transactions(rows, year, month, seed=0, **kwargs):
+    """transactions_frame with every date inside one calendar month."""
+    start = pd.Timestamp(year=year, month=month, day=1)
+    return transactions_frame(rows, seed=seed, start=start.strftime("%Y-%m-%d"), days=start.days_in_month, **kwargs)
+
+
+def vendor_map(count, seed=0):
+    """{section: {name: {"Category", "Type"}}} with count vendors split across both sections."""
+    rng = np.random.default_rng(seed)
+    categories = [category for category in CATEGORIES if category]
+    names = [f"Vendor {i:07d}" for i in range(count)]
+    sections = rng.choice(["recurring", "spending"], count, p=[0.2, 0.8])
+    picks = rng.integers(0, len(categories), count)
+    result = {"recurring": {}, "spending": {}}
+    for name, section, pick in zip(names, sections, picks):
+        result[section][name] = {"Category": categories[pick], "Type": section}
+    return result
+
+
+def coin_batch_frame(rows, coin_keys, profiles, seed=0):
+    """coin,price,profile rows for coin_valuation.py --batch."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "coin": np.array(sorted(coin_keys), dtype=object)[rng.integers(0, len(coin_keys), rows)],
+        "price": np.round(rng.uniform(20, 2600, rows), 2),
+        "profile": np.array(sorted(profiles), dtype=object)[rng.integers(0, len(profiles), rows)],
+    })
+
+
+def inventory_entries(count, coin_spec, seed=0):
+    """coin_inventory.json entries shaped like the ones add_coin writes."""
+    rng = np.random.default_rng(seed)
+    keys = sorted(coin_spec)
+    dates = pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 2500, count), unit="D")
+    entries = []
+    for i, (pick, price, spot, date) in enumerate(zip(rng.integers(0, len(keys), count),
+                                                      rng.uniform(20, 2600, count),
+                                                      rng.uniform(18, 2400, count),
+                                                      dates.strftime("%Y-%m-%d"))):
+        coin = coin_spec[keys[pick]]
+        melt = coin["metal_content_oz"] * spot
+        entries.append({
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "coin": keys[pick],
+            "type": coin["type"],
+            "category": coin["category"],
+            "price_paid": round(float(price), 2),
+            "quantity": int(rng.integers(1, 20)),
+            "condition": "BU",
+            "source": "Synthetic",
+            "date": date,
+            "spot_price_at_purchase": round(float(spot), 2),
+            "melt_value": round(float(melt), 2),
+            "premium_dollar": round(float(price - melt), 2),
+            "premium_pct": round(float((price - melt) / melt), 4) if melt else 0,
+            "notes": "",
+        })
+    return entries
+
+
+def spot_ticks(count, step=900.0, end=None, seed=0):
+    """(timestamps, gold, silver) random walks ending at `end` (epoch seconds, default now)."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now(tz="UTC").timestamp() if end is None else end
+    timestamps = end - step * np.arange(count, 0, -1, dtype=float)
+    gold = 2350.0 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    silver = gold / (80 * np.exp(np.cumsum(rng.normal(0, 0.0008, count))))
+    return timestamps, gold, silver
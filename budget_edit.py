@@ -1,6 +1,10 @@
+import csv
 import json
 import os
+import re
 import argparse
+import metrics
+import vendor_store
 
 DEFAULT_CATEGORIES = [
     "Mortgage", "Car", "Utilities", "Subscriptions", "Childcare", "Health",
@@ -10,21 +14,23 @@ DEFAULT_CATEGORIES = [
     "Software & Tech", "Home & Garden", "Travel & Vacation"
 ]
 
+PAGE_SIZE = 25
+# "Category=Software & Tech /adobe|github/i": an optional trailing regex picks the targets
+BULK_TARGET = re.compile(r"^(.*?)(?:\s+(/.+/[a-z]*))?$")
+
 def resolve_vendor_map_path(month=None, year=None):
     if month and year:
         return f"vendor_map-{month.zfill(2)}-{year}.json"
     return "vendor_map.json"
 
 def load_vendor_map(path):
-    if not os.path.exists(path):
-        return {"recurring": {}, "spending": {}}
-    with open(path) as f:
-        return json.load(f)
+    with metrics.timer("vendor_map_load"):
+        return vendor_store.load_vendor_map(path)
 
 def save_vendor_map(vendor_map, path):
-    with open(path, "w") as f:
-        json.dump(vendor_map, f, indent=2)
-    print(f"\n✅ {path} saved.\n")
+    with metrics.timer("vendor_map_save"):
+        written, _ = vendor_store.save_vendor_map(vendor_map, path)
+    print(f"\n✅ {vendor_store.db_path_for(path)} saved ({written} vendors changed).\n")
 
 def show_category_menu(categories):
     print("\n📚 Available Categories:")
@@ -98,12 +104,16 @@ def edit_type(entry):
         else:
             print("⚠️  Invalid type. Please enter '1', '2', 'recurring', or 'spending'.")
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--cat-config", help="Optional path to custom categories JSON file")
     parser.add_argument("--month", help="Month of the vendor map to edit (e.g. '03')")
     parser.add_argument("--year", help="Year of the vendor map to edit (e.g. '2025')")
-    return parser.parse_args()
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Vendors listed per page")
+    parser.add_argument("--apply", metavar="FILE", help="Apply edit operations from a JSONL or CSV file without prompting")
+    parser.add_argument("--dry-run", action="store_true", help="With --apply, report changes without saving")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
 
 def load_custom_categories(path):
     if not os.path.exists(path):
@@ -120,13 +130,8 @@ def load_custom_categories(path):
         print(f"⚠️  Failed to load category config: {e}. Using defaults.")
         return DEFAULT_CATEGORIES
 
-def main():
-    args = parse_args()
-    categories = load_custom_categories(args.cat_config) if args.cat_config else DEFAULT_CATEGORIES
-    vendor_map_path = resolve_vendor_map_path(args.month, args.year)
-    vendor_map = load_vendor_map(vendor_map_path)
+def build_entries(vendor_map):
     entries = []
-
     for type_key in ["recurring", "spending"]:
         for name, data in vendor_map.get(type_key, {}).items():
             entries.append({
@@ -134,26 +139,245 @@ def main():
                 "Type": type_key,
                 **(data if isinstance(data, dict) else {"Category": data})
             })
+    return entries
+
+def compile_query(query):
+    """
+    '/adobe|github/i' is a regex (flags after the closing slash); anything else
+    is a case-insensitive substring. Returns a predicate over vendor names.
+    """
+    if len(query) > 1 and query.startswith("/") and query.rfind("/") > 0:
+        end = query.rfind("/")
+        flags = re.IGNORECASE if "i" in query[end + 1:] else 0
+        pattern = re.compile(query[1:end], flags)
+        return lambda name: pattern.search(name) is not None
+    needle = query.lower()
+    return lambda name: needle in name.lower()
+
+def search_entries(entries, query, within=None):
+    """Indices of entries whose name matches query, optionally narrowing an earlier result."""
+    matches = compile_query(query)
+    candidates = range(len(entries)) if within is None else within
+    return [i for i in candidates if matches(entries[i]["Name"])]
+
+def show_page(entries, view, page, page_size, query=None):
+    pages = max(1, -(-len(view) // page_size))
+    page = min(max(page, 0), pages - 1)
+    header = f"matching '{query}'" if query else "all"
+    print(f"\n🗂 Vendor Transactions ({len(view)} {header}, page {page + 1}/{pages}):")
+    for number in range(page * page_size, min(len(view), (page + 1) * page_size)):
+        e = entries[view[number]]
+        print(f"{number + 1}) {e['Name']:<40} Type: {e['Type']:<10} → {e['Category']}")
+    return page
+
+def move_entry(vendor_map, entry, old_type):
+    name = entry["Name"]
+    data = vendor_map[old_type].pop(name, None)
+    data = dict(data) if isinstance(data, dict) else {}
+    data["Category"] = entry["Category"]
+    vendor_map[entry["Type"]][name] = data
+
+def bulk_set(vendor_map, entries, view, assignment):
+    """
+    Apply 'Category=Software' or 'Type=recurring' to every entry in view.
+    Returns the number of entries changed.
+    """
+    field, _, value = assignment.partition("=")
+    field = field.strip().capitalize()
+    value = value.strip()
+    if field not in ("Category", "Type") or not value:
+        raise ValueError("❌ Use set Category=<name> or set Type=recurring|spending.")
+    if field == "Type" and value not in ("recurring", "spending"):
+        raise ValueError("❌ Invalid type. Use 'recurring' or 'spending'.")
+
+    changed = 0
+    for i in view:
+        entry = entries[i]
+        if entry[field] == value:
+            continue
+        old_type = entry["Type"]
+        entry[field] = value
+        move_entry(vendor_map, entry, old_type)
+        changed += 1
+    return changed
+
+def read_operations(path):
+    """
+    Yield (line_number, op) from a JSONL file or a CSV with op,vendor,value[,section]
+    columns. Ops: set_category, set_type, move (alias of set_type).
+    """
+    with open(path, newline="") as f:
+        if path.lower().endswith(".csv"):
+            for line, row in enumerate(csv.DictReader(f), 2):
+                yield line, {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+        else:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError:
+                    raise ValueError(f"❌ {path}:{line} is not valid JSON.")
+
+def apply_operations(vendor_map, operations):
+    """
+    Apply every operation to vendor_map in memory. Returns a summary with
+    counts per op, unchanged ops and vendors that were not found.
+    """
+    sections = {}
+    for type_key in ["recurring", "spending"]:
+        for name in vendor_map.get(type_key, {}):
+            sections.setdefault(name, []).append(type_key)
+
+    summary = {"set_category": 0, "set_type": 0, "unchanged": 0, "missing": []}
+    for line, op in operations:
+        kind = str(op.get("op", "")).lower()
+        name = op.get("vendor")
+        value = op.get("value") or op.get("category") or op.get("type") or op.get("to")
+        if kind == "move":
+            kind = "set_type"
+        if kind not in ("set_category", "set_type") or not name or not value:
+            raise ValueError(f"❌ Line {line}: expected op=set_category|set_type|move with vendor and value.")
+        if kind == "set_type" and value not in ("recurring", "spending"):
+            raise ValueError(f"❌ Line {line}: invalid type '{value}'. Use 'recurring' or 'spending'.")
+
+        found = sections.get(name)
+        if op.get("section"):
+            found = [op["section"]] if found and op["section"] in found else None
+        if not found:
+            summary["missing"].append(name)
+            continue
+
+        for section in list(found):
+            data = vendor_map[section][name]
+            data = dict(data) if isinstance(data, dict) else {"Category": data}
+            if kind == "set_category":
+                if data.get("Category") == value:
+                    summary["unchanged"] += 1
+                    continue
+                data["Category"] = value
+                vendor_map[section][name] = data
+            else:
+                if section == value:
+                    summary["unchanged"] += 1
+                    continue
+                del vendor_map[section][name]
+                vendor_map[value].setdefault(name, data)
+                sections[name] = sorted(set(sections[name]) - {section} | {value})
+            summary[kind] += 1
+    return summary
+
+def run_batch(path, vendor_map, vendor_map_path, dry_run=False):
+    try:
+        with metrics.timer("apply"):
+            summary = apply_operations(vendor_map, read_operations(path))
+    except (OSError, ValueError) as e:
+        print(e)
+        return
+
+    print(f"\n📝 Applied {path}:")
+    print(f"  ✅ {summary['set_category']} category changes")
+    print(f"  ✅ {summary['set_type']} type changes")
+    print(f"  ⏭️  {summary['unchanged']} already up to date")
+    if summary["missing"]:
+        preview = ", ".join(summary["missing"][:5]) + (" ..." if len(summary["missing"]) > 5 else "")
+        print(f"  ⚠️  {len(summary['missing'])} vendors not found: {preview}")
+
+    if dry_run:
+        print("\n🧪 Dry run enabled — vendor store not modified.")
+    else:
+        save_vendor_map(vendor_map, vendor_map_path)
+
+def show_help():
+    print("\nSelect a number to edit, or:")
+    print("  n / p                      next / previous page")
+    print("  /text  or  /regex/i        search (a new search narrows the current one when it extends it)")
+    print("  clear                      show all vendors again")
+    print("  set Category=Software      bulk edit the current results")
+    print("  set Type=recurring /re/i   bulk edit every vendor matching a regex")
+    print("  exit                       save all changes and quit")
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        run(args)
+    finally:
+        metrics.finish(args, "budget_edit")
+
+def run(args):
+    categories = load_custom_categories(args.cat_config) if args.cat_config else DEFAULT_CATEGORIES
+    vendor_map_path = resolve_vendor_map_path(args.month, args.year)
+    vendor_map = load_vendor_map(vendor_map_path)
+    if args.apply:
+        run_batch(args.apply, vendor_map, vendor_map_path, dry_run=args.dry_run)
+        return
+    entries = build_entries(vendor_map)
 
     if not entries:
         print("⚠️  Vendor map is empty.")
         return
 
-    while True:
-        print("\n🗂 Vendor Transactions:")
-        for i, e in enumerate(entries, 1):
-            print(f"{i}) {e['Name']:<40} Type: {e['Type']:<10} → {e['Category']}")
+    view = list(range(len(entries)))
+    query = None
+    page = 0
+    pending = 0
+    redraw = True
 
-        print("\nSelect a number to edit, or type 'exit' to quit.")
+    while True:
+        if redraw:
+            page = show_page(entries, view, page, args.page_size, query)
+            show_help()
+        redraw = True
         selection = input("→ ").strip()
-        if selection.lower() == "exit":
+        command = selection.lower()
+
+        if command == "exit":
             break
-        if not selection.isdigit() or not (1 <= int(selection) <= len(entries)):
+        if command in ("n", "p"):
+            page += 1 if command == "n" else -1
+            continue
+        if command == "clear":
+            view, query, page = list(range(len(entries))), None, 0
+            continue
+        if selection.startswith("/"):
+            text = selection if selection.rfind("/") > 0 else selection[1:]
+            # Typing more of the same substring only re-checks the previous hits
+            narrowing = query and not text.startswith("/") and not query.startswith("/") \
+                and text.lower().startswith(query.lower())
+            try:
+                with metrics.timer("search"):
+                    view = search_entries(entries, text, within=view if narrowing else None)
+            except re.error as e:
+                print(f"⚠️  Invalid regex: {e}")
+                redraw = False
+                continue
+            query, page = text, 0
+            continue
+        if command.startswith("set "):
+            assignment, target = BULK_TARGET.match(selection[4:].strip()).groups()
+            try:
+                with metrics.timer("bulk_set"):
+                    targets = search_entries(entries, target) if target else view
+                    changed = bulk_set(vendor_map, entries, targets, assignment)
+            except re.error as e:
+                print(f"⚠️  Invalid regex: {e}")
+                redraw = False
+                continue
+            except ValueError as e:
+                print(e)
+                redraw = False
+                continue
+            pending += changed
+            print(f"✅ Updated {changed} of {len(targets)} matching vendors ({pending} unsaved changes).")
+            continue
+        if not selection.isdigit() or not (1 <= int(selection) <= len(view)):
             print("⚠️  Invalid selection. Try again.")
+            redraw = False
             continue
 
-        index = int(selection) - 1
+        index = view[int(selection) - 1]
         entry = entries[index]
+        old_type = entry["Type"]
 
         print(f"\n🔧 Editing '{entry['Name']}'")
         print("  1) Change Category")
@@ -172,11 +396,10 @@ def main():
             continue
 
         if updated:
-            name = updated["Name"]
-            vendor_map[entry["Type"]].pop(name, None)
-            vendor_map[updated["Type"]][name] = {"Category": updated["Category"]}
+            move_entry(vendor_map, updated, old_type)
             entries[index] = updated
-            print(f"✅ Updated '{name}' successfully.")
+            pending += 1
+            print(f"✅ Updated '{updated['Name']}' successfully.")
 
     save_vendor_map(vendor_map, vendor_map_path)
 
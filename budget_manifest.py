@@ -0,0 +1,101 @@
+# budget_manifest.py
+# Tracks which budget CSVs and transactions have already been pushed so
+# incremental runs can skip unchanged months and append only new rows.
+
+import hashlib
+import json
+import os
+
+MANIFEST_PATH = ".cache/budget_manifest.json"
+ACCOUNT_COLUMNS = ["Account Number", "Account Name"]
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"files": {}, "tabs": {}}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": file_hash(path)}
+
+
+def file_changed(manifest, path):
+    """
+    True if path differs from what was last recorded. Size and mtime are
+    checked first; the content hash is only computed when they disagree.
+    """
+    entry = manifest["files"].get(path)
+    if not os.path.exists(path):
+        return False
+    if entry is None:
+        return True
+
+    stat = os.stat(path)
+    if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+        return False
+    if entry["size"] == stat.st_size and entry["sha256"] == file_hash(path):
+        # Touched but identical: remember the new mtime so the next check is cheap
+        entry["mtime"] = stat.st_mtime_ns
+        return False
+    return True
+
+
+def month_changed_files(manifest, paths):
+    # Evaluate every path so touched-but-identical files all get their mtime refreshed
+    return [path for path in paths if file_changed(manifest, path)]
+
+
+def record_files(manifest, paths):
+    for path in paths:
+        if os.path.exists(path):
+            manifest["files"][path] = file_fingerprint(path)
+
+
+def transaction_keys(section, df):
+    """
+    Stable per-transaction keys built from date, name, amount and account.
+    Identical transactions on the same day are told apart by their occurrence
+    number, so re-reading the same file always yields the same keys.
+    """
+    if df.empty:
+        return []
+
+    account_col = next((col for col in ACCOUNT_COLUMNS if col in df.columns), None)
+    accounts = df[account_col].astype(str) if account_col else [""] * len(df)
+    base = [
+        f"{section}|{date}|{str(name).strip()}|{amount:.2f}|{account}"
+        for date, name, amount, account in zip(df["Original Date"], df["Name"], df["Amount"], accounts)
+    ]
+    occurrence = df.assign(_key=base).groupby("_key", sort=False).cumcount()
+    return [
+        hashlib.blake2b(f"{key}|{n}".encode(), digest_size=8).hexdigest()
+        for key, n in zip(base, occurrence)
+    ]
+
+
+def known_keys(manifest, tab_name):
+    return set(manifest["tabs"].get(tab_name, []))
+
+
+def record_transactions(manifest, tab_name, keys, replace=False):
+    existing = [] if replace else manifest["tabs"].get(tab_name, [])
+    manifest["tabs"][tab_name] = existing + list(keys)
@@ -1,16 +1,35 @@
 import os
-import json
+import io
 import argparse
+import contextlib
+import threading
 import pandas as pd
-from dotenv import load_dotenv
-import gspread
 import calendar
-from oauth2client.service_account import ServiceAccountCredentials
-
-load_dotenv()
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+import metrics
+import vendor_store
+import month_cache
+import budget_report
+from vendor_match import load_matcher
+from category_rules import RULES_PATH, load_rules
+from sheets_client import UPLOAD_WORKERS, get_session, upload_concurrently
+from sheets_writer import SheetWriter
+from budget_manifest import (
+    known_keys, load_manifest, month_changed_files, record_files, record_transactions,
+    save_manifest, transaction_keys,
+)
 
 MAP_PATH = "vendor_map.json"
 REQUIRED_COLUMNS = ["Original Date", "Name", "Amount", "Category"]
+SECTIONS = ["recurring", "spending"]
+OUTPUT_COLUMNS = ["Timestamp", "Vendor", "Amount", "Type", "Category"]
+STREAM_CHUNKSIZE = 100_000
+
+# One writer per process so every tab shares the same Sheets rate limit
+WRITER = SheetWriter()
+MANIFEST_LOCK = threading.Lock()
 
 def get_month_name(month):
     """
@@ -32,30 +51,84 @@ def get_month_name(month):
     raise ValueError("Invalid month value. Use '03' or 'march', etc.")
 
 def load_vendor_map():
-    if os.path.exists(MAP_PATH):
-        with open(MAP_PATH) as f:
-            return json.load(f)
-    return {"recurring": {}, "spending": {}}
+    return vendor_store.load_vendor_map(MAP_PATH)
 
 def save_vendor_map(vendor_map):
-    with open(MAP_PATH, "w") as f:
-        json.dump(vendor_map, f, indent=2)
-    print(f"\n✅ vendor_map.json updated with {sum(len(v) for v in vendor_map.values())} total vendors.\n")
+    with metrics.timer("vendor_map_save"):
+        written, total = vendor_store.save_vendor_map(vendor_map, MAP_PATH)
+    print(f"\n✅ Vendor store updated: {written} new or changed vendors, {total} total.\n")
+
+def csv_path(section, month_name, year):
+    return os.path.expanduser(f"~/Documents/budget/{section}/{year}/{month_name}.csv")
 
 def load_csv(section, month_name, year):
-    path = os.path.expanduser(f"~/Documents/budget/{section}/{year}/{month_name}.csv")
+    path = csv_path(section, month_name, year)
     if not os.path.exists(path):
         print(f"⚠️  {section.capitalize()} file not found: {path}")
         return pd.DataFrame()
+    with metrics.timer("csv_load"):
+        df = read_budget_csv(path, section)
+    metrics.count("rows_read", len(df), section=section)
+    metrics.count("bytes_read", os.path.getsize(path))
+    return df
+
+def read_budget_csv(path, section):
     df = pd.read_csv(path)
     df.columns = df.columns.str.strip()
-    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
-    if missing:
-        raise ValueError(f"❌ Missing required columns in {section} CSV: {missing}")
+    validate_columns(section, df.columns)
     df["Amount"] = df["Amount"].replace(r'[\$,]', '', regex=True).astype(float)
     df["Type"] = section
     return df
 
+def validate_columns(section, columns):
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns in {section} CSV: {missing}")
+
+def iter_budget_csv(path, section, chunksize=STREAM_CHUNKSIZE):
+    """
+    Read a section CSV in fixed-size chunks with pinned dtypes.
+    Required columns are validated from the header before any rows are parsed.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    stripped = header.str.strip()
+    validate_columns(section, stripped)
+
+    # The pyarrow engine is faster but cannot chunk, so stream with the C engine
+    # and skip dtype inference on the columns we touch.
+    raw_names = dict(zip(stripped, header))
+    dtype = {raw_names[col]: str for col in REQUIRED_COLUMNS}
+    reader = pd.read_csv(path, chunksize=chunksize, dtype=dtype, engine="c")
+    for chunk in reader:
+        chunk.columns = stripped
+        amount = chunk["Amount"].str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+        chunk["Amount"] = amount.astype(float)
+        chunk["Type"] = section
+        yield chunk
+
+def stream_section(section, path, vendor_map, emit, chunksize=STREAM_CHUNKSIZE, matcher=None, rules=None):
+    """
+    Categorize a section CSV chunk by chunk, passing each categorized chunk to
+    emit() as soon as it is ready. Returns (row_count, summary).
+    """
+    row_count = 0
+    summary = {}
+    rule_hits = {}
+    known_before = len(vendor_map[section])
+    for chunk in iter_budget_csv(path, section, chunksize):
+        out, chunk_summary = categorize_frame(section, chunk, vendor_map, verbose=False, matcher=matcher, rules=rules)
+        for category, total in chunk_summary.items():
+            summary[category] = summary.get(category, 0) + total
+        if rules is not None:
+            for rule, count in out["Rule"].value_counts().items():
+                rule_hits[rule] = rule_hits.get(rule, 0) + count
+        row_count += len(out)
+        emit(out)
+
+    print_section_summary(section, row_count, len(vendor_map[section]) - known_before, summary)
+    print_rule_hits(rule_hits)
+    return row_count, summary
+
 def process_section(section, df, vendor_map):
     if df.empty:
         return [], {}
@@ -92,33 +165,179 @@ def process_section(section, df, vendor_map):
 
     return rows, summary
 
-def push_to_google_sheets(month, year, all_transactions, replace=False):
-    tab_name = f"{month.capitalize()}-Budget-{year}"
+def _as_text(series):
+    # Mirror str(value).strip() from the row-wise path, including "nan" for blanks
+    return series.fillna("nan").astype(str).str.strip()
+
+def categorize_frame(section, df, vendor_map, verbose=True, matcher=None, rules=None):
+    """
+    Columnar equivalent of process_section.
+    Returns (out_df, summary) where out_df has OUTPUT_COLUMNS and summary maps
+    category -> total amount in first-seen order. New vendors are added to
+    vendor_map[section] with the first matching row as their Sample; with a
+    VendorMatcher, names that resolve to a known vendor are not added.
+    With a RuleSet, matching rules override Category/Type and out_df gains a
+    Rule column naming the rule that fired for each row.
+    """
+    if df.empty:
+        columns = OUTPUT_COLUMNS + (["Rule"] if rules is not None else [])
+        return pd.DataFrame(columns=columns), {}
+
+    vendors = _as_text(df["Name"])
+    categories = _as_text(df["Category"]).replace("", "Uncategorized")
+    types = pd.Series(section, index=df.index)
+
+    if rules is not None:
+        hits = rules.classify(vendors)
+        matched = hits["Rule"].notna()
+        categories = categories.mask(matched, hits["Category"])
+        types = types.mask(hits["Type"].notna(), hits["Type"])
+
+    out = pd.DataFrame({
+        "Timestamp": df["Original Date"].to_numpy(),
+        "Vendor": vendors.to_numpy(),
+        "Amount": df["Amount"].to_numpy(),
+        "Type": types.to_numpy(),
+        "Category": categories.to_numpy(),
+    })
+    if rules is not None:
+        out["Rule"] = hits["Rule"].to_numpy()
+
+    known = vendor_map[section]
+    unknown = set(vendors.unique()) - known.keys()
+    new_vendors = []
+    if unknown:
+        first_seen = (vendors.isin(unknown) & ~vendors.duplicated()).to_numpy()
+        samples = df[first_seen].to_dict("records")
+        for vendor, category, sample in zip(vendors[first_seen], categories[first_seen], samples):
+            if matcher is not None:
+                if matcher.resolve(vendor, section) is not None:
+                    continue
+                matcher.add(section, vendor)
+            known[vendor] = {"Category": category, "Sample": sample}
+            new_vendors.append(vendor)
+
+    summary = out.groupby("Category", sort=False)["Amount"].sum().to_dict()
+
+    if verbose:
+        print_section_summary(section, len(out), len(new_vendors), summary)
+        if rules is not None:
+            print_rule_hits(out["Rule"].value_counts().to_dict())
+
+    return out, summary
+
+def print_rule_hits(rule_hits):
+    if rule_hits:
+        print(f"🧩 Rules matched {sum(rule_hits.values())} rows: "
+              + ", ".join(f"{rule} ({count})" for rule, count in rule_hits.items()))
+
+def print_section_summary(section, row_count, new_vendor_count, summary):
+    print(f"\n🔍 {section.capitalize()} Transactions: {row_count} rows, {new_vendor_count} new vendors")
+    for category, total in summary.items():
+        print(f"✅ {category:<40} (+${total:.2f})")
+
+def month_cache_key(month_name, year, vendor_version, rules=None):
+    return month_cache.cache_key(month_paths(month_name, year), vendor_version, rules.signature if rules else None)
+
+def process_month(month_name, year, vendor_map, matcher=None, rules=None, vendor_version=None):
+    """
+    Load and categorize both sections for one month without touching vendor_map.
+    Returns (transactions_df, new_vendors, log) so it can run in a worker process.
+    With a vendor_version, a cached result for unchanged CSVs is returned instead
+    (new_vendors is None for cache hits).
+    """
+    if vendor_version is not None:
+        with metrics.timer("month_cache_read"):
+            cached = month_cache.load_month(month_name, year, month_cache_key(month_name, year, vendor_version, rules))
+        if cached is not None:
+            metrics.count("month_cache_hits")
+            log = f"\n📅 {month_name.capitalize()} {year}\n⚡ Loaded {len(cached)} transactions from cache\n"
+            return cached, None, log
+
+    known = {section: dict(vendor_map.get(section, {})) for section in SECTIONS}
+    frames = []
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        print(f"\n📅 {month_name.capitalize()} {year}")
+        for section in SECTIONS:
+            df = load_csv(section, month_name, year)
+            with metrics.timer("categorize"):
+                out, _ = categorize_frame(section, df, known, matcher=matcher, rules=rules)
+            metrics.count("rows_categorized", len(out), section=section)
+            out["Key"] = transaction_keys(section, df)
+            frames.append(out)
+
+    new_vendors = {
+        section: {name: entry for name, entry in known[section].items() if name not in vendor_map.get(section, {})}
+        for section in SECTIONS
+    }
+    transactions = pd.concat(frames, ignore_index=True)
+    return transactions, new_vendors, log.getvalue()
+
+def process_month_in_worker(*args):
+    """process_month for a pool worker, returning its metrics alongside the result."""
+    metrics.REGISTRY.reset()
+    return process_month(*args), metrics.REGISTRY.drain()
+
+def merge_new_vendors(vendor_map, new_vendors, matcher=None):
+    for section, vendors in new_vendors.items():
+        for name, entry in vendors.items():
+            if matcher is not None:
+                # Months run in separate workers, so recheck near-duplicates across months
+                match = matcher.resolve(name, section)
+                if match is not None and match != name:
+                    continue
+                matcher.add(section, name)
+            vendor_map.setdefault(section, {}).setdefault(name, entry)
+
+def parse_year_month(value):
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid month '{value}'. Use YYYY-MM, e.g. 2024-01.")
+    return parsed.year, parsed.month
+
+def month_range(start, end):
+    year, month = start
+    while (year, month) <= end:
+        yield calendar.month_name[month].lower(), year
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def month_paths(month_name, year):
+    return [csv_path(section, month_name, year) for section in SECTIONS]
+
+def open_spreadsheet():
     sheet_name = os.getenv("SPREADSHEET_NAME", "Budget_Dynamic")
     credentials_file = os.getenv("GOOGLE_CREDS_PATH", "credentials.json")
 
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
-    client = gspread.authorize(creds)
+    session = get_session(credentials_file, sheet_name)
 
     try:
-        sheet = client.open(sheet_name)
+        with metrics.timer("sheets_auth"):
+            WRITER.call(session.spreadsheet)
+        return session
     except Exception as e:
         print(f"❌ Could not open Google Sheet '{sheet_name}': {e}")
-        return
+        return None
+
+def tab_name_for(month, year):
+    return f"{month.capitalize()}-Budget-{year}"
 
+def open_worksheet(sheet, tab_name, replace=False, rows=1000, clear=False):
+    from gspread.exceptions import WorksheetNotFound
     try:
-        worksheet = sheet.worksheet(tab_name)
+        worksheet = WRITER.call(sheet.worksheet, tab_name)
         if not replace:
             print(f"⚠️ Tab '{tab_name}' already exists. Use --replace to overwrite.")
-            return
-        worksheet.clear()
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = sheet.add_worksheet(title=tab_name, rows="1000", cols="5")
+            return None
+        if clear:
+            WRITER.call(worksheet.clear)
+    except WorksheetNotFound:
+        worksheet = WRITER.call(sheet.add_worksheet, title=tab_name, rows=max(rows, 1), cols=len(OUTPUT_COLUMNS))
+    return worksheet
 
-    # Prepare rows
-    header = ["Timestamp", "Vendor", "Amount", "Type", "Category"]
-    rows = [header] + [
+def sheet_rows(all_transactions):
+    return [
         [
             tx.get("Timestamp", ""),
             tx.get("Vendor", ""),
@@ -129,42 +348,246 @@ def push_to_google_sheets(month, year, all_transactions, replace=False):
         for tx in all_transactions
     ]
 
-    worksheet.append_rows(rows)
-    print(f"\n✅ Google Sheet '{tab_name}' updated successfully.")
+def push_to_google_sheets(month, year, all_transactions, replace=False, sheet=None):
+    tab_name = tab_name_for(month, year)
+    if sheet is None:
+        sheet = open_spreadsheet()
+        if sheet is None:
+            return
+
+    rows = [OUTPUT_COLUMNS] + sheet_rows(all_transactions)
+    worksheet = open_worksheet(sheet, tab_name, replace, rows=len(rows))
+    if worksheet is None:
+        return
+
+    stats = WRITER.write(worksheet, rows)
+    print(f"\n✅ Google Sheet '{tab_name}' updated successfully "
+          f"({stats['changed_rows']} changed rows in {stats['requests']} requests).")
+    return True
+
+def append_to_google_sheets(month, year, new_transactions, sheet):
+    from gspread.exceptions import WorksheetNotFound
+    tab_name = tab_name_for(month, year)
+    rows = sheet_rows(new_transactions)
+    try:
+        worksheet = WRITER.call(sheet.worksheet, tab_name)
+    except WorksheetNotFound:
+        rows = [OUTPUT_COLUMNS] + rows
+        worksheet = WRITER.call(sheet.add_worksheet, title=tab_name, rows=len(rows), cols=len(OUTPUT_COLUMNS))
+
+    WRITER.append(worksheet, rows)
+    print(f"\n✅ Appended {len(new_transactions)} new transactions to '{tab_name}'.")
+    return True
+
+def stream_month(month_name, year, vendor_map, replace=False, dry_run=False, chunksize=STREAM_CHUNKSIZE,
+                 matcher=None, rules=None):
+    """
+    Bounded-memory variant of process_month + push_to_google_sheets: each
+    categorized chunk is appended to the tab (or dropped on --dry-run) as it arrives.
+    """
+    worksheet = None
+    if not dry_run:
+        sheet = open_spreadsheet()
+        if sheet is None:
+            return
+        worksheet = open_worksheet(sheet, tab_name_for(month_name, year), replace, rows=1, clear=True)
+        if worksheet is None:
+            return
+        WRITER.append(worksheet, [OUTPUT_COLUMNS])
+
+    parts = []
+
+    def emit(out):
+        metrics.count("rows_categorized", len(out))
+        parts.append(budget_report.aggregate_month(out))
+        if worksheet is not None and not out.empty:
+            WRITER.append(worksheet, sheet_rows(out.to_dict("records")))
+
+    for section in SECTIONS:
+        path = csv_path(section, month_name, year)
+        if not os.path.exists(path):
+            print(f"⚠️  {section.capitalize()} file not found: {path}")
+            continue
+        with metrics.timer(f"stream_{section}"):
+            stream_section(section, path, vendor_map, emit, chunksize, matcher=matcher, rules=rules)
+
+    save_vendor_map(vendor_map)
+    update_report_cube([(month_name, year, budget_report.combine_parts(parts))])
+    if dry_run:
+        print("\n🧪 Dry run enabled — no data was pushed to Google Sheets.")
+    else:
+        print(f"\n✅ Google Sheet '{tab_name_for(month_name, year)}' updated successfully.")
+
+def update_report_cube(months):
+    if budget_report.feather is not None:
+        budget_report.record_months(months)
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Parse budget CSVs and update Google Sheet")
-    parser.add_argument("month", help="Month to process (e.g. '03' or 'March')")
-    parser.add_argument("year", type=int, help="Year to process (e.g. 2025)")
+    parser.add_argument("month", nargs="?", help="Month to process (e.g. '03' or 'March')")
+    parser.add_argument("year", nargs="?", type=int, help="Year to process (e.g. 2025)")
+    parser.add_argument("--from", dest="start", type=parse_year_month, help="First month of a range (e.g. 2024-01)")
+    parser.add_argument("--to", dest="end", type=parse_year_month, help="Last month of a range (e.g. 2025-06)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes for --from/--to ranges")
+    parser.add_argument("--stream", action="store_true", help="Read CSVs in chunks with bounded memory (single month only)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE, help="Rows per chunk for --stream")
+    parser.add_argument("--upload-workers", type=int, default=UPLOAD_WORKERS, help="Tabs uploaded concurrently for --from/--to ranges")
+    parser.add_argument("--incremental", action="store_true", help="Skip unchanged CSVs and append only new transactions")
+    parser.add_argument("--rules", help=f"Category rules file applied before upload (default: {RULES_PATH} if you created it)")
+    parser.add_argument("--no-rules", action="store_true", help="Skip the category rules pass")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every month instead of reading .cache/months")
+    parser.add_argument("--exact-vendors", action="store_true", help="Disable fuzzy matching of vendor name variants")
     parser.add_argument("--replace", action="store_true", help="Replace Google Sheet tab if exists")
     parser.add_argument("--dry-run", action="store_true", help="Don't write to sheet, just print")
-    args = parser.parse_args()
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
 
     try:
-        month_name = get_month_name(args.month)
-    except ValueError as e:
-        print(f"❌ {e}")
-        return
+        with metrics.timer("total"):
+            run(args, parser)
+    finally:
+        metrics.finish(args, "budget_parse")
+
+def run(args, parser):
+    if args.start or args.end:
+        if not (args.start and args.end) or args.month:
+            parser.error("--from and --to must be used together, without a positional month/year")
+        if args.start > args.end:
+            parser.error("--from must not be after --to")
+        months = list(month_range(args.start, args.end))
+    else:
+        if not (args.month and args.year):
+            parser.error("month and year are required unless --from/--to is given")
+        try:
+            months = [(get_month_name(args.month), args.year)]
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
 
-    year = args.year
     replace = args.replace
     dry_run = args.dry_run
+    range_mode = args.start is not None
+    if args.stream and range_mode:
+        parser.error("--stream processes a single month; drop --from/--to")
+    if args.stream and args.incremental:
+        parser.error("--stream and --incremental cannot be combined")
+
+    manifest = load_manifest() if args.incremental else None
+    if manifest is not None and not replace:
+        pending = []
+        for month_name, year in months:
+            if month_changed_files(manifest, month_paths(month_name, year)):
+                pending.append((month_name, year))
+            else:
+                print(f"⏭️  {month_name.capitalize()} {year} unchanged since last run, skipping.")
+        months = pending
+        if not months:
+            if not dry_run:
+                save_manifest(manifest)
+            print("\n✅ Nothing new to ingest.")
+            return
 
-    vendor_map = load_vendor_map()
+    with metrics.timer("vendor_map_load"):
+        vendor_map = load_vendor_map()
+        matcher = None if args.exact_vendors else load_matcher(vendor_map)
+    try:
+        if args.rules and not os.path.exists(args.rules):
+            raise ValueError(f"❌ Rules file {args.rules} not found.")
+        rules = None if args.no_rules else load_rules(args.rules or RULES_PATH)
+    except ValueError as e:
+        print(e)
+        return
 
-    recurring_df = load_csv("recurring", month_name, year)
-    spending_df = load_csv("spending", month_name, year)
+    if args.stream:
+        month_name, year = months[0]
+        stream_month(month_name, year, vendor_map, replace=replace, dry_run=dry_run,
+                     chunksize=args.chunksize, matcher=matcher, rules=rules)
+        return
+
+    use_cache = not args.no_cache and month_cache.feather is not None
+    vendor_version = vendor_store.get_store(MAP_PATH).version() if use_cache else None
 
-    recurring_rows, _ = process_section("recurring", recurring_df, vendor_map)
-    spending_rows, _ = process_section("spending", spending_df, vendor_map)
+    if len(months) > 1 and args.workers > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(months))) as pool:
+            outcomes = list(pool.map(process_month_in_worker, *zip(*months), repeat(vendor_map), repeat(matcher),
+                                     repeat(rules), repeat(vendor_version)))
+        results = []
+        for result, snapshot in outcomes:
+            metrics.REGISTRY.merge(snapshot)
+            results.append(result)
+    else:
+        results = [process_month(month_name, year, vendor_map, matcher, rules, vendor_version)
+                   for month_name, year in months]
 
-    all_transactions = recurring_rows + spending_rows
+    for transactions, new_vendors, log in results:
+        print(log, end="")
+        if new_vendors is not None:
+            merge_new_vendors(vendor_map, new_vendors, matcher)
     save_vendor_map(vendor_map)
 
+    if vendor_version is not None:
+        # Key fresh months by the post-save version so the next run hits them
+        vendor_version = vendor_store.get_store(MAP_PATH).version()
+        with metrics.timer("month_cache_write"):
+            for (month_name, year), (transactions, new_vendors, _) in zip(months, results):
+                if new_vendors is not None and not transactions.empty:
+                    key = month_cache_key(month_name, year, vendor_version, rules)
+                    month_cache.save_month(month_name, year, key, transactions)
+
+    with metrics.timer("report_cube"):
+        update_report_cube([
+            (month_name, year, budget_report.aggregate_month(transactions))
+            for (month_name, year), (transactions, _, _) in zip(months, results)
+        ])
+
+    if manifest is not None and not replace:
+        results = [
+            (transactions[~transactions["Key"].isin(known_keys(manifest, tab_name_for(month_name, year)))], new_vendors, log)
+            for (month_name, year), (transactions, new_vendors, log) in zip(months, results)
+        ]
+        for (month_name, year), (transactions, _, _) in zip(months, results):
+            print(f"🆕 {month_name.capitalize()} {year}: {len(transactions)} new transactions")
+
     if dry_run:
         print("\n🧪 Dry run enabled — no data was pushed to Google Sheets.")
+        return
+
+    sheet = open_spreadsheet()
+    if sheet is None:
+        return
+
+    def upload(month_name, year, transactions):
+        if manifest is not None:
+            ingest_incremental(manifest, month_name, year, transactions, replace, sheet)
+        elif range_mode and transactions.empty:
+            print(f"⏭️  No transactions for {month_name.capitalize()} {year}, skipping upload.")
+        else:
+            push_to_google_sheets(month_name, year, transactions.to_dict("records"), replace=replace, sheet=sheet)
+
+    jobs = [(month_name, year, transactions) for (month_name, year), (transactions, _, _) in zip(months, results)]
+    with metrics.timer("sheets_upload"):
+        upload_concurrently(upload, jobs, max_workers=args.upload_workers)
+
+def ingest_incremental(manifest, month_name, year, transactions, replace, sheet):
+    """Push one month and record it in the manifest once the upload succeeded."""
+    tab_name = tab_name_for(month_name, year)
+    records = transactions.to_dict("records")
+    if replace:
+        pushed = push_to_google_sheets(month_name, year, records, replace=True, sheet=sheet)
+    elif records:
+        pushed = append_to_google_sheets(month_name, year, records, sheet)
     else:
-        push_to_google_sheets(month_name, year, all_transactions, replace=replace)
+        print(f"⏭️  No new transactions for {tab_name}.")
+        pushed = True
+
+    if pushed:
+        with MANIFEST_LOCK:
+            record_transactions(manifest, tab_name, transactions["Key"], replace=replace)
+            record_files(manifest, month_paths(month_name, year))
+            save_manifest(manifest)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,188 @@
+# budget_recurring.py
+# Detect recurring charges from the full transaction history and suggest a
+# recurring/spending type for each vendor.
+#
+# History comes from the parsed month cache (or the raw CSVs when there is no
+# cache). Every statistic is computed column-wise on the history sorted by
+# vendor and date: date gaps via groupby().diff(), per-vendor medians via
+# groupby aggregations, broadcast back to rows with the group codes.
+
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+import metrics
+import month_cache
+import vendor_store
+
+BUDGET_ROOT = "~/Documents/budget"
+SECTIONS = ["recurring", "spending"]
+# name -> (expected days between charges, tolerance in days)
+PERIODS = {
+    "weekly": (7, 1),
+    "monthly": (30.4, 3.5),
+    "annual": (365.25, 10),
+}
+MIN_OCCURRENCES = 3
+MIN_REGULARITY = 0.8
+AMOUNT_TOLERANCE = 0.1
+
+
+def load_history(cache_dir=month_cache.CACHE_DIR, budget_root=BUDGET_ROOT):
+    """All transactions as Timestamp/Vendor/Amount/Type, from the month cache or the CSVs."""
+    columns = ["Timestamp", "Vendor", "Amount", "Type"]
+    entries = month_cache.cached_months(cache_dir) if month_cache.feather is not None else {}
+    if entries:
+        frames = [month_cache.read_entry(path)[columns] for path in entries.values()]
+    else:
+        frames = []
+        for section in SECTIONS:
+            pattern = os.path.join(os.path.expanduser(budget_root), section, "*", "*.csv")
+            for path in sorted(glob.glob(pattern)):
+                df = pd.read_csv(path, usecols=lambda c: c.strip() in ("Original Date", "Name", "Amount"))
+                df.columns = df.columns.str.strip()
+                frames.append(pd.DataFrame({
+                    "Timestamp": df["Original Date"],
+                    "Vendor": df["Name"].fillna("nan").astype(str).str.strip(),
+                    "Amount": df["Amount"].replace(r'[\$,]', '', regex=True).astype(float),
+                    "Type": section,
+                }))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def detect_recurring(history, min_occurrences=MIN_OCCURRENCES, min_regularity=MIN_REGULARITY,
+                     amount_tolerance=AMOUNT_TOLERANCE):
+    """
+    One row per vendor with its charge count, median gap, detected period,
+    regularity (share of gaps within the period's tolerance), amount
+    consistency (share of charges within amount_tolerance of the median) and
+    the suggested type.
+    """
+    dates = pd.to_datetime(history["Timestamp"], errors="coerce", format="mixed")
+    frame = pd.DataFrame({
+        "Vendor": history["Vendor"].to_numpy(),
+        "Date": dates.dt.normalize().to_numpy(),
+        "Amount": history["Amount"].abs().to_numpy(),
+        "Section": history["Type"].to_numpy(),
+    }).dropna(subset=["Date"])
+    # Split or duplicate postings of the same charge on one day count once
+    frame = frame.drop_duplicates(["Vendor", "Date", "Amount"])
+    frame = frame.sort_values(["Vendor", "Date"], kind="stable", ignore_index=True)
+
+    codes, vendors = pd.factorize(frame["Vendor"])
+    gaps = frame.groupby(codes)["Date"].diff().dt.days.to_numpy()
+
+    count = np.bincount(codes, minlength=len(vendors))
+    median_gap = pd.Series(gaps).groupby(codes).median().reindex(range(len(vendors))).to_numpy()
+    median_amount = frame.groupby(codes)["Amount"].median().to_numpy()
+
+    period = np.full(len(vendors), "", dtype=object)
+    expected = np.full(len(vendors), np.nan)
+    tolerance = np.full(len(vendors), np.nan)
+    for name, (days, tol) in PERIODS.items():
+        hit = np.abs(median_gap - days) <= tol
+        period[hit] = name
+        expected[hit] = days
+        tolerance[hit] = tol
+
+    # Broadcast per-vendor values back to rows for the per-charge checks
+    on_period = np.abs(gaps - expected[codes]) <= tolerance[codes]
+    gap_count = np.bincount(codes, weights=~np.isnan(gaps), minlength=len(vendors))
+    on_period_count = np.bincount(codes, weights=on_period, minlength=len(vendors))
+    regularity = np.divide(on_period_count, gap_count, out=np.zeros(len(vendors)), where=gap_count > 0)
+    amount_ok = np.abs(frame["Amount"].to_numpy() - median_amount[codes]) <= amount_tolerance * median_amount[codes]
+    consistency = np.bincount(codes, weights=amount_ok, minlength=len(vendors)) / count
+
+    section_counts = frame.groupby([codes, frame["Section"]]).size().unstack(fill_value=0)
+    section = section_counts.idxmax(axis=1).to_numpy()
+    recurring = (count >= min_occurrences) & (period != "") & (regularity >= min_regularity) \
+        & (consistency >= min_regularity)
+
+    result = pd.DataFrame({
+        "Vendor": vendors,
+        "Section": section,
+        "Charges": count,
+        "MedianGap": median_gap,
+        "Period": period,
+        "Regularity": regularity,
+        "Consistency": consistency,
+        "MedianAmount": median_amount,
+        "Suggested": np.where(recurring, "recurring", "spending"),
+    })
+    # Too little history to call a vendor one-off; leave it where it is
+    result.loc[count < min_occurrences, "Suggested"] = result["Section"]
+    return result.sort_values(["Suggested", "Charges"], ascending=[True, False], ignore_index=True)
+
+
+def apply_suggestions(vendor_map, suggestions):
+    """
+    Move every vendor whose suggested type differs from its section in the
+    vendor map. Returns [(vendor, from_section, to_section)].
+    """
+    moves = []
+    for vendor, target in zip(suggestions["Vendor"], suggestions["Suggested"]):
+        source = "spending" if target == "recurring" else "recurring"
+        entry = vendor_map.get(source, {}).pop(vendor, None)
+        if entry is None:
+            continue
+        vendor_map.setdefault(target, {}).setdefault(vendor, entry)
+        moves.append((vendor, source, target))
+    return moves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect recurring charges and suggest vendor types")
+    parser.add_argument("--map", default=vendor_store.MAP_PATH, help="Vendor map to update with --apply")
+    parser.add_argument("--cache-dir", default=month_cache.CACHE_DIR)
+    parser.add_argument("--min-occurrences", type=int, default=MIN_OCCURRENCES)
+    parser.add_argument("--all", action="store_true", help="List every vendor, not just type changes")
+    parser.add_argument("--apply", action="store_true", help="Move vendors to the suggested section in one save")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        run(args)
+    finally:
+        metrics.finish(args, "budget_recurring")
+
+
+def run(args):
+    with metrics.timer("history_load"):
+        history = load_history(args.cache_dir)
+    if history.empty:
+        print("⚠️  No transaction history found. Run budget_parse.py first.")
+        return
+
+    with metrics.timer("detect"):
+        suggestions = detect_recurring(history, min_occurrences=args.min_occurrences)
+    recurring = suggestions[suggestions["Suggested"] == "recurring"]
+    print(f"\n🔁 {len(recurring)} recurring vendors found in {len(history)} transactions "
+          f"across {len(suggestions)} vendors.")
+
+    changes = suggestions[suggestions["Suggested"] != suggestions["Section"]]
+    shown = suggestions if args.all else changes
+    for row in shown.itertuples(index=False):
+        marker = "➡️ " if row.Section != row.Suggested else "✅"
+        print(f"{marker} {row.Vendor:<40} {row.Section:<10} → {row.Suggested:<10} "
+              f"{row.Period or '-':<8} {row.Charges:>4} charges, ${row.MedianAmount:.2f} median")
+
+    if not args.apply:
+        if not changes.empty:
+            print(f"\n💡 {len(changes)} suggested type changes. Re-run with --apply to update {args.map}.")
+        return
+
+    with metrics.timer("vendor_map_load"):
+        vendor_map = vendor_store.load_vendor_map(args.map)
+    with metrics.timer("apply"):
+        moves = apply_suggestions(vendor_map, changes)
+    with metrics.timer("vendor_map_save"):
+        written, total = vendor_store.save_vendor_map(vendor_map, args.map)
+    print(f"\n✅ Moved {len(moves)} vendors ({written} rows written, {total} vendors total).")
+
+
+if __name__ == "__main__":
+    main()
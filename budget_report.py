@@ -0,0 +1,246 @@
+# budget_report.py
+# Pre-aggregated reporting cube over every ingested month.
+#
+# budget_parse.py folds each month into one small table of amount and count by
+# (Year, Month, Type, Category, Vendor). Reports group that table instead of
+# re-reading transactions, so they stay fast across years of history.
+
+import argparse
+import calendar
+import os
+import re
+
+import pandas as pd
+
+import metrics
+import month_cache
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+CUBE_PATH = ".cache/budget_cube.feather"
+DIMENSIONS = ["Year", "Month", "Type", "Category", "Vendor"]
+MEASURES = ["Amount", "Count"]
+
+
+def empty_cube():
+    cube = pd.DataFrame({col: pd.Series(dtype="int64" if col in ("Year", "Month", "Count") else "object")
+                         for col in DIMENSIONS + MEASURES})
+    cube["Amount"] = cube["Amount"].astype("float64")
+    return cube
+
+
+def load_cube(path=CUBE_PATH):
+    if feather is None or not os.path.exists(path):
+        return empty_cube()
+    return feather.read_feather(path)
+
+
+def save_cube(cube, path=CUBE_PATH):
+    if feather is None:
+        print("⚠️  pyarrow is not installed; the reporting cube was not saved.")
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(cube.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def aggregate_month(transactions):
+    """Collapse a month of transactions to one row per Type/Category/Vendor."""
+    if transactions.empty:
+        return empty_cube().drop(columns=["Year", "Month"])
+    grouped = transactions.groupby(["Type", "Category", "Vendor"], sort=False)["Amount"]
+    return grouped.agg(Amount="sum", Count="size").reset_index()
+
+
+def combine_parts(parts):
+    """Merge partial aggregates of the same month (e.g. streamed chunks)."""
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return aggregate_month(pd.DataFrame())
+    return pd.concat(parts).groupby(["Type", "Category", "Vendor"], sort=False)[MEASURES].sum().reset_index()
+
+
+def update_cube(cube, year, month, aggregate):
+    """Replace the cube's slice for one month with a fresh aggregate."""
+    slice_ = aggregate.assign(Year=year, Month=month)[DIMENSIONS + MEASURES]
+    keep = cube[~((cube["Year"] == year) & (cube["Month"] == month))]
+    if keep.empty:
+        return slice_.reset_index(drop=True)
+    return pd.concat([keep, slice_], ignore_index=True)
+
+
+def month_number(month_name):
+    return list(calendar.month_name).index(month_name.capitalize())
+
+
+def record_months(months, cube_path=CUBE_PATH):
+    """
+    Fold ingested months into the cube with one load and one save.
+    months is an iterable of (month_name, year, aggregate).
+    """
+    cube = load_cube(cube_path)
+    for month_name, year, aggregate in months:
+        cube = update_cube(cube, year, month_number(month_name), aggregate)
+    save_cube(cube, cube_path)
+    return cube
+
+
+def rebuild_from_month_cache(cache_dir=month_cache.CACHE_DIR, cube_path=CUBE_PATH):
+    """Recreate the cube from the Feather month cache without touching any CSVs."""
+    entries = month_cache.cached_months(cache_dir)
+    months = [
+        (month_name, year, aggregate_month(month_cache.read_entry(path)))
+        for (year, month_name), path in sorted(entries.items())
+    ]
+    return record_months(months, cube_path), len(months)
+
+
+# --- Queries ---
+
+def filter_cube(cube, type_=None, category=None):
+    if type_:
+        cube = cube[cube["Type"] == type_]
+    if category:
+        cube = cube[cube["Category"].str.lower() == category.lower()]
+    return cube
+
+
+def month_over_month(cube, year, month, by="Category"):
+    """Totals for a month next to the previous month, largest change first."""
+    prev_year, prev_month = (year - 1, 12) if month == 1 else (year, month - 1)
+    current = cube[(cube["Year"] == year) & (cube["Month"] == month)].groupby(by)["Amount"].sum()
+    previous = cube[(cube["Year"] == prev_year) & (cube["Month"] == prev_month)].groupby(by)["Amount"].sum()
+    return compare(current, previous, f"{calendar.month_abbr[month]} {year}",
+                   f"{calendar.month_abbr[prev_month]} {prev_year}")
+
+
+def year_over_year(cube, year, month=None, by="Category"):
+    """Totals for a year (or one month of it) against the same period a year earlier."""
+    def period(y):
+        mask = cube["Year"] == y
+        if month:
+            mask &= cube["Month"] == month
+        return cube[mask].groupby(by)["Amount"].sum()
+
+    label = f"{calendar.month_abbr[month]} " if month else ""
+    return compare(period(year), period(year - 1), f"{label}{year}", f"{label}{year - 1}")
+
+
+def compare(current, previous, current_label, previous_label):
+    table = pd.DataFrame({previous_label: previous, current_label: current}).fillna(0.0)
+    table["Change"] = table[current_label] - table[previous_label]
+    table["Change %"] = (table["Change"] / table[previous_label].where(table[previous_label] != 0)) * 100
+    return table.reindex(table["Change"].abs().sort_values(ascending=False).index)
+
+
+def top_vendors(cube, n=10, year=None, month=None):
+    if year:
+        cube = cube[cube["Year"] == year]
+    if month:
+        cube = cube[cube["Month"] == month]
+    totals = cube.groupby("Vendor")[MEASURES].sum()
+    return totals.reindex(totals["Amount"].abs().sort_values(ascending=False).index).head(n)
+
+
+def category_trend(cube, year=None, category=None):
+    """Monthly totals per category as a (Year-Month x Category) table."""
+    if year:
+        cube = cube[cube["Year"] == year]
+    if category:
+        cube = filter_cube(cube, category=category)
+    table = cube.pivot_table(index=["Year", "Month"], columns="Category", values="Amount",
+                             aggfunc="sum", fill_value=0.0)
+    table.index = [f"{year}-{month:02d}" for year, month in table.index]
+    return table
+
+
+def parse_period(value):
+    """'2025' -> (2025, None); '2025-03' -> (2025, 3)."""
+    match = re.fullmatch(r"(\d{4})(?:-(\d{1,2}))?", value or "")
+    if not match or (match.group(2) and not 1 <= int(match.group(2)) <= 12):
+        raise argparse.ArgumentTypeError(f"Invalid period '{value}'. Use YYYY or YYYY-MM, e.g. 2025-03.")
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def print_table(title, table):
+    print(f"\n📊 {title}")
+    if table.empty:
+        print("⚠️  No data in the reporting cube for this query. Run budget_parse.py first.")
+        return
+    with pd.option_context("display.float_format", "{:,.2f}".format,
+                           "display.max_rows", None, "display.width", 160):
+        print(table.to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Budget reports from the pre-aggregated cube")
+    parser.add_argument("--cube", default=CUBE_PATH)
+    parser.add_argument("--type", dest="type_", choices=["recurring", "spending"], help="Limit to one section")
+    subparsers = parser.add_subparsers(dest="command")
+
+    mom = subparsers.add_parser("mom", help="Month over month change")
+    mom.add_argument("period", type=parse_period, help="Month to report (YYYY-MM)")
+    mom.add_argument("--by", choices=["Category", "Vendor", "Type"], default="Category")
+
+    yoy = subparsers.add_parser("yoy", help="Year over year change")
+    yoy.add_argument("period", type=parse_period, help="Year or month to report (YYYY or YYYY-MM)")
+    yoy.add_argument("--by", choices=["Category", "Vendor", "Type"], default="Category")
+
+    top = subparsers.add_parser("top", help="Top vendors by amount")
+    top.add_argument("period", type=parse_period, nargs="?", help="Optional YYYY or YYYY-MM")
+    top.add_argument("-n", type=int, default=10)
+
+    trend = subparsers.add_parser("trend", help="Monthly totals per category")
+    trend.add_argument("--year", type=int)
+    trend.add_argument("--category")
+
+    rebuild = subparsers.add_parser("rebuild", help="Rebuild the cube from the parsed month cache")
+    rebuild.add_argument("--cache-dir", default=month_cache.CACHE_DIR)
+
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        run(args, parser)
+    finally:
+        metrics.finish(args, "budget_report")
+
+
+def run(args, parser):
+    if args.command == "rebuild":
+        if feather is None:
+            print("❌ pyarrow is required to rebuild the reporting cube.")
+            return
+        with metrics.timer("cube_rebuild"):
+            cube, count = rebuild_from_month_cache(args.cache_dir, args.cube)
+        print(f"✅ Rebuilt reporting cube from {count} cached months ({len(cube)} rows).")
+        return
+    if args.command is None:
+        parser.print_help()
+        return
+
+    if args.command == "mom" and args.period[1] is None:
+        parser.error("mom needs a month, e.g. 2025-03")
+    with metrics.timer("cube_load"):
+        cube = filter_cube(load_cube(args.cube), type_=args.type_)
+
+    with metrics.timer("query"):
+        if args.command == "mom":
+            year, month = args.period
+            title, table = f"Month over month by {args.by}", month_over_month(cube, year, month, args.by)
+        elif args.command == "yoy":
+            year, month = args.period
+            title, table = f"Year over year by {args.by}", year_over_year(cube, year, month, args.by)
+        elif args.command == "top":
+            year, month = args.period or (None, None)
+            title, table = f"Top {args.n} vendors", top_vendors(cube, args.n, year, month)
+        else:
+            title, table = "Category trend", category_trend(cube, args.year, args.category)
+    print_table(title, table)
+
+
+if __name__ == "__main__":
+    main()
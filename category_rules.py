@@ -0,0 +1,145 @@
+# category_rules.py
+# Rule-based categorization: vendor keywords mapped to a category and type.
+#
+# Every keyword from every rule is compiled into one Aho-Corasick automaton, so
+# a vendor name is scanned once no matter how many rules exist. Rules are applied
+# to the distinct vendor names of a column and broadcast back to the rows.
+
+import hashlib
+import json
+import os
+from collections import deque
+
+import pandas as pd
+
+RULES_PATH = "category_rules.json"
+VALID_TYPES = {"recurring", "spending"}
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton returning the lowest rule id whose keyword occurs in a text."""
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [None]
+        for keyword, rule_id in keywords:
+            self._insert(keyword, rule_id)
+        self._link()
+
+    def _insert(self, keyword, rule_id):
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(None)
+            state = nxt
+        if self.out[state] is None or rule_id < self.out[state]:
+            self.out[state] = rule_id
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                inherited = self.out[self.fail[nxt]]
+                if inherited is not None and (self.out[nxt] is None or inherited < self.out[nxt]):
+                    self.out[nxt] = inherited
+
+    def first_rule(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        state, best = 0, None
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = out[state]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+                if best == 0:
+                    break
+        return best
+
+
+class RuleSet:
+    def __init__(self, rules):
+        self.rules = [self._validate(i, rule) for i, rule in enumerate(rules)]
+        keywords = [
+            (keyword.lower(), i)
+            for i, rule in enumerate(self.rules)
+            for keyword in rule["match"]
+        ]
+        self.automaton = KeywordAutomaton(keywords)
+
+    @staticmethod
+    def _validate(index, rule):
+        match = rule.get("match")
+        if isinstance(match, str):
+            match = match.split("|")
+        if not match or not all(isinstance(k, str) and k.strip() for k in match):
+            raise ValueError(f"❌ Rule {index + 1} needs a non-empty 'match' keyword or list of keywords.")
+        if not rule.get("category"):
+            raise ValueError(f"❌ Rule {index + 1} is missing 'category'.")
+        if rule.get("type") and rule["type"] not in VALID_TYPES:
+            raise ValueError(f"❌ Rule {index + 1} has invalid type '{rule['type']}'. Use 'recurring' or 'spending'.")
+        keywords = [k.strip() for k in match]
+        return {
+            "name": rule.get("name") or f"rule{index + 1}:{'|'.join(keywords)}",
+            "match": keywords,
+            "category": rule["category"],
+            "type": rule.get("type"),
+        }
+
+    @classmethod
+    def load(cls, path=RULES_PATH):
+        try:
+            with open(path) as f:
+                return cls(json.load(f))
+        except json.JSONDecodeError:
+            raise ValueError(f"❌ {path} is malformed.")
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def signature(self):
+        """Content hash of the compiled rules, for cache keys."""
+        return hashlib.blake2b(json.dumps(self.rules, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+    def match(self, name):
+        """The first rule (in file order) with a keyword in `name`, or None."""
+        rule_id = self.automaton.first_rule(str(name).lower())
+        return None if rule_id is None else self.rules[rule_id]
+
+    def classify(self, names):
+        """
+        Match a whole column of vendor names. Returns a DataFrame aligned with
+        `names` holding Category, Type and Rule for matched rows (NaN otherwise).
+        """
+        codes, uniques = pd.factorize(names)
+        hits = [self.match(name) for name in uniques]
+        table = pd.DataFrame({
+            "Category": [h["category"] if h else None for h in hits] + [None],
+            "Type": [h["type"] if h else None for h in hits] + [None],
+            "Rule": [h["name"] if h else None for h in hits] + [None],
+        })
+        # factorize marks missing values with -1, which picks the trailing empty row
+        result = table.iloc[codes]
+        result.index = names.index
+        return result
+
+
+def load_rules(path=RULES_PATH):
+    """RuleSet from path, or None when there is no rules file."""
+    if not path or not os.path.exists(path):
+        return None
+    return RuleSet.load(path)
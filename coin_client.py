@@ -0,0 +1,112 @@
+# coin_client.py
+# Thin client for the warm coin service (coin_service.py). Standard library
+# only, so it starts as fast as Python does. One connection serves any number
+# of requests, so loops should reuse a ServiceClient (or pipe JSONL into
+# `batch`) instead of launching a process per query:
+#
+#   python coin_client.py value --coin peace_dollar --price 30.25
+#   python coin_client.py batch < queries.jsonl
+#
+#   with ServiceClient() as client:
+#       client.request("value", coin="peace_dollar", price=30.25)
+#
+# Protocol: one JSON object per line each way. Requests are {"op": ..., **params};
+# replies are {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+import argparse
+import json
+import socket
+import sys
+
+SOCKET_PATH = ".cache/coin_service.sock"
+CONNECT_TIMEOUT = 30
+
+
+class ServiceClient:
+    def __init__(self, path=SOCKET_PATH, timeout=CONNECT_TIMEOUT):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            self.sock.close()
+            raise ConnectionError(f"❌ No coin service at {path}. Start one with `python coin_service.py`.")
+        self.file = self.sock.makefile("rwb")
+
+    def send(self, line):
+        """Send one raw JSON request line and return the raw reply line."""
+        self.file.write(line if line.endswith(b"\n") else line + b"\n")
+        self.file.flush()
+        reply = self.file.readline()
+        if not reply:
+            raise ConnectionError("❌ Coin service closed the connection.")
+        return reply
+
+    def request(self, op, **params):
+        reply = json.loads(self.send(json.dumps({"op": op, **params}).encode()))
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        return reply["result"]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the warm coin service")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Service socket path")
+    subparsers = parser.add_subparsers(dest="op", required=True)
+
+    value = subparsers.add_parser("value", help="Melt value and premium for one coin")
+    value.add_argument("--coin", required=True)
+    value.add_argument("--price", type=float)
+    value.add_argument("--paid", type=float)
+    value.add_argument("--profile")
+
+    lookup = subparsers.add_parser("lookup", help="Coin keys for a name, nickname or filter")
+    lookup.add_argument("--query", required=True)
+
+    add = subparsers.add_parser("add", help="Add a coin to the inventory")
+    add.add_argument("--coin", required=True)
+    add.add_argument("--price", type=float, required=True)
+    add.add_argument("--date", required=True)
+    add.add_argument("--quantity", type=int, default=1)
+    add.add_argument("--condition", default="BU")
+    add.add_argument("--source", default="Unknown")
+    add.add_argument("--notes")
+
+    for name, help_text in (("spot", "Latest gold and silver spot"), ("gsr", "Gold/silver ratio and thresholds"),
+                            ("inventory", "Inventory entries"), ("ping", "Check that the service is up"),
+                            ("stats", "Request counts, reloads and cache ages"),
+                            ("reload", "Re-read every file now"), ("shutdown", "Stop the service")):
+        subparsers.add_parser(name, help=help_text)
+    subparsers.add_parser("batch", help="Send JSONL requests from stdin, print one JSON reply per line")
+    args = parser.parse_args(argv)
+
+    params = {key: value for key, value in vars(args).items() if key not in ("op", "socket") and value is not None}
+    try:
+        with ServiceClient(args.socket) as client:
+            if args.op == "batch":
+                out = sys.stdout.buffer
+                for line in sys.stdin.buffer:
+                    if line.strip():
+                        out.write(client.send(line))
+                out.flush()
+                return 0
+            result = client.request(args.op, **params)
+    except (ConnectionError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
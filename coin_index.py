@@ -0,0 +1,204 @@
+# coin_index.py
+# Resolve what people type ("ASE", "Silver Eagle", "1/2 oz gold eagle",
+# "morgan") to coin_spec.json keys, and select coins by attribute
+# ("all silver junk coins", "canada gold", "silver 1964").
+#
+# Every lookup is a dict hit. Keys and nicknames, plus every prefix starting at
+# a word boundary, are precomputed into one table. Each attribute value (metal,
+# category, country, currency, a year in year_range, a word of the key) maps to
+# the coins that have it, and a filter intersects those sets. A query that is
+# both a name prefix and a filter ("silver") gets both sets. The index is
+# pickled under .cache and rebuilt only when coin_spec.json's mtime or size changes.
+
+import argparse
+import json
+import os
+import pickle
+import re
+from collections import defaultdict
+
+COIN_SPEC_PATH = "coin_spec.json"
+INDEX_CACHE_PATH = ".cache/coin_index.pkl"
+INDEX_FORMAT = 1
+MIN_PREFIX_CHARS = 3
+MAX_LISTED = 6
+FILLER_WORDS = {"all", "any", "every", "my", "the", "of", "from", "coin", "coins"}
+
+FRACTION = re.compile(r"\b1/(2|4|10)\b")
+FRACTION_WORDS = {"2": "half", "4": "quarter", "10": "tenth"}
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+UNIT = re.compile(r"\b(\d+) (oz|g)\b")
+YEAR = re.compile(r"\d{4}")
+
+# spec path -> ((mtime_ns, size), CoinIndex) for this process
+_indexes = {}
+
+
+def normalize(text):
+    """'American Silver Eagle 1 oz' and 'american_silver_eagle_1oz' -> 'american silver eagle 1oz'."""
+    text = FRACTION.sub(lambda m: FRACTION_WORDS[m.group(1)], str(text).lower())
+    text = " ".join(NON_ALNUM.sub(" ", text).split())
+    return UNIT.sub(r"\1\2", text)
+
+
+def _append(table, term, key):
+    keys = table[term]
+    if key not in keys:
+        keys.append(key)
+
+
+class CoinIndex:
+    def __init__(self):
+        self.keys = []
+        self.names = {}       # normalized key or nickname -> [keys]
+        self.prefixes = {}    # word-boundary prefix of a name -> [keys]
+        self.attributes = {}  # attribute word or year -> [keys]
+
+    @classmethod
+    def build(cls, coin_spec):
+        index = cls()
+        names, prefixes, attributes = defaultdict(list), defaultdict(list), defaultdict(list)
+        for key, coin in coin_spec.items():
+            index.keys.append(key)
+            aliases = [normalize(key)] + [normalize(nickname) for nickname in coin.get("nicknames", [])]
+            terms = {coin.get("type", ""), coin.get("category", ""), *normalize(coin.get("country", "")).split()}
+            denomination = coin.get("denomination", "").split()
+            if len(denomination) == 2:
+                terms.add(normalize(denomination[1]))
+            years = [int(year) for year in YEAR.findall(coin.get("year_range", ""))]
+            if len(years) == 2:
+                terms.update(str(year) for year in range(years[0], years[1] + 1))
+
+            for alias in aliases:
+                _append(names, alias, key)
+                words = alias.split()
+                terms.update(words)
+                for start in range(len(words)):
+                    tail = " ".join(words[start:])
+                    for end in range(min(MIN_PREFIX_CHARS, len(tail)), len(tail) + 1):
+                        if tail[end - 1] != " ":
+                            _append(prefixes, tail[:end], key)
+            for term in terms:
+                if term:
+                    _append(attributes, term, key)
+
+        index.names, index.prefixes, index.attributes = dict(names), dict(prefixes), dict(attributes)
+        return index
+
+    def filter(self, text):
+        """Coins having every attribute word in `text`, or None if a word is not an attribute."""
+        selected = None
+        for word in text.split():
+            if word in FILLER_WORDS:
+                continue
+            if word not in self.attributes and word.endswith("s"):
+                word = word[:-1]  # "eagles", "bars", "dollars"
+            if word not in self.attributes:
+                return None
+            keys = set(self.attributes[word])
+            selected = keys if selected is None else selected & keys
+        if selected is None:
+            return list(self.keys)  # only filler words: "all coins"
+        return [key for key in self.keys if key in selected]
+
+    def match(self, query):
+        """Every coin `query` could mean: an exact name, else name prefixes plus attribute filter hits."""
+        text = normalize(query)
+        if not text:
+            return []
+        if text in self.names:
+            return self.names[text]
+        # "silver" starts ten names but is the metal of every silver coin, so a
+        # prefix hit does not rule out the filter; take both
+        selected = set(self.prefixes.get(text, ())) | set(self.filter(text) or ())
+        return [key for key in self.keys if key in selected]
+
+    def lookup(self, query):
+        """(key, None) when `query` names exactly one coin, else (None, error message)."""
+        keys = self.match(query)
+        if len(keys) == 1:
+            return keys[0], None
+        if not keys:
+            return None, f"Coin '{query}' not found in spec."
+        listed = ", ".join(keys[:MAX_LISTED]) + (f" and {len(keys) - MAX_LISTED} more" if len(keys) > MAX_LISTED else "")
+        return None, f"'{query}' matches {len(keys)} coins: {listed}."
+
+    def resolve(self, query):
+        key, message = self.lookup(query)
+        if message:
+            raise ValueError(f"❌ {message}")
+        return key
+
+    def select(self, query):
+        keys = self.match(query)
+        if not keys:
+            raise ValueError(f"❌ No coins match '{query}'.")
+        return list(keys)
+
+
+def spec_stamp(spec_path):
+    stat = os.stat(spec_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_index(spec_path=COIN_SPEC_PATH, path=INDEX_CACHE_PATH):
+    """
+    Index for spec_path, reused from memory or the disk cache while the spec's
+    mtime and size are unchanged, otherwise rebuilt and written back.
+    """
+    stamp = spec_stamp(spec_path)
+    cached = _indexes.get(spec_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    signature = (INDEX_FORMAT, os.path.abspath(spec_path), stamp)
+    index = None
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                cached_signature, index = pickle.load(f)
+            if cached_signature != signature:
+                index = None
+        except Exception:
+            index = None
+
+    if index is None:
+        with open(spec_path) as f:
+            index = CoinIndex.build(json.load(f))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((signature, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    _indexes[spec_path] = (stamp, index)
+    return index
+
+
+def resolve_key(coin_key, coin_spec, spec_path=COIN_SPEC_PATH):
+    """coin_key when it already is a spec key, else the one coin it names. ValueError otherwise."""
+    if coin_key in coin_spec:
+        return coin_key
+    key = load_index(spec_path).resolve(coin_key)
+    if key not in coin_spec:
+        raise ValueError(f"❌ Coin '{coin_key}' not found in spec.")
+    return key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up coin_spec.json keys by name, nickname or attributes")
+    parser.add_argument("queries", nargs="+", help='e.g. "ASE", "silver eagle", "all silver junk coins"')
+    parser.add_argument("--spec", default=COIN_SPEC_PATH, help="Coin spec to index")
+    parser.add_argument("--json", action="store_true", help="Print {query: [keys]} as JSON")
+    args = parser.parse_args(argv)
+
+    index = load_index(args.spec)
+    matches = {query: index.match(query) for query in args.queries}
+    if args.json:
+        print(json.dumps(matches, indent=2))
+        return
+    for query, keys in matches.items():
+        print(f"{query:<30} → {', '.join(keys) if keys else '(no match)'}")
+
+
+if __name__ == "__main__":
+    main()
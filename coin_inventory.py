@@ -3,31 +3,41 @@ import json
 import os
 import uuid
 from datetime import datetime
-from tabulate import tabulate
 from gold_api import get_spot_prices
+import coin_index
+import metrics
 
 INVENTORY_FILE = "coin_inventory.json"
 USER_CONFIG_FILE = "user_config.json"
 
-# Load COIN_SPEC from JSON
-with open("coin_spec.json") as f:
-    COIN_SPEC = json.load(f)
-
-# Ensure inventory and config files exist
-if not os.path.exists(INVENTORY_FILE):
-    with open(INVENTORY_FILE, "w") as f:
-        json.dump([], f)
-
-if not os.path.exists(USER_CONFIG_FILE):
-    with open(USER_CONFIG_FILE, "w") as f:
-        json.dump({
-            "default_profile": "stacker",
-            "profile_path": "premium_profiles.json",
-            "user_profile_path": "user_profile.json",
-            "preferred_currency": "USD",
-            "notify_threshold_pct": 0.05,
-            "track_gold_silver_ratio": true
-        }, f, indent=2)
+COIN_SPEC_PATH = "coin_spec.json"
+
+# Loaded on first use so importing this module reads and writes nothing
+_coin_spec = None
+
+def get_coin_spec():
+    global _coin_spec
+    if _coin_spec is None:
+        with open(COIN_SPEC_PATH) as f:
+            _coin_spec = json.load(f)
+    return _coin_spec
+
+def ensure_files():
+    """Create empty inventory and default user_config.json on first run."""
+    if not os.path.exists(INVENTORY_FILE):
+        with open(INVENTORY_FILE, "w") as f:
+            json.dump([], f)
+
+    if not os.path.exists(USER_CONFIG_FILE):
+        with open(USER_CONFIG_FILE, "w") as f:
+            json.dump({
+                "default_profile": "stacker",
+                "profile_path": "premium_profiles.json",
+                "user_profile_path": "user_profile.json",
+                "preferred_currency": "USD",
+                "notify_threshold_pct": 0.05,
+                "track_gold_silver_ratio": True
+            }, f, indent=2)
 
 def load_user_config():
     with open(USER_CONFIG_FILE) as f:
@@ -41,49 +51,64 @@ def save_inventory(inventory):
     with open(INVENTORY_FILE, "w") as f:
         json.dump(inventory, f, indent=2)
 
-def calculate_melt_and_premium(coin_key, spot_prices, price_paid):
-    if coin_key not in COIN_SPEC:
-        raise ValueError(f"Coin '{coin_key}' not found in coin_spec.json")
-    spec = COIN_SPEC[coin_key]
+def calculate_melt_and_premium(coin_key, spot_prices, price_paid, coin_spec=None):
+    coin_spec = get_coin_spec() if coin_spec is None else coin_spec
+    spec = coin_spec[coin_index.resolve_key(coin_key, coin_spec, COIN_SPEC_PATH)]
     spot_price = spot_prices[spec['type']]
     melt = spec['metal_content_oz'] * spot_price
     premium_dollar = price_paid - melt
     premium_pct = premium_dollar / melt if melt else 0
     return round(spot_price, 2), round(melt, 2), round(premium_dollar, 2), round(premium_pct, 4)
 
-def add_coin(args):
-    inventory = load_inventory()
-    spot_prices = get_spot_prices()
-
+def make_entry(coin_key, price, date, spot_prices, quantity=1, condition="BU", source="Unknown", notes=None,
+               coin_spec=None):
+    coin_spec = get_coin_spec() if coin_spec is None else coin_spec
+    coin_key = coin_index.resolve_key(coin_key, coin_spec, COIN_SPEC_PATH)
     spot_price, melt, prem_dollar, prem_pct = calculate_melt_and_premium(
-        args.coin, spot_prices, args.price)
+        coin_key, spot_prices, price, coin_spec)
 
-    coin = COIN_SPEC[args.coin]
+    coin = coin_spec[coin_key]
 
-    entry = {
+    return {
         "id": str(uuid.uuid4()),
-        "coin": args.coin,
+        "coin": coin_key,
         "type": coin["type"],
         "category": coin["category"],
-        "price_paid": args.price,
-        "quantity": args.quantity,
-        "condition": args.condition,
-        "source": args.source,
-        "date": args.date,
+        "price_paid": price,
+        "quantity": quantity,
+        "condition": condition,
+        "source": source,
+        "date": date,
         "spot_price_at_purchase": spot_price,
         "melt_value": melt,
         "premium_dollar": prem_dollar,
         "premium_pct": prem_pct,
-        "notes": args.notes or ""
+        "notes": notes or ""
     }
+
+def add_coin(args):
+    inventory = load_inventory()
+    with metrics.timer("spot_fetch"):
+        spot_prices = get_spot_prices()
+
+    try:
+        entry = make_entry(args.coin, args.price, args.date, spot_prices, quantity=args.quantity,
+                           condition=args.condition, source=args.source, notes=args.notes)
+    except ValueError as e:
+        print(e)
+        return
     inventory.append(entry)
     save_inventory(inventory)
-    print("✅ Coin added to inventory.")
+    print(f"✅ {entry['coin']} added to inventory.")
 
-def list_inventory():
+def list_inventory(coin_filter=None):
+    from tabulate import tabulate
     inventory = load_inventory()
+    if coin_filter:
+        selected = set(coin_index.load_index(COIN_SPEC_PATH).match(coin_filter))
+        inventory = [coin for coin in inventory if coin["coin"] in selected]
     if not inventory:
-        print("📭 Inventory is empty.")
+        print(f"📭 No coins in inventory match '{coin_filter}'." if coin_filter else "📭 Inventory is empty.")
         return
     table = []
     for coin in inventory:
@@ -139,7 +164,8 @@ def edit_entry(args):
         entry["notes"] = args.notes
 
     # Recalculate premium
-    spot_prices = get_spot_prices()
+    with metrics.timer("spot_fetch"):
+        spot_prices = get_spot_prices()
     spot_price, melt, prem_dollar, prem_pct = calculate_melt_and_premium(
         entry["coin"], spot_prices, entry["price_paid"])
     entry["spot_price_at_purchase"] = spot_price
@@ -150,12 +176,12 @@ def edit_entry(args):
     save_inventory(inventory)
     print("✏️ Entry updated.")
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Manage coin inventory")
     subparsers = parser.add_subparsers(dest="command")
 
     add = subparsers.add_parser("add")
-    add.add_argument("--coin", required=True)
+    add.add_argument("--coin", required=True, help="Coin key, nickname or unique prefix (ASE, 'silver eagle')")
     add.add_argument("--price", type=float, required=True)
     add.add_argument("--quantity", type=int, default=1)
     add.add_argument("--condition", default="BU")
@@ -164,6 +190,7 @@ def main():
     add.add_argument("--notes")
 
     list_cmd = subparsers.add_parser("list")
+    list_cmd.add_argument("--coin", help="Only coins matching a name or filter, e.g. 'all silver junk coins'")
 
     export = subparsers.add_parser("export")
     export.add_argument("--format", choices=["csv", "json"], default="json")
@@ -177,18 +204,23 @@ def main():
     edit.add_argument("--source", nargs="?")
     edit.add_argument("--notes", nargs="?")
 
-    args = parser.parse_args()
-
-    if args.command == "add":
-        add_coin(args)
-    elif args.command == "list":
-        list_inventory()
-    elif args.command == "export":
-        export_inventory(args.format)
-    elif args.command == "edit":
-        edit_entry(args)
-    else:
-        parser.print_help()
+    for subparser in (add, list_cmd, export, edit):
+        metrics.add_arguments(subparser)
+    args = parser.parse_args(argv)
+    ensure_files()
+
+    with metrics.timer(args.command or "help"):
+        if args.command == "add":
+            add_coin(args)
+        elif args.command == "list":
+            list_inventory(args.coin)
+        elif args.command == "export":
+            export_inventory(args.format)
+        elif args.command == "edit":
+            edit_entry(args)
+        else:
+            parser.print_help()
+    metrics.finish(args, "coin_inventory")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,307 @@
+# coin_service.py
+# Optional long-lived local server for repeated coin queries. It keeps
+# coin_spec.json, the premium profiles, user_config.json, the inventory and the
+# latest spot prices in memory and answers on a Unix socket
+# (coin_client.SOCKET_PATH), so a query costs a socket round trip instead of an
+# interpreter launch plus file parsing.
+#
+# Each file is stat()ed per request and re-read only when its mtime or size
+# changed, so edits made by the other tools (or by hand) show up on the next
+# query. Spot prices go through gold_api's shared cache and are refetched once
+# they are older than $SPOT_TTL_SECONDS. The rolling GSR window follows
+# spot_history.db the same way: ticks appended by gsr.py or the watcher are
+# pushed into it, any other change to the store rebuilds it.
+#
+#   python coin_service.py                 # serve until Ctrl-C or `coin_client.py shutdown`
+#   python coin_client.py value --coin peace_dollar --price 30.25
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+
+import coin_index
+import coin_inventory
+import coin_valuation
+import config
+import gsr
+import gsr_stats
+import metrics
+from coin_client import SOCKET_PATH
+from gold_api import DEFAULT_SPOT_TTL_SECONDS, env_float, read_spot_cache, refresh_spot_cache
+from spot_history import get_history
+
+
+class WatchedFile:
+    """A JSON file held in memory and re-read when its mtime or size changes."""
+
+    def __init__(self, path, default=None):
+        self.path = path
+        self.default = default
+        self.stamp = None
+        self.value = None
+        self.reloads = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            if self.default is None:
+                raise FileNotFoundError(f"❌ {self.path} not found.")
+            stamp = None
+        if stamp != self.stamp or self.value is None:
+            with self.lock:
+                if stamp != self.stamp or self.value is None:
+                    self.value = self._load(stamp)
+                    self.stamp = stamp
+                    self.reloads += 1
+        return self.value
+
+    def _load(self, stamp):
+        if stamp is None:
+            return self.default
+        with open(self.path) as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                raise ValueError(f"❌ {self.path} is malformed.")
+
+    def invalidate(self):
+        self.stamp = None
+
+
+class CoinService:
+    def __init__(self, socket_path=SOCKET_PATH, spot_ttl=None):
+        self.socket_path = socket_path
+        self.spot_ttl = env_float("SPOT_TTL_SECONDS", DEFAULT_SPOT_TTL_SECONDS) if spot_ttl is None else spot_ttl
+        self.config = WatchedFile(config.USER_CONFIG_FILE)
+        self.coin_spec = WatchedFile(coin_valuation.COIN_SPEC_PATH)
+        self.inventory = WatchedFile(coin_inventory.INVENTORY_FILE, default=[])
+        self.profiles = {}  # profile_path from user_config.json -> WatchedFile
+        self.spot = None
+        self.spot_at = 0.0
+        self.spot_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.engine = None
+        self.engine_window = None
+        self.engine_stamp = None  # spot history (count, newest ts) the engine has seen
+        self.engine_rebuilds = 0
+        self.requests = Counter()
+        self.errors = 0
+        self.started = time.time()
+        self.server = None
+
+    # --- Assets ---
+    def files(self):
+        return [self.config, self.coin_spec, self.inventory, *self.profiles.values()]
+
+    def profile_data(self, user_config):
+        path = user_config.get("profile_path", coin_valuation.DEFAULT_PROFILE_PATH)
+        if path not in self.profiles:
+            self.profiles[path] = WatchedFile(path)
+        return self.profiles[path].get()
+
+    def spot_prices(self):
+        if self.spot is None or time.time() - self.spot_at >= self.spot_ttl:
+            with self.spot_lock:
+                if self.spot is None or time.time() - self.spot_at >= self.spot_ttl:
+                    prices, age = read_spot_cache()
+                    if prices is None or age >= self.spot_ttl:
+                        prices, age = refresh_spot_cache(self.spot_ttl), 0.0
+                    self.spot, self.spot_at = prices, time.time() - age
+        return self.spot
+
+    def gsr_engine(self, settings):
+        history = get_history()
+        stamp = history.stamp()
+        if self.engine is not None and self.engine_window == settings["window_days"]:
+            if stamp == self.engine_stamp:
+                return self.engine
+            count, newest = self.engine_stamp
+            added = [row for row in history.columns(("gold", "silver"), start=newest) if row[0] > newest] \
+                if newest is not None else []
+            if newest is not None and stamp[0] - count == len(added):
+                for ts, gold, silver in added:
+                    self.engine.push(ts, gold / silver)
+                self.engine_stamp = stamp
+                return self.engine
+        # First use, a new window, or ticks removed/backfilled/without both metals: reload the window
+        self.engine = gsr_stats.RollingGSR.from_history(history, window_days=settings["window_days"])
+        self.engine_window = settings["window_days"]
+        self.engine_stamp = stamp
+        self.engine_rebuilds += 1
+        return self.engine
+
+    # --- Operations (op name -> op_<name>) ---
+    def op_ping(self):
+        return {"pid": os.getpid(), "uptime_s": round(time.time() - self.started, 1)}
+
+    def op_spot(self):
+        prices = self.spot_prices()
+        return {"gold": prices["gold"], "silver": prices["silver"], "age_s": round(time.time() - self.spot_at, 1)}
+
+    def op_value(self, coin, price=None, paid=None, profile=None):
+        user_config = self.config.get()
+        profile_data = self.profile_data(user_config)
+        if profile and profile not in profile_data["profiles"]:
+            raise ValueError(f"❌ Profile '{profile}' not found.")
+        result = coin_valuation.calculate_values(
+            coin, self.spot_prices(),
+            actual_price=paid if paid is not None else price,
+            profile_override=profile or coin_valuation.get_default_profile(user_config, profile_data),
+            paid_flag=paid is not None,
+            coin_spec=self.coin_spec.get(),
+            profile_data=profile_data,
+        )
+        if "error" in result:
+            raise ValueError(f"❌ {result['error']}")
+        return result
+
+    def op_lookup(self, query):
+        return {"query": query, "coins": coin_index.load_index(coin_valuation.COIN_SPEC_PATH).match(query)}
+
+    def op_inventory(self):
+        return self.inventory.get()
+
+    def op_add(self, coin, price, date, quantity=1, condition="BU", source="Unknown", notes=None):
+        entry = coin_inventory.make_entry(coin, price, date, self.spot_prices(), quantity=quantity,
+                                          condition=condition, source=source, notes=notes,
+                                          coin_spec=self.coin_spec.get())
+        with self.write_lock:
+            coin_inventory.save_inventory(self.inventory.get() + [entry])
+        return entry
+
+    def op_gsr(self):
+        user_config = self.config.get()
+        settings = gsr.stats_settings(user_config)
+        prices = self.spot_prices()
+        ratio = prices["gold"] / prices["silver"]
+        with self.write_lock:
+            gsr.record_tick(prices["gold"], prices["silver"])
+            engine = self.gsr_engine(settings)
+            low, high, source = gsr.alert_thresholds(user_config, engine, settings)
+            snapshot = {"mean": engine.mean, "zscore": engine.zscore(ratio),
+                        "percentile": engine.rank(ratio), "samples": engine.count}
+        signal_name = "silver_to_gold" if ratio <= low else "gold_to_silver" if ratio >= high else "hold"
+        return {"gold": prices["gold"], "silver": prices["silver"], "gsr": round(ratio, 4), "low": low,
+                "high": high, "threshold_source": source, "signal": signal_name, **snapshot}
+
+    def op_stats(self):
+        return {
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "files": {watched.path: {"reloads": watched.reloads} for watched in self.files()},
+            "gsr_window": {"samples": self.engine.count if self.engine else 0, "rebuilds": self.engine_rebuilds},
+            "spot_age_s": round(time.time() - self.spot_at, 1) if self.spot else None,
+            "uptime_s": round(time.time() - self.started, 1),
+        }
+
+    def op_reload(self):
+        for watched in self.files():
+            watched.invalidate()
+        self.spot = None
+        self.engine = None
+        return {"reloaded": [watched.path for watched in self.files()]}
+
+    def op_shutdown(self):
+        threading.Thread(target=self.server.shutdown).start()
+        return {"stopping": True}
+
+    def handle(self, line):
+        """One request line in, one reply dict out."""
+        try:
+            request = json.loads(line)
+            op = request.pop("op")
+            handler = getattr(self, f"op_{op}", None)
+            if handler is None:
+                raise ValueError(f"❌ Unknown op '{op}'.")
+            self.requests[op] += 1
+            return {"ok": True, "result": handler(**request)}
+        except Exception as e:
+            self.errors += 1
+            message = str(e) or type(e).__name__
+            return {"ok": False, "error": message if message.startswith("❌") else f"❌ {type(e).__name__}: {message}"}
+
+    # --- Socket server ---
+    def _handler(self):
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write(json.dumps(service.handle(line)).encode() + b"\n")
+                        self.wfile.flush()
+
+        return Handler
+
+    def bind(self):
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(f"❌ A coin service is already listening on {self.socket_path}.")
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)  # left behind by a service that died
+            finally:
+                probe.close()
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, self._handler())
+        self.server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        return self
+
+    def start(self):
+        """Serve from a background thread (benchmarks, embedding)."""
+        self.bind()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.close()
+
+    def close(self):
+        self.server.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve coin valuations, spot and inventory from memory")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket to listen on")
+    parser.add_argument("--spot-ttl", type=float, help="Seconds to reuse spot prices (default: $SPOT_TTL_SECONDS)")
+    parser.add_argument("--warm", action="store_true", help="Load every file and fetch spot before accepting queries")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    service = CoinService(args.socket, spot_ttl=args.spot_ttl).bind()
+    if args.warm:
+        for op in ("spot", "inventory"):
+            reply = service.handle(json.dumps({"op": op}))
+            if not reply["ok"]:
+                print(f"⚠️  Warm-up {op} failed: {reply['error']}")
+        service.coin_spec.get()
+        service.profile_data(service.config.get())
+    # SIGTERM stops the loop like Ctrl-C does, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=service.server.shutdown).start())
+    print(f"🪙 Coin service listening on {args.socket} (pid {os.getpid()}). Ctrl-C to stop.", flush=True)
+    try:
+        service.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    print(f"✅ Coin service stopped after {sum(service.requests.values())} requests.")
+    metrics.finish(args, "coin_service")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,70 @@
 import argparse
 import json
-import os
-import csv
-from gold_api import get_spot_prices
 from colorama import Fore, Style, init
 from config import load_user_config
+import coin_index
+import metrics
+from gold_api import get_spot_prices
+
+COIN_SPEC_PATH = "coin_spec.json"
+DEFAULT_PROFILE_PATH = "premium_profiles.json"
+
+# Config, coin spec and premium profiles load on first use, so importing this
+# module (or `toolkit.py value --help`) touches no files.
+_config = None
+_coin_spec = None
+_profile_data = {}
+_active_profiles_path = None
+
+def get_config():
+    global _config
+    if _config is None:
+        _config = load_user_config()
+    return _config
+
+def get_coin_spec():
+    global _coin_spec
+    if _coin_spec is None:
+        with open(COIN_SPEC_PATH) as f:
+            _coin_spec = json.load(f)
+    return _coin_spec
 
-# Enable color output
-init(autoreset=True)
-
-# --- Load config ---
-config = load_user_config()
-profile_path = config.get("profile_path", "premium_profiles.json")
-
-# --- Load coin spec ---
-print("\U0001F4C4 Loading coin_spec.json...")
-with open("coin_spec.json") as f:
-    COIN_SPEC = json.load(f)
-
-# --- Parse args ---
-parser = argparse.ArgumentParser(description="Evaluate coin melt value and premiums.")
-parser.add_argument("--coin", help="Coin key from coin_spec.json")
-parser.add_argument("--price", type=float, help="Offered price for comparison")
-parser.add_argument("--paid", type=float, help="Price actually paid (takes precedence over --price)")
-parser.add_argument("--profile", help="Override buyer profile for this run")
-parser.add_argument("--set-profile", help="Set default buyer profile for future runs")
-parser.add_argument("--add-profile", help="Add or update a premium profile (pass JSON string)")
-parser.add_argument("--batch", help="CSV file with columns: coin,price,profile")
-parser.add_argument("--profiles-path", default=profile_path, help="Path to premium_profiles.json")
-args = parser.parse_args()
-
-# --- Load premium profiles ---
-print(f"\U0001F4C4 Loading {args.profiles_path}...")
-with open(args.profiles_path) as f:
-    PROFILE_DATA = json.load(f)
+def get_coin_index():
+    return coin_index.load_index(COIN_SPEC_PATH)
+
+def profiles_path():
+    return _active_profiles_path or get_config().get("profile_path", DEFAULT_PROFILE_PATH)
+
+def use_profiles(path):
+    """Make `path` the premium profiles file for this process (--profiles-path)."""
+    global _active_profiles_path
+    _active_profiles_path = path
+
+def get_profile_data(path=None):
+    path = path or profiles_path()
+    if path not in _profile_data:
+        with open(path) as f:
+            _profile_data[path] = json.load(f)
+    return _profile_data[path]
 
 # --- Profile helpers ---
-def get_default_profile():
-    return config.get("default_profile", PROFILE_DATA.get("default_profile", "stacker"))
+def get_default_profile(config=None, profile_data=None):
+    config = get_config() if config is None else config
+    profile_data = get_profile_data() if profile_data is None else profile_data
+    return config.get("default_profile", profile_data.get("default_profile", "stacker"))
 
 def set_default_profile(profile):
+    config = get_config()
     config["default_profile"] = profile
     with open("user_config.json", "w") as f:
         json.dump(config, f, indent=2)
     print(Fore.GREEN + f"✅ Default profile set to: {profile}")
 
 def edit_premium_profile(profile_name, category_premiums):
-    PROFILE_DATA["profiles"][profile_name] = category_premiums
-    with open(args.profiles_path, "w") as f:
-        json.dump(PROFILE_DATA, f, indent=2)
+    profile_data = get_profile_data()
+    profile_data["profiles"][profile_name] = category_premiums
+    with open(profiles_path(), "w") as f:
+        json.dump(profile_data, f, indent=2)
     print(Fore.GREEN + f"✅ Profile '{profile_name}' added/updated successfully.")
 
 # --- Spot and valuation helpers ---
@@ -74,16 +90,25 @@ def display_result(result):
         print(color + Style.BRIGHT + f"Status:           {status}")
     print()
 
-def calculate_values(coin_key, spot_prices, actual_price=None, profile_override=None, paid_flag=False):
-    if coin_key not in COIN_SPEC:
-        return {"error": f"Coin '{coin_key}' not found in spec."}
+def calculate_values(coin_key, spot_prices, actual_price=None, profile_override=None, paid_flag=False,
+                     coin_spec=None, profile_data=None):
+    """Valuation for one coin. coin_spec/profile_data default to the files this process loaded."""
+    coin_spec = get_coin_spec() if coin_spec is None else coin_spec
+    profile_data = get_profile_data() if profile_data is None else profile_data
+    if coin_key not in coin_spec:
+        # Nicknames, other casing and unique prefixes ("ASE", "Silver Eagle")
+        coin_key, error = get_coin_index().lookup(coin_key)
+        if error:
+            return {"error": error}
+        if coin_key not in coin_spec:
+            return {"error": f"Coin '{coin_key}' not found in spec."}
 
-    coin = COIN_SPEC[coin_key]
-    profile = profile_override or get_default_profile()
+    coin = coin_spec[coin_key]
+    profile = profile_override or get_default_profile(profile_data=profile_data)
     category = coin["category"]
     spot_price = get_spot_for_coin(coin, spot_prices)
     melt_value = coin["metal_content_oz"] * spot_price
-    allowed_premium_pct = PROFILE_DATA["profiles"][profile][category]
+    allowed_premium_pct = profile_data["profiles"][profile][category]
     max_allowed_price = melt_value * (1 + allowed_premium_pct)
 
     result = {
@@ -129,26 +154,101 @@ def evaluate_single(args, spot_prices):
             print(Fore.RED + f"❌ Failed to add profile: {e}")
         return
 
-    result = calculate_values(args.coin, spot_prices, actual_price=price, profile_override=args.profile, paid_flag=paid_flag)
-    if "error" in result:
-        print(Fore.RED + result["error"])
-    else:
-        display_result(result)
+    # A price needs exactly one coin; without one, --coin may select several ("all silver junk coins")
+    try:
+        if args.coin in get_coin_spec():
+            coin_keys = [args.coin]
+        elif price is not None:
+            coin_keys = [get_coin_index().resolve(args.coin)]
+        else:
+            coin_keys = get_coin_index().select(args.coin)
+    except ValueError as e:
+        print(Fore.RED + str(e))
+        return
+
+    for coin_key in coin_keys:
+        result = calculate_values(coin_key, spot_prices, actual_price=price, profile_override=args.profile,
+                                  paid_flag=paid_flag)
+        if "error" in result:
+            print(Fore.RED + result["error"])
+        else:
+            display_result(result)
+
+def print_batch_summary(summary, output):
+    print(Fore.GREEN + f"💾 Wrote {summary['rows']:,} rows to {output}")
+    print(Style.BRIGHT + f"\n📊 {summary['valued']:,} valued, {summary['errors']:,} errors, "
+          f"{summary['priced']:,} with a price")
+    if summary["priced"]:
+        over = summary["priced"] - summary["within_threshold"]
+        print(Fore.GREEN + f"✅ Within threshold: {summary['within_threshold']:,}" + Fore.RED + f"   ❌ Over: {over:,}")
+        print(Fore.CYAN + f"Melt total: ${summary['melt_total']:,.2f}   Price total: ${summary['price_total']:,.2f}   "
+              f"Median premium: {summary['median_premium_pct']*100:.2f}%")
+        best = summary["best"]
+        print(Fore.CYAN + f"Best offer: {best['coin']} at ${best['actual_price']:,.2f} "
+              f"({best['premium_pct']*100:.2f}% premium, row {best['row']})")
+        for category, stats in summary["by_category"].items():
+            print(f"  {category:<12} {stats['rows']:>10,} rows  {stats['within_threshold']:>10,} within  "
+                  f"median {stats['median_premium_pct']*100:6.2f}%")
 
 def evaluate_batch(args, spot_prices):
-    with open(args.batch, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            coin = row["coin"]
-            price = float(row["price"]) if "price" in row and row["price"] else None
-            profile = row.get("profile", args.profile or get_default_profile())
-            result = calculate_values(coin, spot_prices, actual_price=price, profile_override=profile, paid_flag=False)
-            if "error" in result:
-                print(Fore.RED + result["error"])
+    """Value a whole price sheet in one vectorized pass and write machine-readable results."""
+    import coin_batch
+
+    with metrics.timer("batch_read"):
+        frame = coin_batch.read_batch(args.batch)
+    with metrics.timer("valuation"):
+        result = coin_batch.value_frame(frame, spot_prices, get_coin_spec(), get_profile_data(),
+                                        args.profile or get_default_profile(), index=get_coin_index())
+    metrics.count("rows_valued", len(result))
+
+    fmt = coin_batch.file_format(args.output, args.format) if args.output else (args.format or "csv")
+    output = args.output or coin_batch.default_output(args.batch, fmt)
+    with metrics.timer("batch_write"):
+        coin_batch.write_results(result, output, fmt)
+
+    if args.show:
+        for record in coin_batch.result_records(result):
+            if record["error"]:
+                print(Fore.RED + record["error"])
             else:
-                display_result(result)
+                display_result(record)
+    with metrics.timer("batch_summary"):
+        summary = coin_batch.summarize(result)
+    if args.summary_json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_batch_summary(summary, output)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Evaluate coin melt value and premiums.")
+    parser.add_argument("--coin", help="Coin key, nickname or prefix (ASE, 'silver eagle'); without a price, "
+                                       "also a filter such as 'all silver junk coins'")
+    parser.add_argument("--price", type=float, help="Offered price for comparison")
+    parser.add_argument("--paid", type=float, help="Price actually paid (takes precedence over --price)")
+    parser.add_argument("--profile", help="Override buyer profile for this run")
+    parser.add_argument("--set-profile", help="Set default buyer profile for future runs")
+    parser.add_argument("--add-profile", help="Add or update a premium profile (pass JSON string)")
+    parser.add_argument("--batch", help="CSV, JSONL or Parquet file with columns: coin[,price][,profile]")
+    parser.add_argument("--output", help="--batch results file (default: <batch>.valued.<format>)")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"],
+                        help="--batch output format (default: from --output's extension, else csv)")
+    parser.add_argument("--show", action="store_true", help="--batch: also print every row as a result block")
+    parser.add_argument("--summary-json", action="store_true", help="--batch: print the summary as JSON")
+    parser.add_argument("--profiles-path", help="Path to premium_profiles.json (default: profile_path from user_config.json)")
+    metrics.add_arguments(parser)
+    return parser
+
+def main(argv=None):
+    init(autoreset=True)
+    args = build_parser().parse_args(argv)
+    if args.profiles_path:
+        use_profiles(args.profiles_path)
+
+    print("\U0001F4C4 Loading coin_spec.json...")
+    get_coin_spec()
+    print(f"\U0001F4C4 Loading {profiles_path()}...")
+    get_profile_data()
 
-if __name__ == "__main__":
     if args.set_profile:
         set_default_profile(args.set_profile)
     elif args.add_profile:
@@ -159,10 +259,17 @@ if __name__ == "__main__":
         except Exception as e:
             print(Fore.RED + f"❌ Failed to add profile: {e}")
     elif args.batch:
-        spot_prices = get_spot_prices()
+        with metrics.timer("spot_fetch"):
+            spot_prices = get_spot_prices()
         evaluate_batch(args, spot_prices)
     elif args.coin:
-        spot_prices = get_spot_prices()
-        evaluate_single(args, spot_prices)
+        with metrics.timer("spot_fetch"):
+            spot_prices = get_spot_prices()
+        with metrics.timer("valuation"):
+            evaluate_single(args, spot_prices)
     else:
         print(Fore.RED + "❌ Must provide either --coin or --batch or one of the management flags.")
+    metrics.finish(args, "coin_valuation")
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,68 @@
-import requests
 import os
 import json
-from datetime import datetime, timezone
-from dotenv import load_dotenv
 from colorama import Fore, Style, init
 import argparse
+import threading
+import time
+import metrics
+from spot_history import HISTORY_PATH, INTERVALS, get_history
 
-# Enable colorama for terminal styling
-init(autoreset=True)
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each process may fetch
+    fcntl = None
 
-# Load .env for GOLDAPI_KEY
-load_dotenv()
-GOLDAPI_KEY = os.getenv("GOLDAPI_KEY")
+# Importing this module has no side effects: .env is read, the key checked and
+# requests imported only when something actually needs them, so cache and
+# history reads stay fast.
+DEFAULT_GOLDAPI_URL = "https://www.goldapi.io/api"
 
-if not GOLDAPI_KEY:
-    raise EnvironmentError("GOLDAPI_KEY not found in environment variables.")
+# Read-through cache shared by every tool that needs spot prices
+SPOT_CACHE_FILE = ".cache/spot_latest.json"
+SPOT_LOCK_FILE = ".cache/spot_latest.lock"
+DEFAULT_SPOT_TTL_SECONDS = 300
+# Serve cached prices up to this old while a background refresh runs (0 disables)
+DEFAULT_SPOT_STALE_SECONDS = 3600
 
-GOLDAPI_URL = "https://www.goldapi.io/api"
-HEADERS = {
-    "x-access-token": GOLDAPI_KEY,
-    "Content-Type": "application/json"
-}
+_env_loaded = False
+_fetcher = None
+_fetcher_lock = threading.Lock()
 
-def get_spot_price(metal: str = "XAU", currency: str = "USD") -> float:
-    url = f"{GOLDAPI_URL}/{metal}/{currency}"
-    response = requests.get(url, headers=HEADERS)
+def load_env():
+    """Load .env once (GOLDAPI_KEY, GOLDAPI_URL, SPOT_TTL_SECONDS, SPOT_STALE_SECONDS)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
-    if response.status_code == 200:
-        return response.json()["price"]
-    else:
-        raise Exception(f"GoldAPI error {response.status_code}: {response.text}")
+def env_float(name, default):
+    load_env()
+    return float(os.getenv(name, default))
+
+def get_api_key():
+    load_env()
+    key = os.getenv("GOLDAPI_KEY")
+    if not key:
+        raise EnvironmentError("GOLDAPI_KEY not found in environment variables.")
+    return key
+
+def get_fetcher(retries=None):
+    """
+    Process-wide pooled fetcher, so every request reuses keep-alive connections.
+    `retries` (default spot_fetcher.MAX_RETRIES) applies when it is created.
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            from spot_fetcher import MAX_RETRIES, SpotFetcher
+            headers = {"x-access-token": get_api_key(), "Content-Type": "application/json"}
+            _fetcher = SpotFetcher(os.getenv("GOLDAPI_URL", DEFAULT_GOLDAPI_URL), headers,
+                                   retries=MAX_RETRIES if retries is None else retries)
+        return _fetcher
+
+def get_spot_price(metal: str = "XAU", currency: str = "USD") -> float:
+    return get_fetcher().price(metal, currency)
 
 def get_gold_price_usd() -> float:
     return get_spot_price("XAU", "USD")
@@ -37,11 +70,106 @@ def get_gold_price_usd() -> float:
 def get_silver_price_usd() -> float:
     return get_spot_price("XAG", "USD")
 
-def get_spot_prices():
-    return {
-        "gold": get_gold_price_usd(),
-        "silver": get_silver_price_usd()
-    }
+def fetch_spot_prices():
+    # Gold and silver are requested concurrently over the shared session
+    return get_fetcher().fetch_named(("XAU", "XAG"), "USD")
+
+def fetch_metals(metals, currencies=("USD",)):
+    """{(metal, currency): price} for any mix of XAU/XAG/XPT/XPD and currencies, fetched concurrently."""
+    return get_fetcher().fetch(metals, currencies)
+
+def read_spot_cache(cache_file=SPOT_CACHE_FILE):
+    """Return (prices, age_seconds) from the shared cache, or (None, None)."""
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        return cached["prices"], time.time() - cached["fetched_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+def write_spot_cache(prices, cache_file=SPOT_CACHE_FILE):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fetched_at": time.time(), "prices": prices}, f)
+    os.replace(tmp_path, cache_file)
+
+class SpotLock:
+    """Exclusive flock on SPOT_LOCK_FILE so concurrent tools share one fetch."""
+
+    def __init__(self, path=SPOT_LOCK_FILE, blocking=True):
+        self.path = path
+        self.blocking = blocking
+        self.file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, "a")
+        flags = fcntl.LOCK_EX | (0 if self.blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(self.file, flags)
+        except BlockingIOError:
+            self.file.close()
+            self.file = None
+            return False
+        return True
+
+    def __exit__(self, *exc):
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+def refresh_spot_cache(max_age, blocking=True):
+    """
+    Fetch and cache prices unless another process refreshed them while we
+    waited for the lock. Returns the prices, or None when non-blocking and busy.
+    """
+    with SpotLock(blocking=blocking) as locked:
+        if not locked:
+            return None
+        prices, age = read_spot_cache()
+        if prices is not None and age < max_age:
+            metrics.count("spot_cache", result="shared")
+            return prices
+        prices = fetch_spot_prices()
+        write_spot_cache(prices)
+        return prices
+
+def _revalidate_quietly(max_age):
+    try:
+        refresh_spot_cache(max_age, blocking=False)
+    except Exception:
+        pass  # keep serving the stale value; the next caller retries
+
+def get_spot_prices(max_age=None, stale_while_revalidate=None):
+    """
+    Spot prices through the shared cache. Fresh entries (younger than
+    max_age, default $SPOT_TTL_SECONDS) are returned without an API call.
+    Entries younger than stale_while_revalidate are returned immediately while
+    a background thread refreshes them; anything older blocks on one fetch
+    shared across processes. max_age=0 forces a live fetch.
+    """
+    if max_age is None:
+        max_age = env_float("SPOT_TTL_SECONDS", DEFAULT_SPOT_TTL_SECONDS)
+    stale_limit = stale_while_revalidate
+    if stale_limit is None:
+        stale_limit = env_float("SPOT_STALE_SECONDS", DEFAULT_SPOT_STALE_SECONDS)
+
+    prices, age = read_spot_cache()
+    if prices is not None and age < max_age:
+        metrics.count("spot_cache", result="hit")
+        return prices
+    if prices is not None and max_age > 0 and age < stale_limit:
+        metrics.count("spot_cache", result="stale")
+        # Not a daemon thread: the process finishes the refresh before exiting
+        threading.Thread(target=_revalidate_quietly, args=(max_age,)).start()
+        return prices
+
+    metrics.count("spot_cache", result="miss")
+    return refresh_spot_cache(max_age)
 
 def update_env(gold, silver, env_path=".env"):
     if not os.path.exists(env_path):
@@ -58,58 +186,119 @@ def update_env(gold, silver, env_path=".env"):
     with open(env_path, "w") as f:
         f.writelines(lines)
 
-def update_spot_cache(gold, silver, cache_file=".cache/spot.json"):
-    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+def update_spot_cache(gold, silver, history_path=HISTORY_PATH):
+    """Append one tick to the spot history store."""
+    get_history(history_path).append({"gold": gold, "silver": silver})
 
-    entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "gold": gold,
-        "silver": silver
-    }
+def load_last_cached_spot(history_path=HISTORY_PATH):
+    latest = get_history(history_path).latest()
+    if latest is None:
+        raise FileNotFoundError("No spot price history found.")
+    return latest
 
-    if os.path.exists(cache_file):
-        with open(cache_file, "r") as f:
-            history = json.load(f)
+def print_history(args):
+    history = get_history()
+    if args.bars:
+        rows = history.bars(args.bars, start=args.since, end=args.until, last=args.limit)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return
+        for row in rows:
+            gold, silver = row["gold"], row["silver"]
+            line = f"{row['timestamp'][:16]}  "
+            line += f"Gold O {gold['open']:.2f} H {gold['high']:.2f} L {gold['low']:.2f} C {gold['close']:.2f}  " if gold else ""
+            line += f"Silver O {silver['open']:.2f} H {silver['high']:.2f} L {silver['low']:.2f} C {silver['close']:.2f}" if silver else ""
+            print(line + f"  ({row['ticks']} ticks)")
     else:
-        history = []
-
-    history.append(entry)
-
-    with open(cache_file, "w") as f:
-        json.dump(history, f, indent=2)
-
-def load_last_cached_spot(cache_file=".cache/spot.json"):
-    if os.path.exists(cache_file):
-        with open(cache_file, "r") as f:
-            history = json.load(f)
-        if history:
-            return history[-1]
-    raise FileNotFoundError("No spot price history found.")
+        rows = history.range(start=args.since, end=args.until, last=args.limit)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return
+        for row in rows:
+            print(f"{row['timestamp'][:19]}  Gold ${row.get('gold', 0):.2f}  Silver ${row.get('silver', 0):.2f}")
+    if not rows:
+        print(Fore.MAGENTA + "ℹ️ No spot history in that range.")
 
 def calculate_diff(current, previous):
     if previous == 0:
         return 0
     return ((current - previous) / previous) * 100
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Fetch and store gold/silver spot prices.")
     parser.add_argument("--dry-run", action="store_true", help="Fetch prices but don't write to .env or cache.")
     parser.add_argument("--json", action="store_true", help="Output spot prices as JSON.")
-    parser.add_argument("--from-cache", action="store_true", help="Use last saved spot prices from .cache/spot.json.")
+    parser.add_argument("--from-cache", action="store_true", help="Use last saved spot prices from the spot history.")
     parser.add_argument("--diff", action="store_true", help="Compare live prices to last cached values.")
-    return parser.parse_args()
+    parser.add_argument("--max-age", type=float, default=0,
+                        help="Reuse prices from the shared spot cache up to this many seconds old (default: always fetch).")
+    parser.add_argument("--history", action="store_true", help="Print saved spot history instead of fetching.")
+    parser.add_argument("--since", help="History start (ISO date/time, UTC).")
+    parser.add_argument("--until", help="History end, exclusive (ISO date/time, UTC).")
+    parser.add_argument("--bars", choices=sorted(INTERVALS), help="Downsample history to OHLC bars.")
+    parser.add_argument("--limit", type=int, help="Show only the most recent N history rows.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Poll continuously, log every tick to history and notify on big moves.")
+    parser.add_argument("--interval", type=float, help="--watch: minimum seconds between polls.")
+    parser.add_argument("--quota", type=int, help="--watch: GoldAPI requests allowed per month (0 = unlimited).")
+    parser.add_argument("--notify", help="--watch: comma-separated channels: stdout,file,webhook.")
+    parser.add_argument("--webhook", help="--watch: URL to POST alerts to as JSON.")
+    parser.add_argument("--alert-file", help="--watch: JSONL file for notify=file.")
+    parser.add_argument("--threshold", type=float, help="--watch: alert on moves of this fraction (0.05 = 5%%).")
+    parser.add_argument("--max-ticks", type=int, help="--watch: stop after this many successful polls.")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
 
-if __name__ == "__main__":
-    args = parse_args()
+def run_watch(args):
+    import spot_watch
+    from config import load_user_config
+
+    settings = spot_watch.watch_settings(
+        load_user_config(),
+        min_interval_seconds=args.interval,
+        monthly_quota=args.quota,
+        notify=args.notify,
+        webhook_url=args.webhook,
+        alert_file=args.alert_file,
+        notify_threshold_pct=args.threshold,
+    )
+    quota = settings["monthly_quota"] or "unlimited"
+    print(Fore.GREEN + f"👀 Watching spot prices (threshold {settings['notify_threshold_pct']:.2%}, "
+          f"quota {quota}/month, notify: {', '.join(settings['notify'])}). Ctrl-C to stop.", flush=True)
+    # No transport retries: each tick is exactly REQUESTS_PER_TICK HTTP attempts,
+    # so the quota count is exact, and the watch loop's backoff does the retrying
+    get_fetcher(retries=0)
+    stop = threading.Event()
+    spot_watch.install_stop_handlers(stop)
+    # Live fetch through the shared cache so other tools see each tick too
+    ticks = spot_watch.watch(lambda: refresh_spot_cache(0), settings, stop=stop, max_ticks=args.max_ticks)
+    print(Fore.GREEN + f"✅ Watch stopped after {ticks} ticks.")
+
+def main(argv=None):
+    init(autoreset=True)
+    args = parse_args(argv)
 
     try:
+        if args.history:
+            with metrics.timer("spot_history_read"):
+                print_history(args)
+            metrics.finish(args, "gold_api")
+            return
+
+        if args.watch:
+            run_watch(args)
+            metrics.finish(args, "gold_api")
+            return
+
         if args.from_cache:
-            spot = load_last_cached_spot()
+            with metrics.timer("spot_cache_read"):
+                spot = load_last_cached_spot()
             gold_price = spot["gold"]
             silver_price = spot["silver"]
             source_note = " (from cache)"
         else:
-            spot_prices = get_spot_prices()
+            with metrics.timer("spot_fetch"):
+                spot_prices = get_spot_prices(max_age=args.max_age)
             gold_price = spot_prices["gold"]
             silver_price = spot_prices["silver"]
             source_note = ""
@@ -150,9 +339,10 @@ if __name__ == "__main__":
                 print(Fore.CYAN + f"  Change: {direction} {abs(silver_change):.2f}%")
 
         if not args.from_cache and not args.dry_run:
-            update_env(gold_price, silver_price)
-            update_spot_cache(gold_price, silver_price)
-            print(Fore.GREEN + "✅ Spot prices saved to .env and logged to .cache/spot.json")
+            with metrics.timer("spot_save"):
+                update_env(gold_price, silver_price)
+                update_spot_cache(gold_price, silver_price)
+            print(Fore.GREEN + f"✅ Spot prices saved to .env and logged to {HISTORY_PATH}")
         elif args.from_cache and not args.json:
             print(Fore.MAGENTA + "ℹ️ Loaded from cache: no API request made.")
         elif args.dry_run and not args.json:
@@ -160,3 +350,8 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(Fore.RED + f"Error: {e}")
+
+    metrics.finish(args, "gold_api")
+
+if __name__ == "__main__":
+    main()
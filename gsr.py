@@ -1,34 +1,48 @@
+import argparse
 import json
-from datetime import datetime
 from gold_api import get_spot_prices
 from colorama import Fore, Style, init
 from config import load_user_config
+from spot_history import get_history
+import gsr_stats
+import metrics
 
-init(autoreset=True)
 
-CACHE_FILE = ".cache/gsr.json"
+def stats_settings(config):
+    settings = config.get("gsr_stats", {})
+    return {
+        "window_days": settings.get("window_days", gsr_stats.WINDOW_DAYS),
+        "low": settings.get("low_percentile", gsr_stats.LOW_PERCENTILE),
+        "high": settings.get("high_percentile", gsr_stats.HIGH_PERCENTILE),
+        "min_samples": settings.get("min_samples", gsr_stats.MIN_SAMPLES),
+    }
 
 
-def save_gsr_to_cache(gsr):
-    try:
-        with open(CACHE_FILE, "r") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = []
+def record_tick(gold, silver):
+    """Append to the spot history unless these prices are already the latest tick (a cache hit)."""
+    history = get_history()
+    latest = history.latest()
+    if latest and latest.get("gold") == gold and latest.get("silver") == silver:
+        return False
+    history.append({"gold": gold, "silver": silver})
+    return True
 
-    data.append({
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "gsr": gsr
-    })
 
-    with open(CACHE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def alert_thresholds(config, engine, settings):
+    """Percentile thresholds from the rolling window once it has enough samples, else the fixed ones."""
+    if engine.count >= settings["min_samples"]:
+        low_value, high_value = engine.thresholds(settings["low"], settings["high"])
+        source = f"p{settings['low']}/p{settings['high']} of the last {settings['window_days']} days"
+        return low_value, high_value, source
+    fixed = config.get("gsr_alerts", {"silver_to_gold": 55, "gold_to_silver": 85})
+    return fixed["silver_to_gold"], fixed["gold_to_silver"], "fixed thresholds from user_config.json"
 
 
 def check_gsr():
     config = load_user_config()
-    thresholds = config.get("gsr_alerts", {"silver_to_gold": 55, "gold_to_silver": 85})
-    spot = get_spot_prices()
+    settings = stats_settings(config)
+    with metrics.timer("spot_fetch"):
+        spot = get_spot_prices()
 
     gold = spot["gold"]
     silver = spot["silver"]
@@ -39,15 +53,64 @@ def check_gsr():
     print(f"Gold Spot:   ${gold:.2f}")
     print(f"Silver Spot: ${silver:.2f}")
 
-    save_gsr_to_cache(gsr_rounded)
+    with metrics.timer("gsr_save"):
+        record_tick(gold, silver)
 
-    if gsr <= thresholds["silver_to_gold"]:
+    with metrics.timer("gsr_stats"):
+        engine = gsr_stats.RollingGSR.from_history(window_days=settings["window_days"])
+        low_value, high_value, source = alert_thresholds(config, engine, settings)
+
+    if engine.count >= 2:
+        zscore = engine.zscore(gsr)
+        print(f"{settings['window_days']}-day mean: {engine.mean:.2f}  "
+              f"(z-score {zscore:+.2f}, percentile {engine.rank(gsr):.0f}, {engine.count} samples)"
+              if zscore is not None else f"{settings['window_days']}-day mean: {engine.mean:.2f}")
+    print(f"Thresholds:  ≤ {low_value:.2f} / ≥ {high_value:.2f} ({source})")
+
+    if gsr <= low_value:
         print(Fore.BLUE + Style.BRIGHT + f"\n🔁 Suggestion: Consider trading silver for gold\nYou could convert {gsr_rounded:.2f} oz silver → 1 oz gold")
-    elif gsr >= thresholds["gold_to_silver"]:
+    elif gsr >= high_value:
         print(Fore.YELLOW + Style.BRIGHT + f"\n🔁 Suggestion: Consider trading gold for silver\nYou could convert 1 oz gold → {gsr_rounded:.2f} oz silver")
     else:
         print(Fore.GREEN + Style.BRIGHT + "\n🟢 Suggestion: Hold – GSR within neutral range")
 
 
+def run_backfill(as_json=False):
+    settings = stats_settings(load_user_config())
+    with metrics.timer("gsr_backfill"):
+        frame = gsr_stats.backfill(window_days=settings["window_days"], low=settings["low"],
+                                   high=settings["high"], min_samples=settings["min_samples"])
+    latest = gsr_stats.latest_stats(frame)
+    signals = frame["signal"].value_counts().to_dict() if len(frame) else {}
+
+    if as_json:
+        print(json.dumps({"ticks": len(frame), "signals": signals, "latest": latest}, indent=2, default=str))
+        return
+    if latest is None:
+        print(Fore.MAGENTA + "ℹ️ No spot history to backfill from.")
+        return
+    print(f"✅ Derived {len(frame)} GSR ticks from spot history → {gsr_stats.SERIES_FILE}")
+    print(f"Latest ({latest['timestamp'][:16]}): GSR {latest['gsr']:.2f}, "
+          f"{settings['window_days']}-day mean {latest['mean']:.2f}, "
+          f"percentile {latest['rank_pct']:.0f}")
+    for signal in ("silver_to_gold", "gold_to_silver", "hold"):
+        print(f"  {signal:<15} {signals.get(signal, 0)} ticks")
+
+
+def main(argv=None):
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Check the gold/silver ratio against alert thresholds")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Recompute the rolling GSR series from stored spot history (no API calls)")
+    parser.add_argument("--json", action="store_true", help="With --backfill, print the summary as JSON")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.backfill:
+        run_backfill(args.json)
+    else:
+        check_gsr()
+    metrics.finish(args, "gsr")
+
+
 if __name__ == "__main__":
-    check_gsr()
+    main()
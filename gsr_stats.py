@@ -0,0 +1,215 @@
+# gsr_stats.py
+# Rolling statistics of the gold/silver ratio over the spot price history.
+#
+# RollingGSR keeps a time-based window (default 90 days) of GSR ticks. It holds
+# running sums for the mean/std and a sorted copy of the window values for
+# percentiles, so every new tick is O(log n) to rank and the window is never
+# rescanned. The backfill recomputes the whole series at once with pandas
+# rolling windows from the spot history store. Nothing is fetched from the API.
+
+import bisect
+import json
+import math
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from spot_history import get_history, to_epoch, to_iso
+
+WINDOW_DAYS = 90
+LOW_PERCENTILE = 10
+HIGH_PERCENTILE = 90
+MIN_SAMPLES = 20
+SERIES_FILE = ".cache/gsr_series.feather"
+LEGACY_GSR_FILE = ".cache/gsr.json"
+
+
+class RollingGSR:
+    def __init__(self, window_days=WINDOW_DAYS):
+        self.window = window_days * 86400
+        self.ticks = deque()   # (ts, gsr) oldest first
+        self.sorted = []       # window values in ascending order
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    @classmethod
+    def from_history(cls, history=None, window_days=WINDOW_DAYS, now=None):
+        """Load the window of ticks before now from the spot history (one index range scan)."""
+        history = history or get_history()
+        now = time.time() if now is None else to_epoch(now)
+        engine = cls(window_days)
+        rows = history.columns(("gold", "silver"), start=now - engine.window, end=now)
+        if rows:
+            data = np.array(rows, dtype=float)
+            engine.extend(data[:, 0], data[:, 1] / data[:, 2])
+        return engine
+
+    def extend(self, timestamps, ratios):
+        """Bulk-load ticks (ascending timestamps) and rebuild the window in one pass."""
+        self.ticks.extend(zip(timestamps.tolist(), ratios.tolist()))
+        if self.ticks:
+            cutoff = self.ticks[-1][0] - self.window
+            while self.ticks[0][0] <= cutoff:
+                self.ticks.popleft()
+        values = np.fromiter((gsr for _, gsr in self.ticks), dtype=float, count=len(self.ticks))
+        self.sorted = np.sort(values).tolist()
+        self.total = float(values.sum())
+        self.total_sq = float(np.square(values).sum())
+
+    def push(self, ts, gsr):
+        """Add one tick; returns its snapshot (rank, z-score) against the updated window."""
+        ts = to_epoch(ts)
+        self.ticks.append((ts, gsr))
+        bisect.insort(self.sorted, gsr)
+        self.total += gsr
+        self.total_sq += gsr * gsr
+        self._evict(ts)
+        return self.snapshot(gsr)
+
+    def _evict(self, now):
+        cutoff = now - self.window
+        while self.ticks and self.ticks[0][0] <= cutoff:
+            _, old = self.ticks.popleft()
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+            self.total -= old
+            self.total_sq -= old * old
+
+    @property
+    def count(self):
+        return len(self.ticks)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the window, linearly interpolated like numpy."""
+        if not self.sorted:
+            return None
+        position = (len(self.sorted) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self.sorted) - 1)
+        return self.sorted[lower] + (self.sorted[upper] - self.sorted[lower]) * (position - lower)
+
+    def rank(self, value):
+        """Percent of window values at or below value."""
+        if not self.sorted:
+            return None
+        return 100 * bisect.bisect_right(self.sorted, value) / len(self.sorted)
+
+    def zscore(self, value):
+        std = self.std
+        if not std:
+            return None
+        return (value - self.mean) / std
+
+    def thresholds(self, low=LOW_PERCENTILE, high=HIGH_PERCENTILE):
+        return self.percentile(low), self.percentile(high)
+
+    def signal(self, value, low=LOW_PERCENTILE, high=HIGH_PERCENTILE, min_samples=MIN_SAMPLES):
+        """'silver_to_gold', 'gold_to_silver' or 'hold' from percentile thresholds; None until min_samples ticks."""
+        if self.count < min_samples:
+            return None
+        low_value, high_value = self.thresholds(low, high)
+        if value <= low_value:
+            return "silver_to_gold"
+        if value >= high_value:
+            return "gold_to_silver"
+        return "hold"
+
+    def snapshot(self, value=None, low=LOW_PERCENTILE, high=HIGH_PERCENTILE):
+        value = self.ticks[-1][1] if value is None and self.ticks else value
+        low_value, high_value = self.thresholds(low, high)
+        return {
+            "gsr": value,
+            "samples": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "zscore": self.zscore(value) if value is not None else None,
+            "rank_pct": self.rank(value) if value is not None else None,
+            f"p{low}": low_value,
+            f"p{high}": high_value,
+        }
+
+
+def load_legacy_gsr(path=LEGACY_GSR_FILE):
+    """(timestamps, ratios) from the old gsr.json list, or empty arrays."""
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return np.array([]), np.array([])
+    entries = [entry for entry in entries if entry.get("timestamp") and entry.get("gsr")]
+    return (np.array([to_epoch(entry["timestamp"]) for entry in entries], dtype=float),
+            np.array([entry["gsr"] for entry in entries], dtype=float))
+
+
+def backfill(history=None, window_days=WINDOW_DAYS, low=LOW_PERCENTILE, high=HIGH_PERCENTILE,
+             min_samples=MIN_SAMPLES, legacy_path=LEGACY_GSR_FILE, output=SERIES_FILE):
+    """
+    Derive the GSR series from the stored spot history (plus any older gsr.json
+    points) and compute rolling mean, std, z-score, percentile rank and
+    percentile thresholds for every tick. Returns a DataFrame; writes it to
+    output (feather) when given.
+    """
+    import pandas as pd  # only the backfill needs pandas; keep check_gsr start-up light
+
+    history = history or get_history()
+    rows = history.columns(("gold", "silver"))
+    data = np.array(rows, dtype=float).reshape(-1, 3)
+    timestamps, ratios = data[:, 0], data[:, 1] / data[:, 2]
+
+    legacy_ts, legacy_gsr = load_legacy_gsr(legacy_path) if legacy_path else (np.array([]), np.array([]))
+    if len(legacy_ts):
+        older = legacy_ts < (timestamps[0] if len(timestamps) else np.inf)
+        timestamps = np.concatenate([legacy_ts[older], timestamps])
+        ratios = np.concatenate([legacy_gsr[older], ratios])
+
+    index = pd.to_datetime(timestamps, unit="s", utc=True)
+    series = pd.Series(ratios, index=index, name="gsr").sort_index()
+    series = series[~series.index.duplicated(keep="last")]
+    rolling = series.rolling(f"{window_days}D")
+
+    frame = pd.DataFrame({"gsr": series})
+    frame["samples"] = rolling.count().astype(int)
+    frame["mean"] = rolling.mean()
+    frame["std"] = rolling.std()
+    frame["zscore"] = (frame["gsr"] - frame["mean"]) / frame["std"]
+    frame["rank_pct"] = rolling.rank(pct=True) * 100
+    frame[f"p{low}"] = rolling.quantile(low / 100)
+    frame[f"p{high}"] = rolling.quantile(high / 100)
+
+    ready = frame["samples"] >= min_samples
+    frame["signal"] = np.where(~ready, None,
+                               np.where(frame["gsr"] <= frame[f"p{low}"], "silver_to_gold",
+                                        np.where(frame["gsr"] >= frame[f"p{high}"], "gold_to_silver", "hold")))
+    frame.index.name = "timestamp"
+
+    if output and len(frame):
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        tmp_path = f"{output}.{os.getpid()}.tmp"
+        frame.reset_index().to_feather(tmp_path)
+        os.replace(tmp_path, output)
+    return frame
+
+
+def latest_stats(frame):
+    """Snapshot dict for the last row of a backfill frame."""
+    if frame.empty:
+        return None
+    last = frame.iloc[-1]
+    stats = {}
+    for key, value in last.items():
+        value = value.item() if hasattr(value, "item") else value  # numpy scalars -> Python
+        stats[key] = None if isinstance(value, float) and math.isnan(value) else value
+    stats["timestamp"] = to_iso(frame.index[-1].timestamp())
+    return stats
@@ -0,0 +1,227 @@
+# metrics.py
+# In-process timers, counters and latency histograms for the CLIs.
+#
+# Code records into the process-wide REGISTRY with metrics.timer("stage"),
+# metrics.count(...) and metrics.observe(...). Each CLI calls
+# metrics.add_arguments(parser) and metrics.finish(args, job) so a run can print a
+# stage breakdown (--profile) and export JSON or a Prometheus textfile for cron
+# alerting (--metrics-json / --metrics-prom).
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds; a final +Inf bucket is implied
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_METRIC = "stage_seconds"
+TOTAL_STAGE = "total"
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other["counts"])]
+        self.sum += other["sum"]
+        self.count += other["count"]
+        self.max = max(self.max, other["max"])
+
+    def quantile(self, q):
+        """Bucket upper bound containing the q-th observation (Prometheus-style estimate)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"counts": list(self.counts), "sum": self.sum, "count": self.count, "max": self.max}
+
+
+class Registry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.stage_order = []
+        self.lock = threading.Lock()
+
+    def count(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+                if name == STAGE_METRIC:
+                    self.stage_order.append(labels["stage"])
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_METRIC, time.perf_counter() - start, stage=stage)
+
+    def snapshot(self):
+        """Plain-data copy, picklable across worker processes and JSON-serializable."""
+        with self.lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **hist.to_dict()}
+                    for (name, labels), hist in self.histograms.items()
+                ],
+            }
+
+    def drain(self):
+        snapshot = self.snapshot()
+        self.reset()
+        return snapshot
+
+    def merge(self, snapshot):
+        """Fold in a snapshot taken in another process (e.g. a ProcessPoolExecutor worker)."""
+        for counter in snapshot["counters"]:
+            self.count(counter["name"], counter["value"], **counter["labels"])
+        for item in snapshot["histograms"]:
+            key = (item["name"], _label_key(item["labels"]))
+            with self.lock:
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                    if item["name"] == STAGE_METRIC:
+                        self.stage_order.append(item["labels"]["stage"])
+                self.histograms[key].merge(item)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.stage_order.clear()
+
+    def stages(self):
+        with self.lock:
+            return [(stage, self.histograms[(STAGE_METRIC, (("stage", stage),))]) for stage in self.stage_order]
+
+
+REGISTRY = Registry()
+count = REGISTRY.count
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+def _prom_labels(labels, **extra):
+    merged = {**labels, **extra}
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in sorted(merged.items())) + "}"
+
+
+def to_prometheus(registry=REGISTRY, job="toolkit"):
+    snapshot = registry.snapshot()
+    lines = []
+    typed = set()
+    for counter in sorted(snapshot["counters"], key=lambda c: c["name"]):
+        name = f"{counter['name']}_total"
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_prom_labels(counter['labels'], job=job)} {counter['value']}")
+    for item in sorted(snapshot["histograms"], key=lambda h: h["name"]):
+        name = item["name"]
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), item["counts"]):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_prom_labels(item['labels'], job=job, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_prom_labels(item['labels'], job=job)} {item['sum']:.6f}")
+        lines.append(f"{name}_count{_prom_labels(item['labels'], job=job)} {item['count']}")
+    lines.append("# TYPE last_run_timestamp_seconds gauge")
+    lines.append(f"last_run_timestamp_seconds{_prom_labels({}, job=job)} {time.time():.0f}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def export_json(path, registry=REGISTRY, job="toolkit"):
+    _write_atomic(path, json.dumps({"job": job, "timestamp": time.time(), **registry.snapshot()}, indent=2))
+
+
+def export_prometheus(path, registry=REGISTRY, job="toolkit"):
+    # node_exporter's textfile collector only reads *.prom files, written atomically
+    _write_atomic(path, to_prometheus(registry, job))
+
+
+def print_profile(registry=REGISTRY):
+    stages = registry.stages()
+    # A "total" stage wraps the others; use it as the denominator and list it last
+    totals = [hist.sum for stage, hist in stages if stage == TOTAL_STAGE]
+    total = (totals[0] if totals else sum(hist.sum for _, hist in stages)) or 1.0
+    stages = [s for s in stages if s[0] != TOTAL_STAGE] + [s for s in stages if s[0] == TOTAL_STAGE]
+    print("\n⏱️  Stage breakdown:")
+    if not stages:
+        print("  (no timed stages in this run)")
+    for stage, hist in stages:
+        calls = f"{hist.count} calls, p95 {hist.quantile(0.95) * 1000:.1f} ms" if hist.count > 1 else "1 call"
+        print(f"  {stage:<24} {hist.sum:>9.3f}s  {hist.sum / total * 100:5.1f}%  ({calls})")
+    counters = registry.snapshot()["counters"]
+    if counters:
+        print("📈 Counters:")
+        for counter in sorted(counters, key=lambda c: c["name"]):
+            labels = ", ".join(f"{k}={v}" for k, v in counter["labels"].items())
+            print(f"  {counter['name']:<24} {counter['value']:>12,}" + (f"  ({labels})" if labels else ""))
+
+
+def add_arguments(parser):
+    # coin_valuation.py already uses --profile for the buyer profile; --profile-stages always works
+    flags = ["--profile-stages"] if "--profile" in parser._option_string_actions else ["--profile", "--profile-stages"]
+    parser.add_argument(*flags, dest="profile_stages", action="store_true", help="Print a per-stage timing breakdown")
+    parser.add_argument("--metrics-json", metavar="PATH", help="Write run metrics as JSON")
+    parser.add_argument("--metrics-prom", metavar="PATH", help="Write run metrics as a Prometheus textfile")
+
+
+def finish(args, job):
+    if getattr(args, "profile_stages", False):
+        print_profile()
+    if getattr(args, "metrics_json", None):
+        export_json(args.metrics_json, job=job)
+    if getattr(args, "metrics_prom", None):
+        export_prometheus(args.metrics_prom, job=job)
@@ -0,0 +1,89 @@
+# month_cache.py
+# Columnar on-disk cache of parsed and categorized months.
+#
+# Each month is stored as one Arrow/Feather file keyed by the hashes of its
+# source CSVs, the vendor store version and the category rules, so editing any
+# of them invalidates the entry. Reads are memory-mapped.
+
+import glob
+import hashlib
+import os
+import re
+
+from budget_manifest import file_hash
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+CACHE_DIR = ".cache/months"
+CACHE_FORMAT = 1
+ENTRY_PATTERN = re.compile(r"^(\d{4})-([a-z]+)-[0-9a-f]+\.feather$")
+
+
+def cache_key(paths, vendor_version, rules_signature=None):
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(f"v{CACHE_FORMAT}|vendors={vendor_version}|rules={rules_signature}".encode())
+    for path in paths:
+        digest.update(f"|{path}:".encode())
+        digest.update((file_hash(path) if os.path.exists(path) else "missing").encode())
+    return digest.hexdigest()
+
+
+def entry_path(month_name, year, key, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{year}-{month_name}-{key}.feather")
+
+
+def load_month(month_name, year, key, cache_dir=CACHE_DIR):
+    """Cached transactions DataFrame for this month and key, or None."""
+    path = entry_path(month_name, year, key, cache_dir)
+    if feather is None or not os.path.exists(path):
+        return None
+    return feather.read_feather(path, memory_map=True)
+
+
+def save_month(month_name, year, key, transactions, cache_dir=CACHE_DIR):
+    if feather is None:
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    path = entry_path(month_name, year, key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(transactions.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+    # Only the newest entry per month is useful; drop superseded ones
+    for stale in glob.glob(os.path.join(cache_dir, f"{year}-{month_name}-*.feather")):
+        if stale != path:
+            os.remove(stale)
+    return path
+
+
+def latest_month(month_name, year, cache_dir=CACHE_DIR):
+    """
+    Most recent cached entry for a month regardless of key, for read-only
+    reports that do not need to re-validate against the source CSVs.
+    """
+    if feather is None:
+        return None
+    entries = glob.glob(os.path.join(cache_dir, f"{year}-{month_name}-*.feather"))
+    if not entries:
+        return None
+    return feather.read_feather(max(entries, key=os.path.getmtime), memory_map=True)
+
+
+def cached_months(cache_dir=CACHE_DIR):
+    """{(year, month_name): path} of the newest entry for every cached month."""
+    latest = {}
+    for path in glob.glob(os.path.join(cache_dir, "*.feather")):
+        match = ENTRY_PATTERN.match(os.path.basename(path))
+        if not match:
+            continue
+        key = (int(match.group(1)), match.group(2))
+        if key not in latest or os.path.getmtime(path) > os.path.getmtime(latest[key]):
+            latest[key] = path
+    return latest
+
+
+def read_entry(path):
+    return feather.read_feather(path, memory_map=True)
@@ -0,0 +1,127 @@
+# sheets_client.py
+# Long-lived, authorized Google Sheets session shared by every upload in a run.
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+TOKEN_CACHE_PATH = ".cache/sheets_token.json"
+UPLOAD_WORKERS = 4
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def authorize(credentials_file):
+    # gspread and google-auth are only needed once we actually talk to Google.
+    # google-auth credentials expose token/expiry, which the token cache reads and restores.
+    import gspread
+    from google.oauth2.service_account import Credentials
+    creds = Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
+    return gspread.authorize(creds)
+
+
+class SheetsSession:
+    """
+    Authorizes once and caches the spreadsheet and worksheet handles.
+    The access token is persisted to token_cache until it expires so later
+    runs skip the OAuth handshake; google-auth refreshes it in place when it lapses.
+    """
+
+    def __init__(self, credentials_file, sheet_name, token_cache=TOKEN_CACHE_PATH, client_factory=authorize):
+        self.credentials_file = credentials_file
+        self.sheet_name = sheet_name
+        self.token_cache = token_cache
+        self.client_factory = client_factory
+        self._client = None
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def auth(self):
+        http_client = getattr(self._client, "http_client", None)
+        return getattr(http_client, "auth", None)
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self.client_factory(self.credentials_file)
+                self.load_token()
+            return self._client
+
+    def load_token(self):
+        auth = self.auth
+        if auth is None or not os.path.exists(self.token_cache):
+            return
+        try:
+            with open(self.token_cache) as f:
+                cached = json.load(f)
+            if cached.get("account") != getattr(auth, "service_account_email", None):
+                return
+            auth.token = cached["token"]
+            auth.expiry = datetime.fromisoformat(cached["expiry"])
+        except (OSError, ValueError, KeyError):
+            return
+
+    def save_token(self):
+        auth = self.auth
+        if auth is None or not getattr(auth, "token", None) or getattr(auth, "expiry", None) is None:
+            return
+        os.makedirs(os.path.dirname(self.token_cache), exist_ok=True)
+        fd = os.open(self.token_cache, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "account": getattr(auth, "service_account_email", None),
+                "token": auth.token,
+                "expiry": auth.expiry.isoformat(),
+            }, f)
+
+    def spreadsheet(self):
+        client = self.client
+        with self._lock:
+            if self._spreadsheet is None:
+                token_before = getattr(self.auth, "token", None)
+                self._spreadsheet = client.open(self.sheet_name)
+                if getattr(self.auth, "token", None) != token_before:
+                    self.save_token()
+            return self._spreadsheet
+
+    def worksheet(self, title):
+        with self._lock:
+            if title in self._worksheets:
+                return self._worksheets[title]
+        worksheet = self.spreadsheet().worksheet(title)
+        with self._lock:
+            return self._worksheets.setdefault(title, worksheet)
+
+    def add_worksheet(self, title, rows, cols):
+        worksheet = self.spreadsheet().add_worksheet(title=title, rows=rows, cols=cols)
+        with self._lock:
+            self._worksheets[title] = worksheet
+        return worksheet
+
+
+def get_session(credentials_file, sheet_name):
+    """Return the process-wide session for this keyfile and spreadsheet."""
+    key = (os.path.abspath(credentials_file), sheet_name)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = SheetsSession(credentials_file, sheet_name)
+        return _sessions[key]
+
+
+def upload_concurrently(upload, jobs, max_workers=UPLOAD_WORKERS):
+    """
+    Call upload(*job) for every job on a bounded thread pool and return the
+    results in job order. The shared SheetWriter limiter keeps the combined
+    request rate within quota.
+    """
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [upload(*job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        return list(pool.map(lambda job: upload(*job), jobs))
@@ -0,0 +1,161 @@
+# sheets_writer.py
+# Diff-based, rate-limited writes to Google Sheets worksheets.
+
+import json
+import random
+import threading
+import time
+
+import metrics
+
+# Sheets allows 60 write requests per minute per user; stay just under it.
+REQUESTS_PER_MINUTE = 55
+BURST = 10
+MAX_CELLS_PER_BATCH = 20_000
+MAX_RETRIES = 5
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 64.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+def is_api_error(error):
+    # gspread is imported on the first failure, not when the module loads
+    from gspread.exceptions import APIError
+    return isinstance(error, APIError)
+
+def api_status(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) or getattr(error, "code", None)
+
+
+def diff_ranges(current, rows, width):
+    """
+    Compare the tab's current values with the desired rows and return
+    [(first_row_number, values), ...] for each contiguous run of changed rows.
+    Row numbers are 1-based like A1 notation.
+    """
+    def normalize(row):
+        cells = ["" if v is None else str(v) for v in row[:width]]
+        return cells + [""] * (width - len(cells))
+
+    ranges = []
+    run_start, run_values = None, []
+    for i, row in enumerate(rows):
+        wanted = normalize(row)
+        existing = normalize(current[i]) if i < len(current) else None
+        if wanted != existing:
+            if run_start is None:
+                run_start = i + 1
+            run_values.append(list(row) + [""] * (width - len(row)))
+        elif run_start is not None:
+            ranges.append((run_start, run_values))
+            run_start, run_values = None, []
+    if run_start is not None:
+        ranges.append((run_start, run_values))
+    return ranges
+
+
+class SheetWriter:
+    def __init__(self, limiter=None, max_cells=MAX_CELLS_PER_BATCH, retries=MAX_RETRIES,
+                 base_delay=BASE_BACKOFF_SECONDS, sleep=time.sleep):
+        self.limiter = limiter or TokenBucket(REQUESTS_PER_MINUTE / 60, BURST)
+        self.max_cells = max_cells
+        self.retries = retries
+        self.base_delay = base_delay
+        self.sleep = sleep
+
+    def call(self, fn, *args, **kwargs):
+        """Run one API request through the limiter, backing off on 429/5xx."""
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_api_error(e) or attempt == self.retries or api_status(e) not in RETRYABLE_STATUS:
+                    raise
+                metrics.count("sheets_retries", status=api_status(e))
+                delay = min(MAX_BACKOFF_SECONDS, self.base_delay * 2 ** attempt)
+                print(f"⏳ Sheets API returned {api_status(e)}, retrying in {delay:.1f}s...")
+                self.sleep(delay * random.uniform(0.5, 1.0))
+            finally:
+                metrics.count("sheets_requests")
+                metrics.observe("sheets_request_seconds", time.perf_counter() - start)
+
+    def batches(self, ranges, width):
+        from gspread.utils import rowcol_to_a1
+        batch, cells = [], 0
+        for start, values in ranges:
+            size = len(values) * width
+            if batch and cells + size > self.max_cells:
+                yield batch
+                batch, cells = [], 0
+            end = start + len(values) - 1
+            batch.append({"range": f"{rowcol_to_a1(start, 1)}:{rowcol_to_a1(end, width)}", "values": values})
+            cells += size
+        if batch:
+            yield batch
+
+    def write(self, worksheet, rows):
+        """
+        Make the worksheet hold exactly `rows`, sending only the rows that differ.
+        Returns a dict with the number of changed rows and batch_update requests.
+        """
+        width = max((len(row) for row in rows), default=1)
+        current = self.call(worksheet.get_all_values)
+
+        if len(rows) > worksheet.row_count or width > worksheet.col_count:
+            self.call(worksheet.resize, rows=max(len(rows), worksheet.row_count),
+                      cols=max(width, worksheet.col_count))
+
+        # Split long runs so no single range exceeds the batch size
+        step = max(1, self.max_cells // width)
+        ranges = [
+            (start + offset, values[offset:offset + step])
+            for start, values in diff_ranges(current, rows, width)
+            for offset in range(0, len(values), step)
+        ]
+        requests = 0
+        for batch in self.batches(ranges, width):
+            metrics.count("sheets_bytes", len(json.dumps(batch, default=str)))
+            self.call(worksheet.batch_update, batch)
+            requests += 1
+
+        if len(current) > len(rows):
+            # Drop stale trailing rows instead of blanking them cell by cell
+            self.call(worksheet.resize, rows=max(len(rows), 1))
+
+        return {"changed_rows": sum(len(values) for _, values in ranges), "requests": requests}
+
+    def append(self, worksheet, rows):
+        width = max((len(row) for row in rows), default=1)
+        step = max(1, self.max_cells // width)
+        for offset in range(0, len(rows), step):
+            chunk = rows[offset:offset + step]
+            metrics.count("sheets_bytes", len(json.dumps(chunk, default=str)))
+            self.call(worksheet.append_rows, chunk)
@@ -0,0 +1,90 @@
+# spot_fetcher.py
+# Concurrent spot price requests over one pooled keep-alive session.
+#
+# Every metal/currency pair is requested in parallel on a bounded thread pool,
+# so fetching XAU, XAG, XPT and XPD costs about one round-trip instead of four.
+# Connect/read timeouts are explicit and transient failures (connection errors,
+# 429, 5xx) are retried with exponential backoff by urllib3.
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+METALS = {"XAU": "gold", "XAG": "silver", "XPT": "platinum", "XPD": "palladium"}
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+POOL_SIZE = 8
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+class CountingRetry(Retry):
+    """urllib3 Retry that records each retry in the metrics registry."""
+
+    def increment(self, *args, **kwargs):
+        response = kwargs.get("response")
+        metrics.count("goldapi_retries", status=getattr(response, "status", "error"))
+        return super().increment(*args, **kwargs)
+
+
+def make_session(headers, pool_size=POOL_SIZE, retries=MAX_RETRIES, backoff=BACKOFF_FACTOR):
+    session = requests.Session()
+    session.headers.update(headers)
+    retry = CountingRetry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRYABLE_STATUS,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class SpotFetcher:
+    def __init__(self, base_url, headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 pool_size=POOL_SIZE, retries=MAX_RETRIES, backoff=BACKOFF_FACTOR):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = make_session(headers, pool_size, retries, backoff)
+        self.pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="spot")
+
+    def price(self, metal, currency="USD"):
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/{metal}/{currency}", timeout=self.timeout)
+        except requests.exceptions.RetryError as e:
+            raise Exception(f"GoldAPI gave up on {metal}/{currency} after retries: {e}")
+        finally:
+            metrics.observe("goldapi_request_seconds", time.perf_counter() - start, metal=metal)
+        metrics.count("goldapi_requests", metal=metal, status=response.status_code)
+        metrics.count("goldapi_bytes", len(response.content))
+        if response.status_code != 200:
+            raise Exception(f"GoldAPI error {response.status_code}: {response.text}")
+        return response.json()["price"]
+
+    def fetch(self, metals=("XAU", "XAG"), currencies=("USD",)):
+        """{(metal, currency): price} for every pair, requested concurrently."""
+        pairs = [(metal, currency) for metal in metals for currency in currencies]
+        if len(pairs) == 1:
+            return {pairs[0]: self.price(*pairs[0])}
+        futures = {pair: self.pool.submit(self.price, *pair) for pair in pairs}
+        return {pair: future.result() for pair, future in futures.items()}
+
+    def fetch_named(self, metals=("XAU", "XAG"), currency="USD"):
+        """{"gold": ..., "silver": ...} for the requested metals in one currency."""
+        prices = self.fetch(metals, (currency,))
+        return {METALS.get(metal, metal.lower()): prices[(metal, currency)] for metal in metals}
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,201 @@
+# spot_history.py
+# Append-only spot price history in SQLite, replacing the rewrite-everything
+# .cache/spot.json list.
+#
+# Ticks are keyed by UTC epoch seconds in a WITHOUT ROWID table, so appends and
+# latest() are single B-tree operations and range queries seek straight to the
+# first timestamp instead of scanning. The old JSON history is imported the first
+# time the store is opened.
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+HISTORY_PATH = ".cache/spot_history.db"
+LEGACY_JSON_PATH = ".cache/spot.json"
+METALS = ["gold", "silver", "platinum", "palladium"]
+INTERVALS = {"minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticks (
+    ts        REAL PRIMARY KEY,
+    gold      REAL,
+    silver    REAL,
+    platinum  REAL,
+    palladium REAL
+) WITHOUT ROWID;
+"""
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def to_epoch(value):
+    """Epoch seconds from an ISO string, datetime or number. Naive times are UTC."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def to_iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class SpotHistory:
+    def __init__(self, path=HISTORY_PATH, legacy_json=LEGACY_JSON_PATH, auto_migrate=True):
+        self.path = path
+        self.legacy_json = legacy_json
+        self.auto_migrate = auto_migrate
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            needs_migration = (self.auto_migrate and not os.path.exists(self.path)
+                               and self.legacy_json and os.path.exists(self.legacy_json))
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            if needs_migration:
+                count = self.import_json(self.legacy_json)
+                print(f"📦 Migrated {count} spot prices from {self.legacy_json} to {self.path}.")
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def import_json(self, json_path):
+        with open(json_path) as f:
+            history = json.load(f)
+        rows = [
+            (to_epoch(entry["timestamp"]), *(entry.get(metal) for metal in METALS))
+            for entry in history
+            if entry.get("timestamp")
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO ticks VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def append(self, prices, timestamp=None):
+        """Record one tick; prices maps metal name -> price."""
+        ts = to_epoch(timestamp) if timestamp is not None else datetime.now(timezone.utc).timestamp()
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO ticks VALUES (?, ?, ?, ?, ?)",
+                              (ts, *(prices.get(metal) for metal in METALS)))
+        return ts
+
+    @staticmethod
+    def _entry(row):
+        entry = {"timestamp": to_iso(row[0])}
+        entry.update({metal: value for metal, value in zip(METALS, row[1:]) if value is not None})
+        return entry
+
+    def latest(self):
+        row = self.conn.execute("SELECT * FROM ticks ORDER BY ts DESC LIMIT 1").fetchone()
+        return None if row is None else self._entry(row)
+
+    def range(self, start=None, end=None, last=None):
+        """Ticks with start <= timestamp < end, oldest first; last=N keeps only the newest N."""
+        params = [to_epoch(start) if start is not None else float("-inf"),
+                  to_epoch(end) if end is not None else float("inf")]
+        if last:
+            sql = "SELECT * FROM ticks WHERE ts >= ? AND ts < ? ORDER BY ts DESC LIMIT ?"
+            rows = self.conn.execute(sql, params + [last]).fetchall()[::-1]
+        else:
+            rows = self.conn.execute("SELECT * FROM ticks WHERE ts >= ? AND ts < ? ORDER BY ts", params)
+        return [self._entry(row) for row in rows]
+
+    def columns(self, metals=("gold", "silver"), start=None, end=None):
+        """Raw (ts, *metals) tuples, oldest first, skipping ticks missing any of the metals."""
+        for metal in metals:
+            if metal not in METALS:
+                raise ValueError(f"❌ Unknown metal '{metal}'.")
+        present = " AND ".join(f"{metal} IS NOT NULL" for metal in metals)
+        sql = f"SELECT ts, {', '.join(metals)} FROM ticks WHERE ts >= ? AND ts < ? AND {present} ORDER BY ts"
+        params = (to_epoch(start) if start is not None else float("-inf"),
+                  to_epoch(end) if end is not None else float("inf"))
+        return self.conn.execute(sql, params).fetchall()
+
+    def bars(self, interval="day", start=None, end=None, last=None, metals=("gold", "silver")):
+        """
+        Downsample to OHLC bars per metal: one dict per bucket with open, high,
+        low, close and tick count. Buckets align to UTC multiples of the interval;
+        last=N returns only the newest N buckets.
+        """
+        seconds = INTERVALS[interval]
+        start = to_epoch(start) if start is not None else float("-inf")
+        end = to_epoch(end) if end is not None else float("inf")
+        if last:
+            row = self.conn.execute("SELECT MAX(ts) FROM ticks WHERE ts < ?", (end,)).fetchone()
+            if row[0] is not None:
+                start = max(start, row[0] - row[0] % seconds - (last - 1) * seconds)
+        columns = ", ".join(metals)
+        sql = f"SELECT ts, {columns} FROM ticks WHERE ts >= ? AND ts < ? ORDER BY ts"
+
+        bars = []
+        current = None
+        bucket = None
+        for ts, *values in self.conn.execute(sql, (start, end)):
+            if current is None or ts - ts % seconds != bucket:
+                bucket = ts - ts % seconds
+                current = {"timestamp": to_iso(bucket), "ticks": 0, **{metal: None for metal in metals}}
+                bars.append(current)
+            current["ticks"] += 1
+            for metal, value in zip(metals, values):
+                if value is None:
+                    continue
+                bar = current[metal]
+                if bar is None:
+                    current[metal] = {"open": value, "high": value, "low": value, "close": value}
+                else:
+                    bar["high"] = max(bar["high"], value)
+                    bar["low"] = min(bar["low"], value)
+                    bar["close"] = value
+        return bars
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+
+    def stamp(self):
+        """(tick count, newest ts); changes whenever any process adds or removes ticks."""
+        return tuple(self.conn.execute("SELECT COUNT(*), MAX(ts) FROM ticks").fetchone())
+
+
+def get_history(path=HISTORY_PATH):
+    """Process-wide store per path."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SpotHistory(path)
+        return _stores[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the spot price history store")
+    subparsers = parser.add_subparsers(dest="command")
+
+    migrate = subparsers.add_parser("migrate", help="Import a spot.json history list into the store")
+    migrate.add_argument("--json", default=LEGACY_JSON_PATH)
+    migrate.add_argument("--db", default=HISTORY_PATH)
+
+    args = parser.parse_args()
+    if args.command == "migrate":
+        store = SpotHistory(args.db, auto_migrate=False)
+        count = store.import_json(args.json)
+        print(f"✅ Imported {count} spot prices into {args.db} ({store.count()} total).")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
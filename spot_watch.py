@@ -0,0 +1,311 @@
+# spot_watch.py
+# Long-running spot price watcher behind `gold_api.py --watch`.
+#
+# Each tick fetches gold and silver, appends them to the spot history and checks
+# for moves bigger than notify_threshold_pct (a fraction, like premium_pct) in
+# gold, silver and the gold/silver ratio. Moves are measured against the value
+# at the previous alert, so one move fires once. Each key also has a cooldown.
+# The poll interval stretches to fit the monthly request quota. The quota count,
+# alert references and last GSR signal live in a small state file, so a restart
+# neither re-fires alerts nor overspends the quota. Memory stays flat: the only
+# growing data is on disk, and the GSR window is bounded by its day count.
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+from colorama import Fore
+
+import metrics
+from gsr_stats import RollingGSR
+from spot_history import get_history, to_iso
+
+WATCH_STATE_FILE = ".cache/watch_state.json"
+ALERT_FILE = ".cache/alerts.jsonl"
+REQUESTS_PER_TICK = 2  # XAU + XAG
+MAX_BACKOFF_SECONDS = 3600
+NOTIFY_CHANNELS = ("stdout", "file", "webhook")
+WEBHOOK_TIMEOUT = 5
+
+DEFAULT_SETTINGS = {
+    "notify_threshold_pct": 0.05,
+    "track_gold_silver_ratio": True,
+    "min_interval_seconds": 300,
+    "monthly_quota": 100,
+    "cooldown_seconds": 3600,
+    "notify": ["stdout"],
+    "alert_file": ALERT_FILE,
+    "webhook_url": None,
+    "gsr_window_days": 90,
+    "gsr_low_percentile": 10,
+    "gsr_high_percentile": 90,
+    "gsr_min_samples": 20,
+}
+
+
+def watch_settings(config, **overrides):
+    """Merge user_config.json (top-level notify keys plus the "watch" block) with CLI overrides."""
+    settings = dict(DEFAULT_SETTINGS)
+    for key in ("notify_threshold_pct", "track_gold_silver_ratio"):
+        if key in config:
+            settings[key] = config[key]
+    settings.update(config.get("watch", {}))
+    for key, value in config.get("gsr_stats", {}).items():
+        settings[f"gsr_{key}"] = value
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+
+    if isinstance(settings["notify"], str):
+        settings["notify"] = settings["notify"].split(",")
+    unknown = set(settings["notify"]) - set(NOTIFY_CHANNELS)
+    if unknown:
+        raise ValueError(f"❌ Unknown notify channel(s): {', '.join(sorted(unknown))}. Use {', '.join(NOTIFY_CHANNELS)}.")
+    if "webhook" in settings["notify"] and not settings["webhook_url"]:
+        raise ValueError("❌ notify=webhook needs a webhook_url.")
+    if settings["notify_threshold_pct"] <= 0:
+        raise ValueError("❌ notify_threshold_pct must be positive.")
+    return settings
+
+
+def load_state(path=WATCH_STATE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state, path=WATCH_STATE_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def month_window(now):
+    """("YYYY-MM", epoch of the next month's first second) for a UTC timestamp."""
+    moment = datetime.fromtimestamp(now, timezone.utc)
+    if moment.month == 12:
+        next_month = moment.replace(year=moment.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month = moment.replace(month=moment.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return moment.strftime("%Y-%m"), next_month.timestamp()
+
+
+class QuotaSchedule:
+    """
+    Spreads the remaining monthly requests evenly over the rest of the month,
+    never polling faster than min_interval. monthly_quota=0 means unlimited.
+    """
+
+    def __init__(self, state, monthly_quota, min_interval, per_tick=REQUESTS_PER_TICK):
+        self.state = state
+        self.monthly_quota = monthly_quota
+        self.min_interval = min_interval
+        self.per_tick = per_tick
+        self.failures = 0
+
+    def _usage(self, now):
+        month, month_end = month_window(now)
+        if self.state.get("month") != month:
+            self.state.update({"month": month, "used": 0})
+        return self.state["used"], month_end
+
+    def interval(self, now):
+        used, month_end = self._usage(now)
+        if not self.monthly_quota:
+            return self.min_interval
+        ticks_left = (self.monthly_quota - used) // self.per_tick
+        if ticks_left <= 0:
+            return None
+        return max(self.min_interval, (month_end - now) / ticks_left)
+
+    def wait_time(self, now):
+        """Seconds until the next tick may run."""
+        interval = self.interval(now)
+        if interval is None:
+            return month_window(now)[1] - now + 1  # quota spent: sleep into next month
+        if self.failures:
+            # Back off from the quota interval, never below it: failed ticks spend quota too
+            interval = max(interval, min(self.min_interval * 2 ** self.failures, MAX_BACKOFF_SECONDS))
+        last_tick = self.state.get("last_tick")
+        return 0 if last_tick is None else max(0.0, last_tick + interval - now)
+
+    def record(self, now, ok):
+        """Count a tick's per_tick requests. The fetcher must not retry underneath (see gold_api.run_watch)."""
+        self._usage(now)
+        self.state["used"] += self.per_tick
+        self.state["last_tick"] = now
+        self.failures = 0 if ok else self.failures + 1
+
+
+class AlertTracker:
+    """
+    Fires a move alert when a value has moved threshold (fraction) away from
+    its value at the previous alert for that key, then re-anchors. Alerts for
+    the same key and direction are also held back for cooldown seconds.
+    """
+
+    def __init__(self, state, threshold, cooldown):
+        self.references = state.setdefault("references", {})
+        self.last_alert = state.setdefault("last_alert", {})
+        self.state = state
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+    def _cooled_down(self, key, now):
+        return now - self.last_alert.get(key, float("-inf")) >= self.cooldown
+
+    def check_move(self, key, value, now):
+        reference = self.references.get(key)
+        if reference is None:
+            self.references[key] = value
+            return None
+        change = (value - reference) / reference if reference else 0.0
+        if abs(change) < self.threshold:
+            return None
+        direction = "up" if change > 0 else "down"
+        alert_key = f"{key}:{direction}"
+        if not self._cooled_down(alert_key, now):
+            metrics.count("watch_alerts_suppressed", key=key)
+            return None
+        self.references[key] = value
+        self.last_alert[alert_key] = now
+        return {"kind": "move", "key": key, "direction": direction, "from": reference,
+                "to": value, "change_pct": round(change * 100, 3)}
+
+    def check_signal(self, signal_name, gsr, now):
+        """Alert when the GSR percentile signal enters silver_to_gold / gold_to_silver."""
+        previous = self.state.get("gsr_signal")
+        if signal_name is None or signal_name == previous:
+            return None
+        self.state["gsr_signal"] = signal_name
+        if signal_name == "hold" or not self._cooled_down(f"signal:{signal_name}", now):
+            return None
+        self.last_alert[f"signal:{signal_name}"] = now
+        return {"kind": "gsr_signal", "key": "gsr", "signal": signal_name, "gsr": gsr, "previous": previous}
+
+
+def describe(alert):
+    if alert["kind"] == "move":
+        arrow = "↑" if alert["direction"] == "up" else "↓"
+        return (f"{alert['key'].upper()} {arrow} {abs(alert['change_pct']):.2f}% "
+                f"({alert['from']:.2f} → {alert['to']:.2f})")
+    advice = "trade silver for gold" if alert["signal"] == "silver_to_gold" else "trade gold for silver"
+    return f"GSR {alert['gsr']:.2f} crossed its percentile band: consider to {advice}"
+
+
+class Notifier:
+    def __init__(self, channels, alert_file=ALERT_FILE, webhook_url=None, timeout=WEBHOOK_TIMEOUT):
+        self.channels = list(channels)
+        self.alert_file = alert_file
+        self.webhook_url = webhook_url
+        self.timeout = timeout
+        self.session = requests.Session() if "webhook" in self.channels else None
+
+    def send(self, alert):
+        metrics.count("watch_alerts", kind=alert["kind"], key=alert["key"])
+        if "stdout" in self.channels:
+            print(Fore.MAGENTA + f"🔔 {alert['timestamp'][:19]}  {describe(alert)}", flush=True)
+        if "file" in self.channels:
+            os.makedirs(os.path.dirname(self.alert_file) or ".", exist_ok=True)
+            with open(self.alert_file, "a") as f:
+                f.write(json.dumps(alert) + "\n")
+        if "webhook" in self.channels:
+            try:
+                response = self.session.post(self.webhook_url, json={**alert, "text": describe(alert)},
+                                             timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                metrics.count("watch_webhook_errors")
+                print(Fore.RED + f"⚠️  Webhook delivery failed: {e}", file=sys.stderr)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+def format_delay(seconds):
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds:.1f}s" if seconds < 10 else f"{seconds:.0f}s"
+
+
+def watch(fetch, settings, history=None, state_path=WATCH_STATE_FILE, stop=None,
+          max_ticks=None, clock=time.time):
+    """
+    Poll fetch() (-> {"gold": ..., "silver": ...}) until stopped or max_ticks
+    successful ticks. Returns the number of ticks taken.
+    """
+    history = history or get_history()
+    stop = stop or threading.Event()
+    state = load_state(state_path)
+    schedule = QuotaSchedule(state.setdefault("quota", {}), settings["monthly_quota"],
+                             settings["min_interval_seconds"])
+    alerts = AlertTracker(state, settings["notify_threshold_pct"], settings["cooldown_seconds"])
+    notifier = Notifier(settings["notify"], settings["alert_file"], settings["webhook_url"])
+    engine = None
+    if settings["track_gold_silver_ratio"]:
+        engine = RollingGSR.from_history(history, settings["gsr_window_days"], now=clock())
+
+    first_wait = schedule.wait_time(clock())
+    if first_wait > 0 and "stdout" in settings["notify"]:
+        print(f"💤 Polled recently; next poll in {format_delay(first_wait)} to stay within quota.", flush=True)
+
+    ticks = 0
+    try:
+        while max_ticks is None or ticks < max_ticks:
+            if stop.wait(schedule.wait_time(clock())):
+                break
+            now = clock()
+            try:
+                with metrics.timer("watch_fetch"):
+                    prices = fetch()
+            except Exception as e:
+                schedule.record(now, ok=False)
+                save_state(state, state_path)
+                metrics.count("watch_errors")
+                print(Fore.RED + f"⚠️  Fetch failed ({e}); retrying in "
+                      f"{format_delay(schedule.wait_time(clock()))}", file=sys.stderr, flush=True)
+                continue
+
+            schedule.record(now, ok=True)
+            ticks += 1
+            metrics.count("watch_ticks")
+            gold, silver = prices["gold"], prices["silver"]
+            history.append({"gold": gold, "silver": silver}, timestamp=now)
+
+            fired = [alerts.check_move("gold", gold, now), alerts.check_move("silver", silver, now)]
+            gsr = gold / silver
+            if engine is not None:
+                engine.push(now, gsr)
+                fired.append(alerts.check_move("gsr", gsr, now))
+                signal_name = engine.signal(gsr, settings["gsr_low_percentile"], settings["gsr_high_percentile"],
+                                            settings["gsr_min_samples"])
+                fired.append(alerts.check_signal(signal_name, gsr, now))
+            for alert in filter(None, fired):
+                alert["timestamp"] = to_iso(now)
+                notifier.send(alert)
+            save_state(state, state_path)
+
+            if "stdout" in settings["notify"]:
+                print(f"⏱️  {to_iso(now)[:19]}  Gold ${gold:.2f}  Silver ${silver:.2f}  GSR {gsr:.2f}"
+                      f"  (next in {format_delay(schedule.wait_time(clock()))})", flush=True)
+    finally:
+        notifier.close()
+    return ticks
+
+
+def install_stop_handlers(stop):
+    """SIGTERM/SIGINT end the loop after the current tick instead of mid-write."""
+    def handler(signum, frame):
+        stop.set()
+    signal.signal(signal.SIGTERM, handler)
+    signal.signal(signal.SIGINT, handler)
@@ -0,0 +1,27 @@
+import json
+import os
+
+import pytest
+
+from coin_index import CoinIndex
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "coin_spec.json")
+
+
+@pytest.fixture(scope="module")
+def index():
+    with open(SPEC_PATH) as f:
+        return CoinIndex.build(json.load(f))
+
+
+def test_metal_word_matches_every_coin_of_that_metal(index):
+    silver = index.match("silver")
+    assert "peace_dollar" in silver
+    assert "morgan_dollar" in silver
+    assert silver == index.match("all silver")
+
+
+def test_nickname_and_prefix_still_resolve_to_one_coin(index):
+    assert index.resolve("ASE") == "american_silver_eagle_1oz"
+    assert index.resolve("silver eagle") == "american_silver_eagle_1oz"
+    assert index.resolve("morgan") == "morgan_dollar"
@@ -0,0 +1,32 @@
+import time
+
+import spot_history
+from coin_service import CoinService
+
+SETTINGS = {"window_days": 90}
+
+
+def test_gsr_window_follows_ticks_other_tools_add(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(spot_history, "_stores", {})
+    history = spot_history.get_history()
+    now = time.time()
+    for i in range(3):
+        history.append({"gold": 2000.0 + i, "silver": 25.0}, timestamp=now - 3600 * (3 - i))
+
+    service = CoinService(socket_path=str(tmp_path / "coin_service.sock"))
+    engine = service.gsr_engine(SETTINGS)
+    assert engine.count == 3
+    assert service.gsr_engine(SETTINGS) is engine and service.engine_rebuilds == 1
+
+    # gsr.py or the watcher records a newer tick: pushed into the same window
+    history.append({"gold": 2100.0, "silver": 25.0}, timestamp=now - 60)
+    assert service.gsr_engine(SETTINGS) is engine
+    assert engine.count == 4 and engine.ticks[-1][1] == 2100.0 / 25.0
+    assert service.engine_rebuilds == 1
+
+    # An older tick imported into the store: the window is reloaded
+    history.append({"gold": 1900.0, "silver": 25.0}, timestamp=now - 86400)
+    engine = service.gsr_engine(SETTINGS)
+    assert engine.count == 5 and service.engine_rebuilds == 2
+    history.close()
@@ -0,0 +1,37 @@
+import math
+
+import pytest
+
+from gsr_stats import RollingGSR, backfill
+from spot_history import SpotHistory
+
+DAY = 86400
+T0 = 1_700_000_000.0
+# Irregular ticks over three one-day windows; T0 + DAY lands exactly on the
+# first tick's cutoff, which both sides treat as outside the window.
+OFFSETS = [0, 600, 4000, 20000, 50000, 80000, DAY, DAY + 30, DAY + 7200, 1.6 * DAY, 2.5 * DAY, 2.5 * DAY + 1, 3.4 * DAY]
+
+
+def as_float(value):
+    return math.nan if value is None else value
+
+
+def test_push_matches_backfill_tick_by_tick(tmp_path):
+    history = SpotHistory(str(tmp_path / "spot_history.db"), legacy_json=None)
+    ticks = []
+    for i, offset in enumerate(OFFSETS):
+        gold, silver = 2000 + 37 * ((i * 7) % 11), 25 + 0.13 * i  # distinct, unordered ratios
+        ticks.append((T0 + offset, gold / silver))
+        history.append({"gold": gold, "silver": silver}, timestamp=T0 + offset)
+
+    frame = backfill(history, window_days=1, legacy_path=None, output=None)
+    engine = RollingGSR(window_days=1)
+    for (ts, gsr), (_, row) in zip(ticks, frame.iterrows()):
+        snapshot = engine.push(ts, gsr)
+        assert snapshot["samples"] == row["samples"]
+        for key in ("gsr", "mean", "std", "zscore", "rank_pct", "p10", "p90"):
+            assert as_float(snapshot[key]) == pytest.approx(row[key], rel=1e-9, nan_ok=True), (ts - T0, key)
+    history.close()
+
+    assert len(frame) == len(OFFSETS)
+    assert frame["samples"].iloc[OFFSETS.index(DAY)] == OFFSETS.index(DAY)  # the first tick was evicted
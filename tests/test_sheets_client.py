@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from sheets_client import SheetsSession, authorize
+
+# cryptography only generates a throwaway service-account key; it is not a runtime dependency
+serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+
+@pytest.fixture
+def keyfile(tmp_path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    path = tmp_path / "credentials.json"
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "budget-test",
+        "private_key_id": "0" * 40,
+        "private_key": pem,
+        "client_email": "budget@budget-test.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+    return str(path)
+
+
+def test_token_cache_round_trip_with_real_credentials(keyfile, tmp_path):
+    token_cache = str(tmp_path / "cache" / "sheets_token.json")
+    first = SheetsSession(keyfile, "Budget", token_cache=token_cache, client_factory=authorize)
+    first.client
+    assert first.auth is not None and not first.auth.valid
+
+    # What a refresh during client.open() leaves on the credentials
+    first.auth.token = "ya29.cached"
+    first.auth.expiry = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=30)
+    first.save_token()
+    with open(token_cache) as f:
+        assert json.load(f)["account"] == "budget@budget-test.iam.gserviceaccount.com"
+
+    second = SheetsSession(keyfile, "Budget", token_cache=token_cache, client_factory=authorize)
+    second.client
+    assert second.auth.token == "ya29.cached"
+    assert second.auth.expiry == first.auth.expiry
+    assert second.auth.valid  # no OAuth handshake needed before the first request
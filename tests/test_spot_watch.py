@@ -0,0 +1,14 @@
+from spot_watch import QuotaSchedule, month_window
+
+
+def test_failure_backoff_never_polls_faster_than_the_quota_interval():
+    now = month_window(0)[1] + 3600  # an hour into a month
+    schedule = QuotaSchedule({}, monthly_quota=100, min_interval=60)
+    quota_interval = schedule.interval(now)
+    assert quota_interval > 60
+
+    schedule.record(now, ok=False)
+    assert schedule.wait_time(now) >= quota_interval
+    for _ in range(20):
+        schedule.record(now, ok=False)
+    assert schedule.wait_time(now) >= quota_interval
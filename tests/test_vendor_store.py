@@ -0,0 +1,18 @@
+from vendor_store import VendorStore
+
+
+def test_moving_a_vendor_between_sections_keeps_its_sample(tmp_path):
+    store = VendorStore(str(tmp_path / "vendor_map.json"))
+    sample = {"Date": "03/01/2025", "Description": "NETFLIX.COM", "Amount": -15.49}
+    store.load()
+    store.save({"spending": {"Netflix": {"Category": "Entertainment", "Sample": sample}}, "recurring": {}})
+
+    vendor_map = store.load()  # without samples, as budget_edit and budget_parse load it
+    vendor_map["recurring"]["Netflix"] = vendor_map["spending"].pop("Netflix")
+    vendor_map["recurring"]["Netflix"]["Category"] = "Subscriptions"
+    assert store.save(vendor_map) == 1
+
+    saved = store.load(with_samples=True)
+    assert saved["spending"] == {}
+    assert saved["recurring"]["Netflix"] == {"Category": "Subscriptions", "Sample": sample}
+    store.close()
@@ -0,0 +1,55 @@
+# toolkit.py
+# Single entry point for the budget and bullion tools:
+#
+#   python toolkit.py spot --from-cache
+#   python toolkit.py value --coin american_silver_eagle_1oz --price 38
+#   python toolkit.py inventory list
+#
+# Each subcommand is the matching script's main(), imported only when that
+# subcommand runs, so `spot` never loads pandas and `--help` loads nothing.
+# Every module is importable as a library without touching files or argv.
+
+import importlib
+import sys
+
+# name -> (module, description)
+COMMANDS = {
+    "parse": ("budget_parse", "Parse budget CSVs and update the Google Sheet"),
+    "edit": ("budget_edit", "Review and edit vendor categories"),
+    "report": ("budget_report", "Budget reports from the pre-aggregated cube"),
+    "recurring": ("budget_recurring", "Detect recurring charges"),
+    "spot": ("gold_api", "Fetch, cache and watch gold/silver spot prices"),
+    "value": ("coin_valuation", "Evaluate coin melt value and premiums"),
+    "inventory": ("coin_inventory", "Manage coin inventory"),
+    "coins": ("coin_index", "Look up coins by name, nickname or attributes"),
+    "gsr": ("gsr", "Gold/silver ratio alerts and rolling statistics"),
+    "serve": ("coin_service", "Warm local service for repeated coin queries"),
+    "client": ("coin_client", "Query the warm coin service"),
+}
+
+
+def usage():
+    lines = ["usage: toolkit.py <command> [options]", "", "commands:"]
+    lines += [f"  {name:<11} {description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "Run `toolkit.py <command> --help` for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"❌ Unknown command '{name}'.\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(COMMANDS[name][0])
+    # argparse names the program after argv[0]; make usage lines read `toolkit.py spot ...`
+    sys.argv = [f"toolkit.py {name}"] + rest
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
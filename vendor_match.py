@@ -0,0 +1,169 @@
+# vendor_match.py
+# Resolve raw bank vendor strings ("STARBUCKS STORE 1123 SEATTLE WA",
+# "Patreon* Membership") to vendors already in the vendor map.
+#
+# Names are reduced to a normalized key for exact and token-prefix matches;
+# near-duplicates are found through a trigram index with prefix filtering, so
+# only candidates that share one of the query's rarest trigrams are ever scored.
+
+import argparse
+import hashlib
+import math
+import os
+import pickle
+import re
+from collections import defaultdict
+
+import vendor_store
+
+INDEX_CACHE_PATH = ".cache/vendor_index.pkl"
+MATCH_THRESHOLD = 0.8
+MIN_PREFIX_CHARS = 6
+
+PROCESSOR_PREFIX = re.compile(r"^(SQ|TST|SP|PP|PAYPAL|PY|IC|DD|DOORDASH|GOOGLE|APPLE\.COM/BILL)\s*\*\s*")
+STORE_NUMBER = re.compile(r"#\s*\d+|\b[A-Z]*-?\d{3,}[A-Z\d-]*\b")
+NON_ALNUM = re.compile(r"[^A-Z0-9&' ]+")
+NOISE_TOKENS = {"INC", "LLC", "CO", "COM", "CORP", "LTD", "THE", "WWW", "USA", "US", "STORE", "STORES"}
+STATE_CODES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA",
+    "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM",
+    "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA",
+    "WV", "WI", "WY",
+}
+
+
+def normalize_vendor(name):
+    """
+    Reduce a raw vendor string to a comparison key: upper-case, payment
+    processor prefixes, store numbers, trailing state codes and corporate
+    noise words removed.
+    """
+    raw = str(name).upper().strip()
+    text = PROCESSOR_PREFIX.sub("", raw)
+    text = STORE_NUMBER.sub(" ", text)
+    tokens = NON_ALNUM.sub(" ", text).split()
+    if len(tokens) > 1 and tokens[-1] in STATE_CODES:
+        tokens.pop()
+    tokens = [t for t in tokens if t not in NOISE_TOKENS]
+    return " ".join(tokens) or " ".join(raw.split())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def vendor_signature(vendor_map):
+    digest = hashlib.blake2b(digest_size=16)
+    for section in sorted(vendor_map):
+        for name in sorted(vendor_map[section]):
+            digest.update(f"{section}\x1f{name}\x1e".encode())
+    return digest.hexdigest()
+
+
+class VendorMatcher:
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.entries = []
+        self.keys = []
+        self.by_key = {}
+        self.postings = defaultdict(list)
+
+    @classmethod
+    def build(cls, vendor_map, threshold=MATCH_THRESHOLD):
+        matcher = cls(threshold)
+        for section, vendors in vendor_map.items():
+            for name in vendors:
+                matcher.add(section, name)
+        return matcher
+
+    def add(self, section, name):
+        key = normalize_vendor(name)
+        if (section, key) in self.by_key:
+            return
+        entry_id = len(self.entries)
+        self.entries.append((section, name))
+        self.keys.append(key)
+        self.by_key[(section, key)] = name
+        for gram in trigrams(key):
+            self.postings[gram].append(entry_id)
+
+    def resolve(self, name, section):
+        """Return the known vendor name that `name` refers to, or None."""
+        key = normalize_vendor(name)
+        exact = self.by_key.get((section, key))
+        if exact is not None:
+            return exact
+
+        # A known key followed by extra tokens is usually a location suffix:
+        # "SHELL OIL AUSTIN" -> "SHELL OIL"
+        tokens = key.split()
+        for end in range(len(tokens) - 1, 0, -1):
+            prefix = " ".join(tokens[:end])
+            if len(prefix) < MIN_PREFIX_CHARS:
+                break
+            if (section, prefix) in self.by_key:
+                return self.by_key[(section, prefix)]
+
+        query = trigrams(key)
+        # Dice >= t needs at least ceil(t*|q| / (2-t)) shared trigrams, so a
+        # match must contain one of the |q| - min_shared + 1 rarest ones.
+        min_shared = math.ceil(self.threshold * len(query) / (2 - self.threshold))
+        rare_first = sorted(query, key=lambda g: len(self.postings.get(g, ())))
+        candidates = set()
+        for gram in rare_first[:len(query) - min_shared + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        best, best_score = None, self.threshold
+        for entry_id in candidates:
+            entry_section, entry_name = self.entries[entry_id]
+            if entry_section != section:
+                continue
+            # Candidates are few after prefix filtering, so recompute their trigrams
+            # rather than keeping (and pickling) a set per vendor
+            grams = trigrams(self.keys[entry_id])
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            if score >= best_score:
+                best, best_score = entry_name, score
+        return best
+
+
+def load_matcher(vendor_map, path=INDEX_CACHE_PATH, threshold=MATCH_THRESHOLD):
+    """
+    Load the index from disk when it was built for exactly these vendors,
+    otherwise rebuild it and refresh the cache.
+    """
+    signature = vendor_signature(vendor_map)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                cached_signature, cached_threshold, matcher = pickle.load(f)
+            if cached_signature == signature and cached_threshold == threshold:
+                return matcher
+        except Exception:
+            pass
+
+    matcher = VendorMatcher.build(vendor_map, threshold)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((signature, threshold, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return matcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve raw vendor names against the vendor store")
+    parser.add_argument("names", nargs="+", help="Raw vendor strings to look up")
+    parser.add_argument("--section", choices=vendor_store.SECTIONS, default="spending")
+    parser.add_argument("--map", default=vendor_store.MAP_PATH)
+    args = parser.parse_args()
+
+    matcher = load_matcher(vendor_store.load_vendor_map(args.map))
+    for name in args.names:
+        match = matcher.resolve(name, args.section)
+        print(f"{name:<40} [{normalize_vendor(name)}] → {match or '(new vendor)'}")
+
+
+if __name__ == "__main__":
+    main()
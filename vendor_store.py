@@ -0,0 +1,244 @@
+# vendor_store.py
+# SQLite-backed vendor map shared by budget_parse.py and budget_edit.py.
+#
+# Callers keep working with the familiar {"recurring": {...}, "spending": {...}}
+# dict; the store tracks what it loaded and only writes new, changed or removed
+# vendors back, in a single transaction.
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+MAP_PATH = "vendor_map.json"
+SECTIONS = ["recurring", "spending"]
+STORE_SAMPLES = os.getenv("VENDOR_STORE_SAMPLES", "1") != "0"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vendors (
+    section  TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    category TEXT NOT NULL,
+    sample   TEXT,
+    PRIMARY KEY (section, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS vendors_by_name ON vendors (name);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+"""
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def db_path_for(path):
+    """vendor_map.json and vendor_map-03-2025.json map to matching .db files."""
+    return os.path.splitext(path)[0] + ".db"
+
+
+def json_path_for(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def entry_category(entry):
+    if isinstance(entry, dict):
+        return entry.get("Category") or "Uncategorized"
+    return entry or "Uncategorized"
+
+
+def entry_sample(entry):
+    """Samples live under "Sample"; very old maps stored the sample row itself."""
+    if not isinstance(entry, dict):
+        return None
+    if "Sample" in entry:
+        return entry["Sample"]
+    if set(entry) - {"Category", "Type"}:
+        return entry
+    return None
+
+
+class VendorStore:
+    def __init__(self, path=MAP_PATH, store_samples=STORE_SAMPLES, auto_migrate=True):
+        self.db_path = db_path_for(path)
+        self.json_path = json_path_for(path)
+        self.store_samples = store_samples
+        self.auto_migrate = auto_migrate
+        self.snapshot = {}
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            needs_migration = (self.auto_migrate and not os.path.exists(self.db_path)
+                               and os.path.exists(self.json_path))
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.executescript(SCHEMA)
+            if needs_migration:
+                count = self.import_json(self.json_path)
+                print(f"📦 Migrated {count} vendors from {self.json_path} to {self.db_path}.")
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def import_json(self, json_path):
+        with open(json_path) as f:
+            vendor_map = json.load(f)
+        rows = [
+            (section, name, entry_category(entry), self.encode_sample(entry_sample(entry)))
+            for section in SECTIONS
+            for name, entry in vendor_map.get(section, {}).items()
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO vendors (section, name, category, sample) VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        return len(rows)
+
+    def encode_sample(self, sample):
+        if not self.store_samples or sample is None:
+            return None
+        return json.dumps(sample, separators=(",", ":"), default=str)
+
+    def load(self, with_samples=False):
+        """
+        Return the vendor map as a dict. Samples are only decoded when asked
+        for, since categorization and editing only need names and categories.
+        """
+        vendor_map = {section: {} for section in SECTIONS}
+        columns = "section, name, category, sample" if with_samples else "section, name, category, NULL"
+        for section, name, category, sample in self.conn.execute(f"SELECT {columns} FROM vendors"):
+            entry = {"Category": category}
+            if sample is not None:
+                entry["Sample"] = json.loads(sample)
+            vendor_map.setdefault(section, {})[name] = entry
+        self.snapshot = {
+            (section, name): entry["Category"]
+            for section, vendors in vendor_map.items()
+            for name, entry in vendors.items()
+        }
+        return vendor_map
+
+    def get(self, section, name):
+        row = self.conn.execute(
+            "SELECT category, sample FROM vendors WHERE section = ? AND name = ?", (section, name)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = {"Category": row[0]}
+        if row[1] is not None:
+            entry["Sample"] = json.loads(row[1])
+        return entry
+
+    def find(self, name):
+        """All sections a vendor name appears in, via the name index."""
+        return [section for (section,) in self.conn.execute("SELECT section FROM vendors WHERE name = ?", (name,))]
+
+    def save(self, vendor_map):
+        """
+        Upsert vendors that are new or whose category changed, move ones that
+        changed section and delete ones that disappeared since load(), all in
+        one transaction. Returns the number of rows written.
+        """
+        current = {}
+        upserts = []
+        for section, vendors in vendor_map.items():
+            for name, entry in vendors.items():
+                category = entry_category(entry)
+                current[(section, name)] = category
+                if self.snapshot.get((section, name)) != category:
+                    upserts.append((section, name, category, self.encode_sample(entry_sample(entry))))
+        # a vendor that changed section keeps its row, so the sample load()
+        # left out is not lost by deleting it and inserting a bare one
+        added = {name: section for section, name in current if (section, name) not in self.snapshot}
+        moves, deletes = [], []
+        for section, name in self.snapshot:
+            if (section, name) in current:
+                continue
+            if name in added:
+                moves.append((added.pop(name), section, name))
+            else:
+                deletes.append((section, name))
+
+        with self.conn:
+            self.conn.executemany("UPDATE vendors SET section = ? WHERE section = ? AND name = ?", moves)
+            self.conn.executemany(
+                "INSERT INTO vendors (section, name, category, sample) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (section, name) DO UPDATE SET category = excluded.category, "
+                "sample = COALESCE(excluded.sample, vendors.sample)",
+                upserts,
+            )
+            self.conn.executemany("DELETE FROM vendors WHERE section = ? AND name = ?", deletes)
+            if upserts or moves or deletes:
+                self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+        self.snapshot = current
+        return len(upserts) + len(deletes)
+
+    def version(self):
+        """Bumped by every save() that changes vendors; lets caches detect stale entries."""
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM vendors").fetchone()[0]
+
+    def export_json(self, json_path):
+        with open(json_path, "w") as f:
+            json.dump(self.load(with_samples=True), f, indent=2)
+
+
+def get_store(path=MAP_PATH):
+    """Process-wide store per vendor map path so load() and save() share a snapshot."""
+    db_path = db_path_for(path)
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = VendorStore(path)
+        return _stores[db_path]
+
+
+def load_vendor_map(path=MAP_PATH):
+    return get_store(path).load()
+
+
+def save_vendor_map(vendor_map, path=MAP_PATH):
+    """Persist changes and return (rows_written, total_vendors)."""
+    store = get_store(path)
+    written = store.save(vendor_map)
+    return written, sum(len(v) for v in vendor_map.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite vendor store")
+    subparsers = parser.add_subparsers(dest="command")
+
+    migrate = subparsers.add_parser("migrate", help="Import a vendor_map JSON file into its .db store")
+    migrate.add_argument("--json", default=MAP_PATH)
+    migrate.add_argument("--no-samples", action="store_true", help="Drop sample rows while migrating")
+
+    export = subparsers.add_parser("export", help="Write the store back out as JSON")
+    export.add_argument("--map", default=MAP_PATH, help="Vendor map path the store belongs to")
+    export.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        store = VendorStore(args.json, store_samples=not args.no_samples, auto_migrate=False)
+        count = store.import_json(args.json)
+        print(f"✅ Migrated {count} vendors into {store.db_path}.")
+    elif args.command == "export":
+        store = VendorStore(args.map)
+        store.export_json(args.out)
+        print(f"📤 Exported {store.count()} vendors to {args.out}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()